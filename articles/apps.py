@@ -7,3 +7,6 @@ class ArticlesConfig(AppConfig):
 
     def ready(self):
         import articles.signals
+        from articles.cache import check_cache_backend
+
+        check_cache_backend()
@@ -0,0 +1,131 @@
+"""
+Helpers for the ``benchmark_*`` management commands: seed a large, reproducible
+set of articles and time the code paths under test against it.
+"""
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from django.core.management.base import CommandError
+from django.db import transaction
+
+from articles.models import Article
+from articles.utils import make_excerpt, url_hash
+
+BENCHMARK_URL = "https://benchmark.invalid/articles/"
+
+WORDS = (
+    "python django postgres sqlite search index query cache database server "
+    "request response api token user article picture scraper crawler spider "
+    "telegram bot message queue worker celery task stream export feed event "
+    "performance memory latency throughput benchmark profile release version "
+    "security deploy docker compose image storage upload migration schema "
+    "model field serializer view router pagination cursor filter ranking"
+).split()
+
+
+@dataclass
+class Timing:
+    label: str
+    runs: list
+
+    def __str__(self):
+        return (
+            f"{self.label}: median {statistics.median(self.runs) * 1000:.1f} ms, "
+            f"min {min(self.runs) * 1000:.1f} ms over {len(self.runs)} runs"
+        )
+
+    def rate(self, items):
+        """Items processed per second at the median run time"""
+        return items / statistics.median(self.runs)
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def seed_benchmark_articles(rows, user=None, batch_size=5000, seed=0):
+    """
+    Bulk create ``rows`` articles, a quarter of them scraped, with random
+    titles and content drawn from ``WORDS``. Return the number created.
+    """
+    rng = random.Random(seed)
+    offset = Article.objects.filter(scraped_url__startswith=BENCHMARK_URL).count()
+    created = 0
+
+    while created < rows:
+        batch = []
+        for number in range(created, min(created + batch_size, rows)):
+            content = " ".join(_sentence(rng, 12) for _ in range(5))
+            if number % 4 == 3:
+                url = f"{BENCHMARK_URL}{offset + number}"
+                batch.append(
+                    Article(
+                        scraped_title=_sentence(rng, 6),
+                        scraped_url=url,
+                        scraped_url_canonical=url,
+                        scraped_url_hash=url_hash(url),
+                        source=Article.SCRAPED,
+                    )
+                )
+            else:
+                batch.append(
+                    Article(
+                        title=_sentence(rng, 6),
+                        content=content,
+                        excerpt=make_excerpt(content),
+                        user=user,
+                        source=Article.MANUAL,
+                    )
+                )
+
+        with transaction.atomic():
+            Article.objects.bulk_create(batch)
+        created += len(batch)
+
+    return created
+
+
+@contextmanager
+def benchmark_articles(rows, allow_seed=False, stdout=None):
+    """
+    Seed ``rows`` articles for the duration of the block and roll them back
+    afterwards, so a benchmark never leaves fake articles behind. Seeding
+    needs ``allow_seed``, without ``rows`` the existing data is timed as is.
+    """
+    if not rows:
+        yield
+        return
+
+    if not allow_seed:
+        raise CommandError(
+            "Seeding benchmark articles writes to the configured database, "
+            "pass --allow-seed to confirm"
+        )
+
+    with transaction.atomic():
+        try:
+            if stdout:
+                stdout.write(f"Seeding {rows} articles...")
+            seed_benchmark_articles(rows)
+            yield
+        finally:
+            transaction.set_rollback(True)
+
+
+def time_function(label, function, repeat=5):
+    runs = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        runs.append(time.perf_counter() - started)
+
+    return Timing(label, runs)
+
+
+def time_queryset(label, build_queryset, limit=20, repeat=5):
+    """Time evaluating the first ``limit`` rows of a fresh queryset"""
+    return time_function(label, lambda: list(build_queryset()[:limit]), repeat)
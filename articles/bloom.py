@@ -0,0 +1,264 @@
+import fcntl
+import logging
+import math
+import mmap
+import os
+import struct
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+
+from articles.models import Article
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"URLBLOOM"
+
+# magic, number of bits, number of hash functions, number of added keys,
+# highest article pk included, target false-positive rate
+HEADER = struct.Struct("<8sQQQQd")
+
+_cached_filter = None
+
+
+class BloomFilter:
+    """
+    Bloom filter of 64-char hex URL hashes kept in a memory-mapped file.
+
+    Answers "definitely new" (``key not in bloom``) or "maybe seen" about
+    the stored URLs. The ``watermark`` is the highest ``Article`` pk the
+    filter was built from, hashes assigned later are added by
+    ``add_url_hashes``.
+    """
+
+    def __init__(self, file, buffer, num_bits, num_hashes, count, watermark, fpr):
+        self.file = file
+        self.buffer = buffer
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.count = count
+        self.watermark = watermark
+        self.fpr = fpr
+
+    @staticmethod
+    def optimal_parameters(capacity, fpr):
+        capacity = max(capacity, 1)
+        num_bits = math.ceil(-capacity * math.log(fpr) / math.log(2) ** 2)
+        num_bits = max(8, math.ceil(num_bits / 8) * 8)
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return num_bits, num_hashes
+
+    @classmethod
+    def create(cls, path, capacity, fpr):
+        num_bits, num_hashes = cls.optimal_parameters(capacity, fpr)
+
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, num_bits, num_hashes, 0, 0, fpr))
+            file.truncate(HEADER.size + num_bits // 8)
+
+        return cls.open(path, writable=True)
+
+    @classmethod
+    def open(cls, path, writable=False):
+        file = open(path, "r+b" if writable else "rb")
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        buffer = mmap.mmap(file.fileno(), 0, access=access)
+
+        magic, num_bits, num_hashes, count, watermark, fpr = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            buffer.close()
+            file.close()
+            raise ValueError(f"{path} is not a URL Bloom filter file")
+
+        return cls(file, buffer, num_bits, num_hashes, count, watermark, fpr)
+
+    def close(self):
+        self.buffer.close()
+        self.file.close()
+
+    def flush(self):
+        HEADER.pack_into(
+            self.buffer,
+            0,
+            MAGIC,
+            self.num_bits,
+            self.num_hashes,
+            self.count,
+            self.watermark,
+            self.fpr,
+        )
+        self.buffer.flush()
+
+    def _positions(self, url_key):
+        # URL hashes are already uniformly distributed sha256 digests,
+        # so two 64-bit slices are enough for double hashing.
+        digest = bytes.fromhex(url_key)
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:16], "little") | 1
+
+        return (
+            (first + i * second) % self.num_bits for i in range(self.num_hashes)
+        )
+
+    def add(self, url_key):
+        for position in self._positions(url_key):
+            index = HEADER.size + (position >> 3)
+            self.buffer[index] |= 1 << (position & 7)
+
+        self.count += 1
+
+    def __contains__(self, url_key):
+        return all(
+            self.buffer[HEADER.size + (position >> 3)] & (1 << (position & 7))
+            for position in self._positions(url_key)
+        )
+
+    def estimated_fpr(self):
+        fill = 1 - math.exp(-self.num_hashes * self.count / self.num_bits)
+        return fill ** self.num_hashes
+
+    def report(self):
+        return {
+            "size_bytes": HEADER.size + self.num_bits // 8,
+            "num_bits": self.num_bits,
+            "num_hashes": self.num_hashes,
+            "count": self.count,
+            "watermark": self.watermark,
+            "target_fpr": self.fpr,
+            "estimated_fpr": self.estimated_fpr(),
+        }
+
+
+def _journal_path(path):
+    return f"{path}.pending"
+
+
+@contextmanager
+def _locked(path):
+    """Serialize the writers of the filter at ``path`` across processes"""
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def build_url_bloom_filter(path=None, fpr=None, capacity=None, growth=2):
+    """
+    Build the filter from all stored URL hashes next to ``path`` and atomically
+    replace the old file, so readers never see a half-written filter. Hashes
+    added while it is built are journaled and merged before the replace.
+    """
+    path = path or settings.URL_BLOOM_FILTER_PATH
+    fpr = fpr or settings.URL_BLOOM_FILTER_FPR
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    journal_path = _journal_path(path)
+
+    # Created before the rows are read, so no hash committed later is lost
+    with _locked(path):
+        open(journal_path, "w").close()
+
+    queryset = Article.objects.filter(scraped_url_hash__isnull=False)
+    watermark = queryset.aggregate(watermark=Max("pk"))["watermark"] or 0
+    queryset = queryset.filter(pk__lte=watermark)
+    capacity = capacity or max(queryset.count() * growth, 1000)
+
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".bloom")
+    os.close(file_descriptor)
+
+    try:
+        bloom = BloomFilter.create(temp_path, capacity, fpr)
+        for url_key in queryset.values_list("scraped_url_hash", flat=True).iterator(
+            chunk_size=10000
+        ):
+            bloom.add(url_key)
+
+        with _locked(path):
+            with open(journal_path) as journal:
+                for line in journal:
+                    if line.strip():
+                        bloom.add(line.strip())
+
+            bloom.watermark = watermark
+            bloom.flush()
+            report = bloom.report()
+            bloom.close()
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+            os.remove(journal_path)
+    except BaseException:
+        os.remove(temp_path)
+        with _locked(path):
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+        raise
+
+    return report
+
+
+def add_url_hashes(url_keys, path=None):
+    """
+    Add ``url_keys`` to the filter file and to the journal of a running
+    build, so the filter keeps answering "definitely new" only for URLs that
+    are not stored. Before the first build there is nothing to update.
+    """
+    path = path or settings.URL_BLOOM_FILTER_PATH
+    journal_path = _journal_path(path)
+    url_keys = [url_key for url_key in url_keys if url_key]
+
+    if not url_keys or not (os.path.exists(path) or os.path.exists(journal_path)):
+        return
+
+    try:
+        with _locked(path):
+            if os.path.exists(path):
+                bloom = BloomFilter.open(path, writable=True)
+                try:
+                    for url_key in url_keys:
+                        bloom.add(url_key)
+                    bloom.flush()
+                finally:
+                    bloom.close()
+
+            if os.path.exists(journal_path):
+                with open(journal_path, "a") as journal:
+                    journal.writelines(f"{url_key}\n" for url_key in url_keys)
+    except (OSError, ValueError):
+        # The unique index still rejects the missed URLs, a rebuild adds them
+        logger.exception(f"Failed to add {len(url_keys)} URL hashes to {path}")
+
+
+def remember_url_hashes(url_keys):
+    """Add ``url_keys`` to the filter once the current transaction commits"""
+    url_keys = [url_key for url_key in url_keys if url_key]
+
+    if url_keys:
+        transaction.on_commit(lambda: add_url_hashes(url_keys))
+
+
+def get_url_bloom_filter():
+    """
+    Return the shared read-only filter, or ``None`` when it wasn't built yet.
+    The file is reopened when a rebuild replaced it.
+    """
+    global _cached_filter
+
+    path = settings.URL_BLOOM_FILTER_PATH
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    # The replaced mapping is not closed explicitly, another thread may
+    # still be reading it; it is released once garbage collected.
+    identity = (path, stat.st_ino, stat.st_mtime_ns)
+    if _cached_filter is None or _cached_filter[0] != identity:
+        _cached_filter = (identity, BloomFilter.open(path))
+
+    return _cached_filter[1]
@@ -0,0 +1,232 @@
+"""
+Response cache of the article endpoints.
+
+Cached responses are keyed on a generation counter of the article source
+("Manual" or "Scraped"). Any change to an article of a source, or to data
+rendered with it, bumps the counter, so old entries are never read again
+and simply expire.
+"""
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from articles.models import Article
+from articles.pagination import PAGINATION_HEADER
+
+GENERATION_KEY = "articles:generation:{source}"
+RESPONSE_KEY = "articles:response:{source}:{generation}:{action}:{digest}"
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache():
+    return caches[settings.ARTICLE_CACHE_ALIAS]
+
+
+def check_cache_backend():
+    """Warn when the cache is off because no shared backend is configured"""
+    backend = settings.CACHES[settings.ARTICLE_CACHE_ALIAS]["BACKEND"]
+    if backend.endswith(".DummyCache"):
+        logger.warning(
+            "Article response cache is off, set ARTICLE_CACHE_LOCATION to a "
+            "Redis URL shared by the web and Celery processes"
+        )
+
+
+def get_generation(source):
+    cache = get_cache()
+    key = GENERATION_KEY.format(source=source)
+    # A new counter starts from the clock, so it never goes back to the
+    # value of an evicted one
+    cache.add(key, time.time_ns(), timeout=None)
+    return cache.get(key)
+
+
+def bump_article_generation(*sources):
+    """Invalidate the cached responses of ``sources``, all sources by default"""
+    cache = get_cache()
+
+    for source in sources or [source for source, _ in Article.SOURCE_CHOICES]:
+        key = GENERATION_KEY.format(source=source)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def request_digest(request, kwargs):
+    """Digest of what a response depends on, query params in any order"""
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    )
+    # Pagination links are absolute, so the host is part of the response
+    parts = [
+        request.get_host(),
+        request.headers.get(PAGINATION_HEADER),
+        sorted(kwargs.items()),
+        params,
+    ]
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def response_cache_key(source, action, request, kwargs):
+    return RESPONSE_KEY.format(
+        source=source,
+        generation=get_generation(source),
+        action=action,
+        digest=request_digest(request, kwargs),
+    )
+
+
+def touch_user_articles(user_id):
+    """Mark the articles of a user as changed, they render the author"""
+    Article.objects.filter(user_id=user_id).update(updated_at=timezone.now())
+    transaction.on_commit(lambda: bump_article_generation(Article.MANUAL))
+
+
+def touch_image_articles(model, pk):
+    """
+    Mark the articles rendering the image of a ``media_sources`` row as
+    changed, the article itself or the articles of the profile's user.
+    """
+    if model is Article:
+        articles = Article.objects.filter(pk=pk)
+    else:
+        articles = Article.objects.filter(
+            user_id__in=model.objects.filter(pk=pk).values("user_id")
+        )
+    articles.update(updated_at=timezone.now())
+
+
+class CachedResponseMixin:
+    """
+    Serve ``list`` and ``retrieve`` from the article cache and answer
+    conditional requests with ``304 Not Modified``.
+
+    The response data is cached, so every renderer can still be used. The
+    ``ETag`` is derived from the ids and row versions (``updated_at``) of
+    the returned articles and cached with the data, so neither a cache hit
+    nor a ``304`` serializes anything. Lists only honour ``If-None-Match``:
+    a deleted article leaves no timestamp behind for ``If-Modified-Since``.
+    """
+
+    cache_source = None
+    version_fields = ("id", "published_at", "updated_at")
+
+    def paginate_queryset(self, queryset):
+        self.version_rows = super().paginate_queryset(queryset)
+        return self.version_rows
+
+    def get_object(self):
+        instance = super().get_object()
+        self.version_rows = [instance]
+        return instance
+
+    def make_validators(self, request, rows):
+        """Return ``(etag, last_modified)`` of a response showing ``rows``"""
+        parts = [
+            self.action,
+            request.accepted_renderer.format,
+            request_digest(request, self.kwargs),
+            [(row.id, row.updated_at.isoformat()) for row in rows],
+        ]
+        if self.action == "list":
+            parts.append(self.paginator.get_page_info())
+
+        etag = quote_etag(hashlib.sha256(repr(parts).encode()).hexdigest())
+        last_modified = max((row.updated_at for row in rows), default=None)
+        return etag, last_modified and int(last_modified.timestamp())
+
+    def get_validators(self, request):
+        """Validators from a query of the row versions only, ``None`` without rows"""
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .select_related(None)
+            .only(*self.version_fields)
+        )
+        lookup = self.lookup_url_kwarg or self.lookup_field
+
+        if lookup not in self.kwargs:
+            rows = super().paginate_queryset(queryset)
+            return self.make_validators(request, rows or [])
+
+        try:
+            rows = list(queryset.filter(**{self.lookup_field: self.kwargs[lookup]}))
+        except (TypeError, ValueError, ValidationError):
+            rows = []
+        return self.make_validators(request, rows) if rows else None
+
+    def get_not_modified_response(self, request, validators):
+        etag, last_modified = validators
+        if self.action == "list":
+            last_modified = None
+
+        return get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+
+    def set_validators(self, response, validators):
+        if validators is not None:
+            etag, last_modified = validators
+            response.headers["ETag"] = etag
+            if last_modified is not None:
+                response.headers["Last-Modified"] = http_date(last_modified)
+        patch_vary_headers(response, ["Accept", PAGINATION_HEADER])
+        return response
+
+    def cached_response(self, request, get_response):
+        cache = get_cache()
+        key = response_cache_key(self.cache_source, self.action, request, self.kwargs)
+        conditional = any(
+            header in request.headers
+            for header in ("If-None-Match", "If-Modified-Since")
+        )
+
+        cached = cache.get(key)
+        if cached is not None:
+            data, validators = cached
+        elif conditional:
+            validators = self.get_validators(request)
+        else:
+            validators = None
+
+        if validators is not None:
+            not_modified = self.get_not_modified_response(request, validators)
+            if not_modified is not None:
+                return self.set_validators(not_modified, validators)
+
+        if cached is not None:
+            return self.set_validators(Response(data), validators)
+
+        self.version_rows = None
+        response = get_response()
+        if response.status_code == 200:
+            validators = self.make_validators(request, self.version_rows or [])
+            cache.set(
+                key, (response.data, validators), timeout=settings.ARTICLE_CACHE_TIMEOUT
+            )
+
+        return self.set_validators(response, validators)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs),
+        )
@@ -0,0 +1,162 @@
+"""
+Change feed of the articles, for mirrors syncing incrementally.
+
+Saved articles are found by ``updated_at``, deleted ones by their
+``ArticleTombstone``. Both are read in ``(changed_at, kind, id)`` order
+from the ``article_updated_idx`` and ``tombstone_deleted_idx`` indexes,
+after the position held by an opaque sync token, so a sync reads only the
+changes since the previous one. Tokens also remember where the sync they
+belong to started: articles created after that are reported as created,
+other saved articles as updated.
+
+Changes show up ``ARTICLE_CHANGES_DELAY`` seconds late: a transaction
+committing after a later change was read would be skipped otherwise.
+"""
+import base64
+import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException, ValidationError
+
+from articles.models import Article, ArticleTombstone
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+# Order of saved and deleted articles changed at the same time
+ARTICLE, TOMBSTONE = 0, 1
+# Id after every row, for positions past all changes at a time
+MAX_ID = 2**63 - 1
+
+
+class SyncTokenExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Sync token expired, sync again without a token."
+    default_code = "sync_token_expired"
+
+
+def encode_token(position, origin):
+    changed_at, kind, pk = position
+    origin = origin.isoformat() if origin else ""
+    token = f"{changed_at.isoformat()}|{kind}|{pk}|{origin}"
+    return base64.urlsafe_b64encode(token.encode()).decode()
+
+
+def decode_token(token):
+    """Return the position of a token and the time its sync started from"""
+    try:
+        changed_at, kind, pk, origin = (
+            base64.urlsafe_b64decode(token.encode()).decode().split("|")
+        )
+        position = datetime.datetime.fromisoformat(changed_at), int(kind), int(pk)
+        origin = datetime.datetime.fromisoformat(origin) if origin else None
+    except ValueError:
+        raise ValidationError({"since": "Invalid sync token."})
+
+    if position[0].tzinfo is None or position[1] not in (ARTICLE, TOMBSTONE):
+        raise ValidationError({"since": "Invalid sync token."})
+    return position, origin
+
+
+def after(position, kind, time_field):
+    """
+    Rows of ``kind`` past ``position`` in ``(changed_at, kind, id)`` order,
+    written as a range on ``changed_at`` so the index is scanned in order.
+    """
+    changed_at, position_kind, pk = position
+
+    if kind < position_kind:
+        return Q(**{f"{time_field}__gt": changed_at})
+    if kind > position_kind:
+        return Q(**{f"{time_field}__gte": changed_at})
+    return Q(**{f"{time_field}__gte": changed_at}) & ~Q(
+        **{time_field: changed_at, "id__lte": pk}
+    )
+
+
+def get_changes(fast, since=None, limit=DEFAULT_LIMIT):
+    """
+    Up to ``limit`` changes after the ``since`` token, oldest first, with
+    the token of the last one. Saved articles are serialized with ``fast``,
+    a ``FastListSerializer``.
+    """
+    position, origin = decode_token(since) if since else (None, None)
+    now = timezone.now()
+
+    if origin and origin < now - datetime.timedelta(
+        days=settings.ARTICLE_TOMBSTONE_RETENTION_DAYS
+    ):
+        # The client was last caught up before the retention, tombstones of
+        # articles deleted since may be pruned already. A first sync has
+        # nothing to miss, however old the changes it pages through.
+        raise SyncTokenExpired()
+
+    until = now - datetime.timedelta(seconds=settings.ARTICLE_CHANGES_DELAY)
+    articles = Article.objects.filter(updated_at__lte=until)
+    tombstones = ArticleTombstone.objects.filter(deleted_at__lte=until)
+    if position:
+        articles = articles.filter(after(position, ARTICLE, "updated_at"))
+        tombstones = tombstones.filter(after(position, TOMBSTONE, "deleted_at"))
+
+    rows = list(fast.get_queryset(articles.order_by("updated_at", "id"))[: limit + 1])
+    deleted = list(tombstones.order_by("deleted_at", "id")[: limit + 1])
+    has_more = len(rows) + len(deleted) > limit
+
+    changes = sorted(
+        [(row.updated_at, ARTICLE, row.id, row) for row in rows]
+        + [(row.deleted_at, TOMBSTONE, row.id, row) for row in deleted]
+    )[:limit]
+    data = iter(
+        fast.to_representation([change[3] for change in changes if change[1] == ARTICLE])
+    )
+    to_representation = serializers.DateTimeField().to_representation
+
+    results = []
+    for changed_at, kind, _, row in changes:
+        if kind == TOMBSTONE:
+            change, pk, article = DELETED, row.article_id, None
+        else:
+            # Articles created since the sync started are new to the client
+            created = origin is None or (
+                row.created_at is not None and row.created_at > origin
+            )
+            change, pk, article = CREATED if created else UPDATED, row.id, next(data)
+
+        results.append(
+            {
+                "change": change,
+                "id": pk,
+                "source": row.source,
+                "changed_at": to_representation(changed_at),
+                "article": article,
+            }
+        )
+
+    if has_more:
+        position = changes[-1][:3]
+    else:
+        # Caught up to ``until``, the next sync starts from there. A quiet
+        # feed keeps moving its token, so it doesn't expire while in use.
+        position, origin = (until, TOMBSTONE, MAX_ID), until
+
+    return {
+        "results": results,
+        "next_token": encode_token(position, origin),
+        "has_more": has_more,
+    }
+
+
+def prune_tombstones(days=None):
+    """Delete tombstones older than the retention, return how many"""
+    days = settings.ARTICLE_TOMBSTONE_RETENTION_DAYS if days is None else days
+    deleted, _ = ArticleTombstone.objects.filter(
+        deleted_at__lt=timezone.now() - datetime.timedelta(days=days)
+    ).delete()
+    return deleted
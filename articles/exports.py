@@ -0,0 +1,28 @@
+"""
+Streaming export of the article corpus.
+
+Rows are read with ``QuerySet.iterator()`` through the fast list path
+(``articles.fast_lists``) and rendered batch by batch, so memory use does
+not depend on the number of articles exported.
+"""
+from itertools import islice
+
+from django.conf import settings
+
+
+def export_rows(fast, queryset, chunk_size=None):
+    """Serialized rows of ``queryset`` in batches of ``chunk_size``"""
+    chunk_size = chunk_size or settings.ARTICLE_EXPORT_CHUNK_SIZE
+    rows = fast.get_queryset(queryset).iterator(chunk_size=chunk_size)
+
+    while batch := fast.to_representation(islice(rows, chunk_size)):
+        yield batch
+
+
+def stream_export(renderer, batches, fields):
+    """Rendered export, the CSV header comes first even without rows"""
+    yield renderer.render([], renderer_context={"fields": fields})
+
+    context = {"fields": fields, "header": False}
+    for batch in batches:
+        yield renderer.render(batch, renderer_context=context)
@@ -0,0 +1,138 @@
+"""
+Read-only fast path for list responses.
+
+``FastListSerializer`` compiles a ``ModelSerializer`` into one
+``values_list()`` query and an accessor per field, so rows are serialized
+without model instances or DRF's per-field attribute lookup. The output is
+the same as the serializer's, fields it can't compile make it fall back.
+"""
+from operator import itemgetter
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.relations import RelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from articles.fieldsets import REQUIRED_COLUMNS
+
+
+def compile_file_field(field, model_field):
+    storage = model_field.storage
+    request = field.context.get("request")
+
+    def to_representation(name):
+        if not name:
+            return None
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+
+    return to_representation
+
+
+def compile_model_field(field, model_field):
+    if isinstance(field, serializers.FileField):
+        use_url = getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL)
+        if not isinstance(model_field, models.FileField) or not use_url:
+            return None
+        return compile_file_field(field, model_field)
+
+    if isinstance(field, RelatedField) or model_field.is_relation:
+        return None
+
+    to_representation = field.to_representation
+    return lambda value: None if value is None else to_representation(value)
+
+
+class FastListSerializer:
+    """
+    Serialize a queryset like ``serializer`` (with ``many=True``) does.
+
+    Fields must read a concrete model column or be listed in the
+    serializer's ``Meta.values_expressions``, a ``{field: expression}``
+    mapping whose results are used as they are. ``compile`` returns
+    ``None`` for any other serializer.
+    """
+
+    def __init__(self, columns, expressions, accessors):
+        self.columns = columns
+        self.expressions = expressions
+        self.accessors = accessors
+
+    @classmethod
+    def compile(cls, serializer):
+        model = serializer.Meta.model
+        expressions = getattr(serializer.Meta, "values_expressions", {})
+        columns = list(REQUIRED_COLUMNS)
+        annotations = {}
+        fields = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if name in expressions:
+                column = f"{name}_value"
+                annotations[column] = expressions[name]
+                to_representation = None
+            else:
+                if field.source == "*" or len(field.source_attrs) != 1:
+                    return None
+                try:
+                    model_field = model._meta.get_field(field.source_attrs[0])
+                except FieldDoesNotExist:
+                    return None
+                if not model_field.concrete:
+                    return None
+                to_representation = compile_model_field(field, model_field)
+                if to_representation is None:
+                    return None
+                column = model_field.attname
+
+            if column not in columns:
+                columns.append(column)
+            fields.append((name, columns.index(column), to_representation))
+
+        accessors = [
+            (name, itemgetter(index), to_representation)
+            for name, index, to_representation in fields
+        ]
+        return cls(columns, annotations, accessors)
+
+    def get_queryset(self, queryset):
+        """Rows as named tuples, they carry ``id`` and ``published_at``"""
+        return queryset.annotate(**self.expressions).values_list(
+            *self.columns, named=True
+        )
+
+    def to_representation(self, rows):
+        accessors = self.accessors
+        data = []
+
+        for row in rows:
+            item = {}
+            for name, get, to_representation in accessors:
+                value = get(row)
+                if to_representation is not None:
+                    value = to_representation(value)
+                item[name] = value
+            data.append(item)
+
+        return data
+
+
+class FastListMixin:
+    """Serve the ``list`` action through ``FastListSerializer`` when it can"""
+
+    def list(self, request, *args, **kwargs):
+        fast = FastListSerializer.compile(self.get_serializer())
+        if fast is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = fast.get_queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(fast.to_representation(queryset))
+
+        return self.get_paginated_response(fast.to_representation(page))
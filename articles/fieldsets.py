@@ -0,0 +1,127 @@
+"""
+Sparse fieldsets: ``?fields=id,title`` keeps only the listed serializer
+fields, ``?omit=content`` drops them. The queryset then loads only the
+columns the remaining fields read.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+# Loaded whatever is serialized, used by ordering, pagination and ETags
+REQUIRED_COLUMNS = ("id", "published_at", "updated_at")
+
+
+def parse_field_list(value):
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+def sparse_field_names(request, available):
+    """Serializer field names to keep for the request, in declaration order"""
+    if request is None:
+        return list(available)
+
+    fields = parse_field_list(request.query_params.get(FIELDS_PARAM))
+    omit = parse_field_list(request.query_params.get(OMIT_PARAM))
+
+    # Reported under the parameter they came from
+    errors = {}
+    for param, names in ((FIELDS_PARAM, fields), (OMIT_PARAM, omit)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            errors[param] = (
+                f"Unknown fields: {', '.join(unknown)}. "
+                f"Available fields: {', '.join(available)}."
+            )
+    if errors:
+        raise ValidationError(errors)
+
+    return [
+        name
+        for name in available
+        if (not fields or name in fields) and name not in omit
+    ]
+
+
+def fieldset_parameters(serializer_class):
+    """OpenAPI ``fields`` and ``omit`` parameters of a serializer"""
+    available = list(serializer_class.Meta.fields)
+
+    return [
+        OpenApiParameter(
+            name,
+            type=str,
+            enum=available,
+            many=True,
+            style="form",
+            explode=False,
+            description=description,
+        )
+        for name, description in (
+            (FIELDS_PARAM, "Comma separated fields to return (ex. ?fields=id,title)"),
+            (OMIT_PARAM, "Comma separated fields to leave out (ex. ?omit=content)"),
+        )
+    ]
+
+
+class SparseFieldsetSerializerMixin:
+    """Drop the fields the request leaves out with ``?fields=`` or ``?omit=``"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        keep = sparse_field_names(self.context.get("request"), list(self.fields))
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
+
+
+def serialized_columns(serializer, model):
+    """
+    Model fields read by the serializer fields, ``None`` when one of them
+    reads something else (e.g. a property) and every column is needed.
+    """
+    columns = set()
+
+    for field in serializer.fields.values():
+        if field.source == "*":
+            return None
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if model_field.concrete:
+            columns.add(model_field.name)
+
+    return columns
+
+
+class SparseFieldsetViewMixin:
+    """
+    Load only the columns the ``list`` and ``retrieve`` serializer reads,
+    so fields left out with ``?fields=``/``?omit=`` are never fetched.
+    """
+
+    sparse_actions = ("list", "retrieve")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in self.sparse_actions:
+            return queryset
+
+        columns = serialized_columns(self.get_serializer(), queryset.model)
+        if columns is None:
+            return queryset
+
+        columns.update(REQUIRED_COLUMNS)
+        related = queryset.query.select_related
+        if isinstance(related, dict) and not related.keys() <= columns:
+            # Relations left out must not be joined either
+            kept = [name for name in related if name in columns]
+            queryset = queryset.select_related(None)
+            if kept:
+                queryset = queryset.select_related(*kept)
+
+        return queryset.only(*columns)
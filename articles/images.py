@@ -0,0 +1,212 @@
+import hashlib
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, features
+
+logger = logging.getLogger(__name__)
+
+# Pillow format names of the variant file extensions
+VARIANT_FORMATS = {
+    "webp": "WEBP",
+    "avif": "AVIF",
+}
+
+
+def media_sources():
+    """Models holding uploaded images as (model, image field, variants field)"""
+    from articles.models import Article
+    from users.models import Profile
+
+    return (
+        (Article, "picture", "picture_variants"),
+        (Profile, "image", "image_variants"),
+    )
+
+
+def file_content_hash(path, chunk_size=64 * 1024):
+    """Return the sha256 hex digest of the file content"""
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def upload_content_hash(file):
+    """Return the sha256 hex digest of an uploaded ``File``"""
+    digest = hashlib.sha256()
+
+    for chunk in file.chunks():
+        digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def validate_image_budget(file):
+    """
+    Reject uploads above ``IMAGE_MAX_UPLOAD_SIZE`` bytes or ``IMAGE_MAX_PIXELS``
+    pixels. Only the image header is read, nothing is decoded.
+    """
+    if file.size > settings.IMAGE_MAX_UPLOAD_SIZE:
+        raise ValidationError(
+            f"The image is larger than {settings.IMAGE_MAX_UPLOAD_SIZE} bytes.",
+            code="image_too_large",
+        )
+
+    position = file.tell()
+    try:
+        with Image.open(file) as img:
+            width, height = img.size
+    finally:
+        file.seek(position)
+
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        raise ValidationError(
+            f"The image has more than {settings.IMAGE_MAX_PIXELS} pixels.",
+            code="image_too_many_pixels",
+        )
+
+
+def open_for_size(img, size):
+    """
+    Let JPEG images decode at the smallest 1/2, 1/4 or 1/8 scale that is
+    still at least ``size``, so the decoded pixels stay proportional to the
+    output instead of the upload. Other formats are decoded in full.
+    """
+    img.draft(img.mode, size)
+    img.load()
+    return img
+
+
+def original_size():
+    """Bounding box of stored originals, the largest variant width"""
+    width = max(settings.IMAGE_VARIANT_WIDTHS)
+    return width, width
+
+
+def shrink_picture(name, storage=None, size=None):
+    """
+    Store a copy of the image ``name`` downscaled to fit ``size`` and return
+    its name, or ``None`` when the image already fits. Stored files are
+    never rewritten in place, they may be shared by other uploads.
+    """
+    storage = storage or default_storage
+    size = size or original_size()
+
+    with storage.open(name, "rb") as file, Image.open(file) as img:
+        if img.width <= size[0] and img.height <= size[1]:
+            return None
+
+        image_format = img.format
+        open_for_size(img, size).thumbnail(size)
+        buffer = io.BytesIO()
+        img.save(buffer, format=image_format)
+
+    return storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def variant_formats():
+    """Configured variant formats this Pillow build can encode"""
+    formats = []
+
+    for extension in settings.IMAGE_VARIANT_FORMATS:
+        if features.check(extension):
+            formats.append(extension)
+        else:
+            logger.warning(f"Pillow can't encode {extension}, variants skipped")
+
+    return formats
+
+
+def variant_widths(image_width):
+    """Configured widths up to the image width, never upscaling"""
+    widths = [width for width in settings.IMAGE_VARIANT_WIDTHS if width < image_width]
+    return widths or [image_width]
+
+
+def variant_name(name, width, extension):
+    root, _ = os.path.splitext(name)
+    return f"{root}_{width}w.{extension}"
+
+
+def render_variants(name, storage=None):
+    """
+    Encode resized copies of the image ``name`` for every configured width
+    and format, return ``(format, width, bytes)`` tuples. Only reads the
+    storage, so it can run in another process.
+    """
+    storage = storage or default_storage
+    rendered = []
+
+    with storage.open(name, "rb") as file, Image.open(file) as img:
+        formats = variant_formats()
+        widths = variant_widths(img.width)
+        aspect_ratio = img.height / img.width
+        largest = max(widths)
+        open_for_size(img, (largest, max(1, round(largest * aspect_ratio))))
+
+        for width in widths:
+            height = max(1, round(width * aspect_ratio))
+            resized = img.resize((width, height), Image.LANCZOS)
+            if resized.mode not in ("RGB", "RGBA"):
+                resized = resized.convert("RGBA" if "A" in resized.mode else "RGB")
+
+            for extension in formats:
+                buffer = io.BytesIO()
+                resized.save(
+                    buffer,
+                    format=VARIANT_FORMATS[extension],
+                    quality=settings.IMAGE_VARIANT_QUALITY,
+                )
+                rendered.append((extension, width, buffer.getvalue()))
+
+    return rendered
+
+
+def store_variants(name, rendered, storage=None):
+    """Save rendered variants next to ``name``, return ``{format: {width: name}}``"""
+    storage = storage or default_storage
+    variants = {}
+
+    for extension, width, content in rendered:
+        stored_name = storage.save(
+            variant_name(name, width, extension), ContentFile(content)
+        )
+        variants.setdefault(extension, {})[str(width)] = stored_name
+
+    return variants
+
+
+def generate_variants(name, storage=None):
+    return store_variants(name, render_variants(name, storage), storage)
+
+
+def process_picture(name, storage=None):
+    """
+    Generate the variants of an uploaded image and bound the original,
+    return the name of the picture to keep and the variant names.
+    """
+    variants = generate_variants(name, storage)
+    shrunk_name = shrink_picture(name, storage)
+
+    return shrunk_name or name, variants
+
+
+def iter_variant_names(variants):
+    for names in (variants or {}).values():
+        yield from names.values()
+
+
+def delete_variants(variants, storage=None):
+    storage = storage or default_storage
+
+    for stored_name in iter_variant_names(variants):
+        storage.delete(stored_name)
@@ -0,0 +1,185 @@
+import csv
+import logging
+from dataclasses import dataclass, asdict
+from itertools import islice
+
+from django.db import DatabaseError, transaction
+
+from articles.bloom import get_url_bloom_filter, remember_url_hashes
+from articles.cache import bump_article_generation
+from articles.live import SUMMARY_FIELDS, publish_article
+from articles.models import Article
+from articles.signals import notify_new_article
+from articles.utils import absolute_scraped_url, canonicalize_url, url_hash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+TITLE_MAX_LENGTH = Article._meta.get_field("scraped_title").max_length
+URL_MAX_LENGTH = Article._meta.get_field("scraped_url").max_length
+
+
+@dataclass
+class ImportResult:
+    inserted: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+    def __add__(self, other):
+        return ImportResult(
+            inserted=self.inserted + other.inserted,
+            skipped=self.skipped + other.skipped,
+            failed=self.failed + other.failed,
+        )
+
+    def __str__(self):
+        return (
+            f"inserted: {self.inserted}, skipped: {self.skipped}, failed: {self.failed}"
+        )
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def _clean_row(row):
+    """Return an unsaved scraped ``Article`` for a valid row or ``None``"""
+    title = (row.get("title") or "").strip()
+    url = absolute_scraped_url((row.get("url") or "").strip())
+
+    if not title or not url:
+        return None
+    if len(title) > TITLE_MAX_LENGTH or len(url) > URL_MAX_LENGTH:
+        return None
+
+    canonical_url = canonicalize_url(url)
+
+    return Article(
+        scraped_title=title,
+        scraped_url=url,
+        scraped_url_canonical=canonical_url,
+        scraped_url_hash=url_hash(canonical_url),
+        source=Article.SCRAPED,
+    )
+
+
+def _announce_created(articles):
+    for article in articles:
+        notify_new_article(article.id, article.scraped_title)
+        publish_article(article, created=True)
+
+
+def _insert_chunk(chunk, seen_hashes):
+    result = ImportResult()
+    candidates = {}
+
+    for row in chunk:
+        article = _clean_row(row)
+        if article is None:
+            result.failed += 1
+            continue
+
+        url_key = article.scraped_url_hash
+        if url_key in seen_hashes or url_key in candidates:
+            result.skipped += 1
+            continue
+
+        candidates[url_key] = article
+
+    if not candidates:
+        return result
+
+    try:
+        with transaction.atomic():
+            existing = find_known_url_hashes(candidates.keys())
+            new_hashes = [url_key for url_key in candidates if url_key not in existing]
+            Article.objects.bulk_create(
+                [candidates[url_key] for url_key in new_hashes], ignore_conflicts=True
+            )
+
+            # ``ignore_conflicts`` does not return primary keys, so read back
+            # the rows of this chunk to notify about the ones we inserted.
+            created = list(
+                Article.objects.filter(scraped_url_hash__in=new_hashes).only(
+                    *SUMMARY_FIELDS
+                )
+            )
+
+            # bulk_create doesn't send post_save
+            remember_url_hashes(new_hashes)
+            transaction.on_commit(lambda: _announce_created(created))
+            transaction.on_commit(lambda: bump_article_generation(Article.SCRAPED))
+    except DatabaseError:
+        logger.exception(f"Failed to import a chunk of {len(candidates)} articles")
+        result.failed += len(candidates)
+        return result
+
+    seen_hashes.update(candidates)
+    result.inserted += len(created)
+    result.skipped += len(candidates) - len(created)
+
+    return result
+
+
+def find_known_url_hashes(url_keys):
+    """
+    Return the subset of ``url_keys`` that is already stored.
+
+    Keys the URL Bloom filter reports as definitely new skip the database,
+    the rest is confirmed on the unique hash index. Every write assigning a
+    hash adds it to the filter, and a key it misses anyway (e.g. a process
+    died before adding it) is still rejected by the index on insert.
+    """
+    url_keys = set(url_keys)
+
+    bloom = get_url_bloom_filter()
+    if bloom is not None:
+        url_keys = {url_key for url_key in url_keys if url_key in bloom}
+    if not url_keys:
+        return set()
+
+    return set(
+        Article.objects.filter(scraped_url_hash__in=url_keys).values_list(
+            "scraped_url_hash", flat=True
+        )
+    )
+
+
+def iter_known_url_hashes(chunk_size=10000):
+    """
+    Stream the URL hashes of stored scraped articles which a seen-set in
+    memory has to hold: all of them, or only the rows newer than the URL
+    Bloom filter when it is built.
+    """
+    queryset = Article.objects.filter(scraped_url_hash__isnull=False)
+
+    bloom = get_url_bloom_filter()
+    if bloom is not None:
+        queryset = queryset.filter(pk__gt=bloom.watermark)
+
+    return queryset.values_list("scraped_url_hash", flat=True).iterator(
+        chunk_size=chunk_size
+    )
+
+
+def import_scraped_rows(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Import scraped ``{"title": ..., "url": ...}`` rows chunk by chunk.
+
+    Every chunk costs one ``IN`` lookup of the indexed URL hashes the Bloom
+    filter may have seen and one ``bulk_create`` inside its own transaction,
+    instead of two queries per row.
+    """
+    rows = iter(rows)
+    seen_hashes = set()
+    result = ImportResult()
+
+    while chunk := list(islice(rows, chunk_size)):
+        result += _insert_chunk(chunk, seen_hashes)
+
+    return result
+
+
+def import_articles_from_csv(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    with open(file_path, "r", encoding="utf-8") as file:
+        return import_scraped_rows(csv.DictReader(file), chunk_size=chunk_size)
@@ -0,0 +1,268 @@
+"""
+Live feed of saved articles over Server-Sent Events.
+
+Saving an article publishes a summary to the broker set in
+``ARTICLE_LIVE_BROKER``: ``InMemoryBroker`` reaches only the process it
+was published in (development and tests), ``RedisBroker`` every ASGI
+process through Redis pub/sub. In each ASGI process one ``LiveHub`` reads
+the broker and fans the events out to its connections.
+
+Every connection buffers up to ``ARTICLE_LIVE_QUEUE_SIZE`` events. A client
+too slow to read them gets an ``overflow`` event and is disconnected, it
+catches up with the change feed (``articles.changes``).
+"""
+import asyncio
+import logging
+import threading
+
+import orjson
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from blog_service.renderers import encode_default
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW = b"event: overflow\ndata: {}\n\n"
+HEARTBEAT = b": heartbeat\n\n"
+# Seconds before a broker subscription is retried after an error
+RECONNECT_DELAY = 1
+
+
+class InMemoryBroker:
+    """Broker of a single process, ``publish`` may be called from any thread"""
+
+    def __init__(self, location=None):
+        self.subscribers = set()
+
+    def publish(self, message):
+        for subscriber in list(self.subscribers):
+            loop, queue = subscriber
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # The loop of the subscriber is closed
+                self.subscribers.discard(subscriber)
+
+    async def subscribe(self):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        self.subscribers.add(subscriber)
+        try:
+            while True:
+                yield await subscriber[1].get()
+        finally:
+            self.subscribers.discard(subscriber)
+
+    async def close(self):
+        pass
+
+
+class RedisBroker:
+    """Redis pub/sub on the ``articles:live`` channel of ``location``"""
+
+    channel = "articles:live"
+
+    def __init__(self, location):
+        self.location = location
+        self.client = redis.Redis.from_url(location)
+
+    def publish(self, message):
+        self.client.publish(self.channel, message)
+
+    async def subscribe(self):
+        client = redis.asyncio.Redis.from_url(self.location)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(self.channel)
+            async for message in pubsub.listen():
+                yield message["data"]
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+    async def close(self):
+        self.client.close()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker of ``ARTICLE_LIVE_BROKER``"""
+    global _broker
+
+    with _broker_lock:
+        if _broker is None:
+            options = settings.ARTICLE_LIVE_BROKER
+            _broker = import_string(options["BACKEND"])(options.get("LOCATION"))
+
+    return _broker
+
+
+# Fields read by article_summary
+SUMMARY_FIELDS = (
+    "id",
+    "source",
+    "title",
+    "scraped_title",
+    "excerpt",
+    "scraped_url",
+    "published_at",
+    "updated_at",
+)
+
+
+def article_summary(article):
+    return {
+        "id": article.id,
+        "source": article.source,
+        "title": article.title or article.scraped_title,
+        "excerpt": article.excerpt,
+        "scraped_url": article.scraped_url,
+        "published_at": article.published_at,
+        "updated_at": article.updated_at,
+    }
+
+
+def publish_article(article, created):
+    """Push a saved article to the live feed, errors are only logged"""
+    message = {
+        "event": "created" if created else "updated",
+        "article": article_summary(article),
+    }
+    try:
+        get_broker().publish(orjson.dumps(message, default=encode_default))
+    except Exception:
+        logger.exception(f"Article {article.id} not published to the live feed")
+
+
+class Subscription:
+    def __init__(self, sources, size):
+        self.sources = sources
+        self.queue = asyncio.Queue(maxsize=size)
+        self.overflowed = False
+
+    def put(self, source, event):
+        if self.overflowed or (self.sources and source not in self.sources):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The oldest event makes room for the overflow marker
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+
+class LiveHub:
+    """
+    Fan-out of the broker events to the connections of the process. The
+    broker is read only while there are connections.
+    """
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.subscriptions = set()
+        self.reader = None
+
+    async def read(self):
+        while True:
+            try:
+                async for message in self.broker.subscribe():
+                    self.dispatch(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Live feed broker failed, subscribing again")
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def dispatch(self, message):
+        try:
+            data = orjson.loads(message)
+            source = data["article"]["source"]
+            event = (
+                f"event: {data['event']}\n".encode()
+                + b"data: "
+                + orjson.dumps(data["article"])
+                + b"\n\n"
+            )
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            logger.warning(f"Invalid live feed message: {message!r}")
+            return
+
+        for subscription in list(self.subscriptions):
+            subscription.put(source, event)
+
+    def subscribe(self, sources=(), size=None):
+        subscription = Subscription(
+            set(sources), size or settings.ARTICLE_LIVE_QUEUE_SIZE
+        )
+        self.subscriptions.add(subscription)
+
+        loop = asyncio.get_running_loop()
+        if self.reader is None or self.reader.done() or self.reader.get_loop() != loop:
+            self.reader = loop.create_task(self.read())
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscriptions.discard(subscription)
+
+        if not self.subscriptions and self.reader is not None:
+            self.reader.cancel()
+            self.reader = None
+
+    async def events(self, sources=(), heartbeat=None):
+        """
+        SSE stream of the events of ``sources`` (all by default), with a
+        comment every ``heartbeat`` seconds without events.
+        """
+        heartbeat = heartbeat or settings.ARTICLE_LIVE_HEARTBEAT
+        subscription = self.subscribe(sources)
+        try:
+            # Sent at once, so proxies and clients see the stream is open
+            yield b"retry: 5000\n: connected\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+                    continue
+
+                yield event
+                if event is OVERFLOW:
+                    return
+        finally:
+            self.unsubscribe(subscription)
+
+    async def close(self):
+        for subscription in list(self.subscriptions):
+            self.unsubscribe(subscription)
+        await self.broker.close()
+
+
+_hub = None
+
+
+def get_hub():
+    """Return the hub of the process, ASGI servers run a single event loop"""
+    global _hub
+
+    if _hub is None:
+        _hub = LiveHub(get_broker())
+    return _hub
+
+
+async def lifespan(receive, send):
+    """ASGI lifespan protocol, the broker is closed on shutdown"""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if _hub is not None:
+                await _hub.close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from articles.cache import bump_article_generation
+from articles.models import Article
+from articles.utils import fill_article_excerpts
+
+
+class Command(BaseCommand):
+    help = "Compute excerpts of articles in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows updated per transaction",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between batches to limit load on a live table",
+        )
+        parser.add_argument(
+            "--recompute",
+            action="store_true",
+            help="Recompute existing excerpts (after ARTICLE_EXCERPT_LENGTH changed)",
+        )
+
+    def handle(self, *args, **options):
+        total_updated = 0
+
+        for updated in fill_article_excerpts(
+            Article, batch_size=options["batch_size"], recompute=options["recompute"]
+        ):
+            total_updated += updated
+            self.stdout.write(f"Batch done: {updated} updated")
+
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        bump_article_generation()
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfill finished: {total_updated} excerpts updated")
+        )
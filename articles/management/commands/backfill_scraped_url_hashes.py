@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from articles.models import Article
+from articles.utils import fill_scraped_url_hashes
+
+
+class Command(BaseCommand):
+    help = "Fill canonical URLs and URL hashes of scraped articles in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows updated per transaction",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between batches to limit load on a live table",
+        )
+
+    def handle(self, *args, **options):
+        total_updated = 0
+        total_duplicates = 0
+
+        for updated, duplicates in fill_scraped_url_hashes(
+            Article, batch_size=options["batch_size"]
+        ):
+            total_updated += updated
+            total_duplicates += duplicates
+            self.stdout.write(f"Batch done: {updated} updated, {duplicates} duplicates")
+
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backfill finished: {total_updated} updated, "
+                f"{total_duplicates} duplicates left without a hash"
+            )
+        )
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+
+from articles.benchmarks import benchmark_articles, time_queryset
+from articles.models import Article
+from articles.search import search_articles
+
+
+class Command(BaseCommand):
+    help = "Compare ?search= full-text search with the old icontains title filter"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=0,
+            help="Number of articles to seed for the run and roll back afterwards",
+        )
+        parser.add_argument(
+            "--allow-seed",
+            action="store_true",
+            help="Allow --rows to write articles to the configured database",
+        )
+        parser.add_argument(
+            "--query",
+            action="append",
+            help="Search term, can be repeated",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with benchmark_articles(
+            options["rows"], options["allow_seed"], self.stdout
+        ):
+            self.benchmark(options)
+
+        self.stdout.write(self.style.SUCCESS("Benchmark finished"))
+
+    def benchmark(self, options):
+        queryset = Article.objects.all()
+        self.stdout.write(f"Articles: {queryset.count()}")
+
+        for query in options["query"] or ["python", "cursor pagination"]:
+            self.stdout.write(f"Query {query!r}")
+            timings = (
+                time_queryset(
+                    "  icontains",
+                    lambda: queryset.filter(title__icontains=query),
+                    repeat=options["repeat"],
+                ),
+                time_queryset(
+                    "  search",
+                    lambda: search_articles(queryset, query),
+                    repeat=options["repeat"],
+                ),
+            )
+            for timing in timings:
+                self.stdout.write(str(timing))
@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from articles.benchmarks import benchmark_articles, time_function
+from articles.fast_lists import FastListSerializer
+from articles.models import Article
+from articles.serializers import ArticleListSerializer, ArticleScrapedSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare list serialization rows/sec of the serializers and the fast path"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=0,
+            help="Number of articles to seed for the run and roll back afterwards",
+        )
+        parser.add_argument(
+            "--allow-seed",
+            action="store_true",
+            help="Allow --rows to write articles to the configured database",
+        )
+        parser.add_argument(
+            "--page-size", type=int, action="append", dest="page_sizes"
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with benchmark_articles(
+            options["rows"], options["allow_seed"], self.stdout
+        ):
+            self.benchmark(options)
+
+        self.stdout.write(self.style.SUCCESS("Benchmark finished"))
+
+    def benchmark(self, options):
+        context = {"request": Request(APIRequestFactory().get("/"))}
+        sources = (
+            (
+                ArticleListSerializer,
+                Article.objects.filter(source=Article.MANUAL).select_related("user"),
+            ),
+            (
+                ArticleScrapedSerializer,
+                Article.objects.filter(source=Article.SCRAPED),
+            ),
+        )
+
+        for serializer_class, queryset in sources:
+            fast = FastListSerializer.compile(serializer_class(context=context))
+
+            for page_size in options["page_sizes"] or [5, 100, 1000]:
+                page = queryset[:page_size]
+                rows = page.count()
+                self.stdout.write(f"{serializer_class.__name__}, {rows} rows per page")
+
+                timings = (
+                    time_function(
+                        "  serializer",
+                        lambda: serializer_class(
+                            page.all(), many=True, context=context
+                        ).data,
+                        options["repeat"],
+                    ),
+                    time_function(
+                        "  fast path",
+                        lambda: fast.to_representation(fast.get_queryset(page.all())),
+                        options["repeat"],
+                    ),
+                )
+                for timing in timings:
+                    self.stdout.write(f"{timing}, {timing.rate(rows):.0f} rows/s")
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from articles.benchmarks import benchmark_articles, time_function
+from articles.models import Article
+from articles.serializers import ArticleDetailSerializer, ArticleListSerializer
+from blog_service.renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = "Compare rendering throughput of the JSON and MessagePack renderers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=0,
+            help="Number of articles to seed for the run and roll back afterwards",
+        )
+        parser.add_argument(
+            "--allow-seed",
+            action="store_true",
+            help="Allow --rows to write articles to the configured database",
+        )
+        parser.add_argument("--page-size", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with benchmark_articles(
+            options["rows"], options["allow_seed"], self.stdout
+        ):
+            self.benchmark(options)
+
+        self.stdout.write(self.style.SUCCESS("Benchmark finished"))
+
+    def benchmark(self, options):
+        context = {"request": Request(APIRequestFactory().get("/"))}
+        queryset = Article.objects.select_related("user")[: options["page_size"]]
+        renderers = (
+            ("JSONRenderer", JSONRenderer()),
+            ("ORJSONRenderer", ORJSONRenderer()),
+            ("MessagePackRenderer", MessagePackRenderer()),
+        )
+
+        for serializer_class in (ArticleListSerializer, ArticleDetailSerializer):
+            data = serializer_class(queryset, many=True, context=context).data
+            self.stdout.write(f"{serializer_class.__name__}, {len(data)} rows per page")
+
+            for label, renderer in renderers:
+                size = len(renderer.render(data))
+                timing = time_function(
+                    f"  {label}", lambda: renderer.render(data), options["repeat"]
+                )
+                self.stdout.write(
+                    f"{timing}, {timing.rate(len(data)):.0f} rows/s, "
+                    f"{timing.rate(size) / 2**20:.0f} MiB/s, {size / 1024:.0f} KiB"
+                )
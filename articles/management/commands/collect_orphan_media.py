@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from articles.media_gc import DEFAULT_CHUNK_SIZE, collect_orphan_media
+
+
+class Command(BaseCommand):
+    help = "Delete or quarantine uploaded files no article or profile refers to"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the orphans and the bytes they take",
+        )
+        parser.add_argument(
+            "--quarantine",
+            action="store_true",
+            help="Move orphans to the quarantine directory instead of deleting them",
+        )
+        parser.add_argument(
+            "--grace-period",
+            type=int,
+            default=settings.ORPHAN_MEDIA_GRACE_PERIOD,
+            help="Seconds a file has to be unchanged before it is collected",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Number of files compared against the references at once",
+        )
+
+    def handle(self, *args, **options):
+        report = collect_orphan_media(
+            grace_period=options["grace_period"],
+            dry_run=options["dry_run"],
+            quarantine=options["quarantine"],
+            chunk_size=options["chunk_size"],
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Orphan media collected ({report})"))
@@ -1,24 +1,33 @@
 import os
-import csv
+
 from django.core.management.base import BaseCommand
-from articles.models import Article
+
+from articles.importers import DEFAULT_CHUNK_SIZE, import_articles_from_csv
 
 
 class Command(BaseCommand):
     help = "Import data from CSV file to database"
 
-    def handle(self, *args, **kwargs):
-        file_path = os.path.join(os.getcwd(), "stories.csv")
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=os.path.join(os.getcwd(), "stories.csv"),
+            help="Path to the scraped stories CSV file",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Number of CSV rows imported per query batch",
+        )
+
+    def handle(self, *args, **options):
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    if not Article.objects.filter(scraped_url=row["url"]).exists():
-                        Article.objects.create(
-                            scraped_title=row["title"],
-                            scraped_url=row["url"],
-                            source="Scraped"
-                        )
-            self.stdout.write(self.style.SUCCESS("Data imported successfully"))
+            result = import_articles_from_csv(
+                options["file"], chunk_size=options["chunk_size"]
+            )
         except FileNotFoundError:
             self.stdout.write(self.style.WARNING("File 'stories.csv' not found"))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"Data imported successfully ({result})"))
@@ -0,0 +1,101 @@
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from articles.cache import bump_article_generation, touch_image_articles
+from articles.images import iter_variant_names, media_sources
+from articles.models import MediaBlob
+from articles.storage import ContentAddressedStorage, is_content_name
+
+
+class Command(BaseCommand):
+    help = "Move uploaded pictures and their variants to content-addressed names"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many files would be moved",
+        )
+
+    def copy(self, name):
+        """Store the file under its content name"""
+        with default_storage.open(name, "rb") as file:
+            return default_storage.save(name, File(file))
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError("The default storage is not ContentAddressedStorage")
+
+        moved = 0
+        missing = 0
+        changed = 0
+
+        for model, image_field, variants_field in media_sources():
+            rows = (
+                model.objects.exclude(**{image_field: ""})
+                .exclude(**{f"{image_field}__isnull": True})
+                .values_list("pk", image_field, variants_field)
+                .iterator(chunk_size=1000)
+            )
+
+            for pk, name, variants in rows:
+                names = [name, *iter_variant_names(variants)]
+                legacy_names = [
+                    old_name for old_name in names if not is_content_name(old_name)
+                ]
+                if not legacy_names:
+                    continue
+
+                if any(not default_storage.exists(old) for old in legacy_names):
+                    missing += 1
+                    self.stderr.write(f"{model.__name__} {pk}: file missing, skipped")
+                    continue
+
+                if options["dry_run"]:
+                    moved += len(legacy_names)
+                    continue
+
+                renamed = {old_name: self.copy(old_name) for old_name in legacy_names}
+                variants = {
+                    extension: {
+                        width: renamed.get(variant, variant)
+                        for width, variant in widths.items()
+                    }
+                    for extension, widths in (variants or {}).items()
+                }
+                # The copy is slow, skip rows whose image was replaced meanwhile
+                updated = model.objects.filter(pk=pk, **{image_field: name}).update(
+                    **{
+                        image_field: renamed.get(name, name),
+                        variants_field: variants,
+                    }
+                )
+                if not updated:
+                    for new_name in renamed.values():
+                        default_storage.delete(new_name)
+                    changed += 1
+                    self.stderr.write(
+                        f"{model.__name__} {pk}: image changed during the move, skipped"
+                    )
+                    continue
+
+                touch_image_articles(model, pk)
+
+                # Legacy names are not reference counted and are removed at once
+                for old_name in legacy_names:
+                    default_storage.delete(old_name)
+                moved += len(renamed)
+
+        if not options["dry_run"]:
+            bump_article_generation()
+
+        shared = MediaBlob.objects.filter(references__gt=1).count()
+        action = "would be moved" if options["dry_run"] else "moved"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{moved} files {action}, {missing} rows with missing files skipped, "
+                f"{changed} rows changed during the move skipped, "
+                f"{shared} files are shared by several uploads"
+            )
+        )
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from articles.changes import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "Delete tombstones of deleted articles older than the change feed retention"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ARTICLE_TOMBSTONE_RETENTION_DAYS,
+            help="Keep the tombstones of articles deleted in the last days",
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones(days=options["days"])
+
+        self.stdout.write(self.style.SUCCESS(f"{deleted} article tombstones pruned"))
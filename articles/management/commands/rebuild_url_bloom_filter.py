@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from articles.bloom import build_url_bloom_filter, get_url_bloom_filter
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Bloom filter of scraped article URLs and report its size/FPR"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fpr",
+            type=float,
+            default=settings.URL_BLOOM_FILTER_FPR,
+            help="Target false-positive rate",
+        )
+        parser.add_argument(
+            "--capacity",
+            type=int,
+            default=None,
+            help="Expected number of URLs (default: twice the stored URLs)",
+        )
+        parser.add_argument(
+            "--report",
+            action="store_true",
+            help="Only report the size and FPR of the current filter",
+        )
+
+    def handle(self, *args, **options):
+        if options["report"]:
+            bloom = get_url_bloom_filter()
+            if bloom is None:
+                self.stdout.write(self.style.WARNING("Bloom filter is not built yet"))
+                return
+            report = bloom.report()
+        else:
+            report = build_url_bloom_filter(
+                fpr=options["fpr"], capacity=options["capacity"]
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Bloom filter {settings.URL_BLOOM_FILTER_PATH}: "
+                f"{report['size_bytes'] / 1024:.1f} KiB, "
+                f"{report['count']} URLs up to article #{report['watermark']}, "
+                f"{report['num_hashes']} hashes, "
+                f"target FPR {report['target_fpr']:.4%}, "
+                f"estimated FPR {report['estimated_fpr']:.4%}"
+            )
+        )
@@ -0,0 +1,88 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+
+from articles.cache import bump_article_generation, touch_image_articles
+from articles.images import (
+    delete_variants,
+    media_sources,
+    render_variants,
+    store_variants,
+)
+
+
+def render(name):
+    """Run in a pool process, only reads the media file"""
+    try:
+        return render_variants(name), None
+    except Exception as error:
+        return None, repr(error)
+
+
+class Command(BaseCommand):
+    help = "Regenerate responsive variants of all article pictures and profile images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of processes encoding images",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100,
+            help="Number of images handed to the pool at once",
+        )
+
+    def handle(self, *args, **options):
+        generated = 0
+        failed = 0
+
+        # Workers only encode images, files are stored and rows updated here
+        with ProcessPoolExecutor(
+            max_workers=options["workers"], initializer=django.setup
+        ) as executor:
+            for model, image_field, variants_field in media_sources():
+                rows = (
+                    model.objects.exclude(**{image_field: ""})
+                    .exclude(**{f"{image_field}__isnull": True})
+                    .values_list("pk", image_field, variants_field)
+                    .iterator(chunk_size=options["chunk_size"])
+                )
+
+                while chunk := list(itertools.islice(rows, options["chunk_size"])):
+                    names = [name for _, name, _ in chunk]
+                    results = executor.map(render, names)
+
+                    for (pk, name, old_variants), (rendered, error) in zip(
+                        chunk, results
+                    ):
+                        if error is not None:
+                            failed += 1
+                            self.stderr.write(f"{name}: {error}")
+                            continue
+
+                        variants = store_variants(name, rendered)
+
+                        # Skip rows whose image was replaced in the meantime
+                        updated = model.objects.filter(
+                            pk=pk, **{image_field: name}
+                        ).update(**{variants_field: variants})
+                        delete_variants(old_variants if updated else variants)
+                        if updated:
+                            touch_image_articles(model, pk)
+                        generated += updated
+
+                self.stdout.write(f"{model.__name__}: variants regenerated")
+
+        bump_article_generation()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Variants regenerated for {generated} images, {failed} failed"
+            )
+        )
@@ -1,9 +1,42 @@
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from scrapy.cmdline import execute
+
+from articles_scraper.runner import ScraperPool
 
 
 class Command(BaseCommand):
     help = "Launching a scraper to collect articles from Hacker News"
 
-    def handle(self, *args, **kwargs):
-        execute(["scrapy", "crawl", "stories", "-O", "stories.csv"])
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Stop paging once only already stored stories are found",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=settings.SCRAPER_RUN_TIMEOUT,
+            help="Seconds after which the crawl is stopped",
+        )
+
+    def handle(self, *args, **options):
+        pool = ScraperPool(size=1)
+        pool.start()
+
+        try:
+            result = pool.run(
+                "stories",
+                timeout=options["timeout"],
+                incremental=options["incremental"],
+            )
+        finally:
+            pool.shutdown()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Scraping finished ({result.finish_reason}): "
+                f"{result.item_count} stories scraped, "
+                f"{result.stats.get('articles/inserted', 0)} new articles saved"
+            )
+        )
@@ -0,0 +1,173 @@
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from itertools import islice
+
+from django.conf import settings
+
+from articles.images import iter_variant_names, media_sources
+from articles.models import MediaBlob
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+UPLOADS_DIR = "uploads"
+
+
+@dataclass
+class OrphanReport:
+    scanned: int = 0
+    orphans: int = 0
+    bytes_reclaimed: int = 0
+    dry_run: bool = False
+
+    def __str__(self):
+        action = "would be reclaimed" if self.dry_run else "reclaimed"
+        return (
+            f"scanned: {self.scanned}, orphans: {self.orphans}, "
+            f"{self.bytes_reclaimed} bytes {action}"
+        )
+
+    def as_dict(self):
+        return asdict(self)
+
+
+class ReferenceIndex:
+    """
+    On-disk set of the media names referenced by the database, so the
+    comparison needs the same memory for ten or ten million files.
+    """
+
+    def __init__(self):
+        directory = tempfile.mkdtemp(prefix="media-gc-")
+        self.path = os.path.join(directory, "references.sqlite3")
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("CREATE TABLE refs (name TEXT PRIMARY KEY)")
+
+    def add(self, names):
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO refs (name) VALUES (?)", ((name,) for name in names)
+        )
+
+    def referenced(self, names):
+        placeholders = ", ".join("?" * len(names))
+        rows = self.connection.execute(
+            f"SELECT name FROM refs WHERE name IN ({placeholders})", names
+        )
+        return {name for (name,) in rows}
+
+    def close(self):
+        self.connection.close()
+        os.remove(self.path)
+        os.rmdir(os.path.dirname(self.path))
+
+
+def build_reference_index(chunk_size=DEFAULT_CHUNK_SIZE):
+    index = ReferenceIndex()
+
+    for model, image_field, variants_field in media_sources():
+        rows = (
+            model.objects.exclude(**{image_field: ""})
+            .exclude(**{f"{image_field}__isnull": True})
+            .values_list(image_field, variants_field)
+            .iterator(chunk_size=chunk_size)
+        )
+        for name, variants in rows:
+            index.add([name, *iter_variant_names(variants)])
+
+    index.connection.commit()
+    return index
+
+
+def iter_media_files(root, skip_dir=None):
+    """Yield ``(path, DirEntry)`` of every file under ``root``, depth first"""
+    directories = [root]
+
+    while directories:
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path != skip_dir:
+                        directories.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path, entry
+
+
+def remove_orphan(path, name, quarantine_dir):
+    if quarantine_dir:
+        target = os.path.join(quarantine_dir, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+    else:
+        os.remove(path)
+
+
+def collect_orphan_media(
+    grace_period=None,
+    dry_run=False,
+    quarantine=False,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+):
+    """
+    Delete (or move to the quarantine directory) files under
+    ``MEDIA_ROOT/uploads`` that no article picture, profile image or their
+    variants refer to and that are older than ``grace_period`` seconds.
+
+    References are snapshotted before the scan. Files saved or reused after
+    that (the content-addressed storage touches reused files) are younger
+    than the grace period, so they are never collected.
+    """
+    if grace_period is None:
+        grace_period = settings.ORPHAN_MEDIA_GRACE_PERIOD
+
+    media_root = os.fspath(settings.MEDIA_ROOT)
+    uploads_root = os.path.join(media_root, UPLOADS_DIR)
+    quarantine_dir = None
+    if quarantine:
+        quarantine_dir = settings.ORPHAN_MEDIA_QUARANTINE_DIR or os.path.join(
+            media_root, "quarantine"
+        )
+    report = OrphanReport(dry_run=dry_run)
+
+    if not os.path.isdir(uploads_root):
+        return report
+
+    cutoff = time.time() - grace_period
+    index = build_reference_index(chunk_size)
+
+    try:
+        files = iter_media_files(uploads_root, skip_dir=quarantine_dir)
+        while chunk := list(islice(files, chunk_size)):
+            report.scanned += len(chunk)
+
+            candidates = {}
+            for path, entry in chunk:
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime < cutoff:
+                    name = os.path.relpath(path, media_root).replace(os.sep, "/")
+                    candidates[name] = (path, stat.st_size)
+
+            if not candidates:
+                continue
+
+            orphans = set(candidates) - index.referenced(list(candidates))
+            for name in orphans:
+                path, size = candidates[name]
+                if not dry_run:
+                    try:
+                        remove_orphan(path, name, quarantine_dir)
+                    except FileNotFoundError:
+                        continue
+                report.orphans += 1
+                report.bytes_reclaimed += size
+
+            if orphans and not dry_run:
+                MediaBlob.objects.filter(name__in=orphans).delete()
+    finally:
+        index.close()
+
+    logger.info(f"Orphan media collected ({report})")
+    return report
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-18 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0003_article_source"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="scraped_url_canonical",
+            field=models.URLField(
+                blank=True, editable=False, max_length=2000, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="scraped_url_hash",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=64, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,120 @@
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.db import migrations, transaction
+
+# Frozen copy of the URL canonicalization of articles.utils at the time of
+# this migration, later changes to it must not change what it does
+HACKER_NEWS_BASE_URL = "https://news.ycombinator.com/"
+
+TRACKING_QUERY_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "ref", "ref_src", "_hsenc", "_hsmi",
+}
+TRACKING_QUERY_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+BATCH_SIZE = 1000
+
+
+def _is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_QUERY_PARAMS or name.startswith(TRACKING_QUERY_PREFIXES)
+
+
+def canonicalize_url(url):
+    url = url.strip()
+    if url and not re.match(r"https?://", url, re.IGNORECASE):
+        url = HACKER_NEWS_BASE_URL + url
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+
+    userinfo, _, host = parts.netloc.rpartition("@")
+    host = host.lower()
+    if port and port == DEFAULT_PORTS.get(scheme):
+        host = host.rsplit(":", 1)[0]
+    netloc = f"{userinfo}@{host}" if userinfo else host
+
+    query = urlencode(
+        [
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking_param(name)
+        ]
+    )
+
+    return urlunsplit((scheme, netloc, parts.path or "/", query, parts.fragment))
+
+
+def fill_hashes(apps, schema_editor):
+    """
+    Fill the canonical URL and its hash of scraped rows in batches. Rows whose
+    canonical URL is already taken only get the canonical URL, which marks
+    them as duplicates without breaking the unique index added by 0006.
+    """
+    article_model = apps.get_model("articles", "Article")
+    last_pk = 0
+
+    while True:
+        batch = list(
+            article_model.objects.filter(
+                pk__gt=last_pk,
+                scraped_url__isnull=False,
+                scraped_url_canonical__isnull=True,
+            )
+            .exclude(scraped_url="")
+            .order_by("pk")
+            .only("pk", "scraped_url")[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+
+        last_pk = batch[-1].pk
+        by_hash = {}
+
+        for article in batch:
+            article.scraped_url_canonical = canonicalize_url(article.scraped_url)
+            article.scraped_url_hash = hashlib.sha256(
+                article.scraped_url_canonical.encode("utf-8")
+            ).hexdigest()
+            by_hash.setdefault(article.scraped_url_hash, article)
+
+        with transaction.atomic():
+            taken = set(
+                article_model.objects.filter(scraped_url_hash__in=by_hash.keys())
+                .values_list("scraped_url_hash", flat=True)
+            )
+            updated = [
+                article for url_key, article in by_hash.items() if url_key not in taken
+            ]
+            duplicates = [
+                article
+                for article in batch
+                if article.scraped_url_hash in taken
+                or by_hash[article.scraped_url_hash] is not article
+            ]
+            for article in duplicates:
+                article.scraped_url_hash = None
+
+            article_model.objects.bulk_update(
+                updated, ["scraped_url_canonical", "scraped_url_hash"]
+            )
+            article_model.objects.bulk_update(duplicates, ["scraped_url_canonical"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0004_article_scraped_url_canonical_article_scraped_url_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_hashes, migrations.RunPython.noop),
+    ]
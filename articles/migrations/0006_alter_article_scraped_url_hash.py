@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-18 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0005_fill_scraped_url_hash"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="article",
+            name="scraped_url_hash",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, null=True, unique=True
+            ),
+        ),
+    ]
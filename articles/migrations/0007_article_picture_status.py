@@ -0,0 +1,38 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+def mark_existing_pictures_ready(apps, schema_editor):
+    article_model = apps.get_model("articles", "Article")
+    article_model.objects.exclude(picture="").exclude(picture__isnull=True).update(
+        picture_status="ready"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0006_alter_article_scraped_url_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="picture_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="picture_status",
+            field=models.CharField(
+                blank=True,
+                choices=[("processing", "Processing"), ("ready", "Ready")],
+                editable=False,
+                max_length=20,
+            ),
+        ),
+        migrations.RunPython(
+            mark_existing_pictures_ready, migrations.RunPython.noop
+        ),
+    ]
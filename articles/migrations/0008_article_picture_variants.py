@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0007_article_picture_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="picture_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0012_article_updated_at"),
+    ]
+
+    operations = [
+        # Existing rows are filled by 0015_fill_article_excerpts
+        migrations.AddField(
+            model_name="article",
+            name="excerpt",
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
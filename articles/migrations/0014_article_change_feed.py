@@ -0,0 +1,54 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0013_article_excerpt"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArticleTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("article_id", models.PositiveBigIntegerField(unique=True)),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[("Manual", "Manual"), ("Scraped", "Scraped")],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "deleted_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["deleted_at", "id"], name="tombstone_deleted_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(fields=["updated_at", "id"], name="article_updated_idx"),
+        ),
+    ]
@@ -0,0 +1,74 @@
+import html
+import re
+
+from django.db import migrations, transaction
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+# Frozen copy of the excerpt logic of articles.utils at the time of this
+# migration, later changes to it must not change what it does
+EXCERPT_LENGTH = 300
+EXCERPT_ELLIPSIS = "\u2026"
+MARKDOWN_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+MARKDOWN_MARKERS_RE = re.compile(r"(^|\s)(#{1,6}|>)(?=\s)|\*\*?|`+|~~")
+
+BATCH_SIZE = 1000
+
+
+def make_excerpt(content):
+    text = html.unescape(strip_tags(content or ""))
+    text = MARKDOWN_MARKERS_RE.sub(r"\1", MARKDOWN_LINK_RE.sub(r"\1", text))
+    text = " ".join(text.split())
+
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+
+    # One character is left for the ellipsis
+    cut = text[:EXCERPT_LENGTH]
+    if " " in cut:
+        cut = cut[: cut.rindex(" ")]
+    else:
+        cut = cut[: EXCERPT_LENGTH - 1]
+
+    return cut.rstrip(" .,;:!?-") + EXCERPT_ELLIPSIS
+
+
+def fill_excerpts(apps, schema_editor):
+    """Compute the missing excerpts of articles with content in batches"""
+    article_model = apps.get_model("articles", "Article")
+    last_pk = 0
+
+    while True:
+        batch = list(
+            article_model.objects.filter(pk__gt=last_pk, excerpt="")
+            .exclude(content="")
+            .order_by("pk")
+            .only("pk", "content", "excerpt")[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+
+        last_pk = batch[-1].pk
+        now = timezone.now()
+        updated = []
+
+        for article in batch:
+            excerpt = make_excerpt(article.content)
+            if excerpt != article.excerpt:
+                article.excerpt = excerpt
+                article.updated_at = now
+                updated.append(article)
+
+        with transaction.atomic():
+            article_model.objects.bulk_update(updated, ["excerpt", "updated_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0014_article_change_feed"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
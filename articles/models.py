@@ -1,14 +1,22 @@
-import os
-
 from django.conf import settings
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils import timezone
 
-from PIL import Image
+from articles.images import delete_variants, upload_content_hash
+from articles.utils import (
+    articles_picture_file_path,
+    canonicalize_url,
+    make_excerpt,
+    url_hash,
+)
+from blog_service.mixins import ChangeTrackingMixin
 
-from articles.utils import articles_picture_file_path
+# Columns written by process_article_picture_task
+PICTURE_TASK_FIELDS = ("picture", "picture_status", "picture_hash", "picture_variants")
 
 
-class Article(models.Model):
+class Article(ChangeTrackingMixin, models.Model):
     MANUAL = "Manual"
     SCRAPED = "Scraped"
 
@@ -17,47 +25,155 @@ class Article(models.Model):
         (SCRAPED, "Scraped"),
     ]
 
+    PICTURE_PROCESSING = "processing"
+    PICTURE_READY = "ready"
+
+    PICTURE_STATUS_CHOICES = [
+        (PICTURE_PROCESSING, "Processing"),
+        (PICTURE_READY, "Ready"),
+    ]
+
     title = models.CharField(max_length=255, blank=True)
     content = models.TextField(blank=True)
+    # Plain text preview of content for lists, see make_excerpt
+    excerpt = models.TextField(blank=True, editable=False)
     picture = models.ImageField(upload_to=articles_picture_file_path, null=True)
+    picture_status = models.CharField(
+        max_length=20, choices=PICTURE_STATUS_CHOICES, blank=True, editable=False
+    )
+    picture_hash = models.CharField(max_length=64, blank=True, editable=False)
+    picture_variants = models.JSONField(default=dict, blank=True, editable=False)
     published_at = models.DateField(auto_now_add=True)
+    # Empty for articles created before the change feed
+    created_at = models.DateTimeField(auto_now_add=True, null=True)
+    # Version of the rendered article, also bumped when its author changes
+    updated_at = models.DateTimeField(auto_now=True)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, blank=True, null=True, related_name="articles"
     )
     scraped_title = models.CharField(max_length=255, blank=True, null=True)
     scraped_url = models.URLField(max_length=2000, blank=True, null=True)
+    scraped_url_canonical = models.URLField(
+        max_length=2000, blank=True, null=True, editable=False
+    )
+    scraped_url_hash = models.CharField(
+        max_length=64, unique=True, blank=True, null=True, editable=False
+    )
     source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default=MANUAL)
 
     class Meta:
         ordering = ["-published_at", "-id"]
+        indexes = [
+            # Article lists: WHERE source = ? ORDER BY published_at DESC, id DESC
+            models.Index(
+                fields=["source", "-published_at", "-id"],
+                name="article_source_published_idx",
+            ),
+            # Bot /latest: WHERE source = ? ORDER BY id DESC LIMIT 1
+            models.Index(fields=["source", "-id"], name="article_source_id_idx"),
+            # ETag and Last-Modified: MAX(updated_at) WHERE source = ?
+            models.Index(
+                fields=["source", "updated_at"], name="article_source_updated_idx"
+            ),
+            # Change feed: WHERE (updated_at, id) > ? ORDER BY updated_at, id
+            models.Index(fields=["updated_at", "id"], name="article_updated_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
-    def save(
-        self,
-        force_insert=False,
-        force_update=False,
-        using=None,
-        update_fields=None,
-        *args,
-        **kwargs,
-    ):
-        try:
-            old_instance = Article.objects.get(pk=self.pk)
-            old_picture = old_instance.picture
-        except Article.DoesNotExist:
-            old_picture = None
+    def clean(self):
+        super().clean()
+
+        # scraped_url_hash is not editable, so validate_unique skips it
+        if not self.scraped_url or not self.has_changed("scraped_url"):
+            return
+        canonical_url = canonicalize_url(self.scraped_url)
+        if canonical_url == self.scraped_url_canonical:
+            return
+        duplicates = Article.objects.filter(scraped_url_hash=url_hash(canonical_url))
+        if duplicates.exclude(pk=self.pk).exists():
+            raise ValidationError(
+                {"scraped_url": "An article with this URL already exists."}
+            )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            # Every save is a change, see articles.changes
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+
+        if self.has_changed("content"):
+            self.excerpt = make_excerpt(self.content)
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "content" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "excerpt"}
+
+        picture_changed = self.has_changed("picture")
+        upload_hash = ""
+        if picture_changed and self.picture and not self.picture._committed:
+            upload_hash = upload_content_hash(self.picture)
+            if self.old_value("picture") and upload_hash == self.old_value(
+                "picture_hash"
+            ):
+                # The same bytes uploaded again, keep the processed picture
+                self.picture = self.old_value("picture")
+                picture_changed = False
+
+        old_picture = self.old_value("picture") if picture_changed else None
+        old_variants = self.old_value("picture_variants") if picture_changed else None
+
+        if picture_changed or not self.picture:
+            self.picture_status = self.PICTURE_PROCESSING if self.picture else ""
+            # Hash of the upload, not of the shrunk picture the task stores
+            self.picture_hash = upload_hash
+            self.picture_variants = {}
+        elif kwargs.get("update_fields") is None and not self._state.adding:
+            # Don't overwrite what the picture task stored in the meantime
+            kwargs["keep_fields"] = PICTURE_TASK_FIELDS
 
         super().save(*args, **kwargs)
 
-        if old_picture and self.picture != old_picture:
-            if os.path.isfile(old_picture.path):
-                os.remove(old_picture.path)
+        if old_picture:
+            storage = self.picture.storage
+
+            def delete_old_picture():
+                storage.delete(old_picture)
+                delete_variants(old_variants, storage=storage)
 
-        if self.picture:
-            img = Image.open(self.picture.path)
-            if img.height > 300 or img.width > 300:
-                output_size = (300, 300)
-                img.thumbnail(output_size)
-                img.save(self.picture.path)
+            transaction.on_commit(delete_old_picture)
+
+        if picture_changed and self.picture:
+            from articles.tasks import process_article_picture_task
+
+            # The worker has to see the committed file name
+            transaction.on_commit(
+                lambda: process_article_picture_task.delay(self.pk)
+            )
+
+
+class ArticleTombstone(models.Model):
+    """Deleted article, reported by the change feed until it is pruned"""
+
+    article_id = models.PositiveBigIntegerField(unique=True)
+    source = models.CharField(max_length=20, choices=Article.SOURCE_CHOICES)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"Article {self.article_id}"
+
+
+class MediaBlob(models.Model):
+    """Reference count of a file in ``ContentAddressedStorage``"""
+
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    references = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.name
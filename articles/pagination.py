@@ -1,6 +1,169 @@
-from rest_framework.pagination import PageNumberPagination
+import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    Cursor,
+    CursorPagination,
+    PageNumberPagination,
+)
+
+CURSOR = "cursor"
+PAGE = "page"
+PAGINATION_QUERY_PARAM = "pagination"
+PAGINATION_HEADER = "X-Pagination"
 
 
 class ApiPagination(PageNumberPagination):
     page_size = 5
     max_page_size = 100
+
+
+class ArticleCursorPagination(CursorPagination):
+    """
+    Keyset pagination on ``(published_at, id)``, the article ``Meta.ordering``.
+
+    The cursor holds the key of the first or last article of a page and the
+    next page is selected with ``WHERE (published_at, id) < key``, so neither
+    ``COUNT(*)`` nor ``OFFSET`` is needed and every page costs the same.
+    """
+
+    page_size = 5
+    ordering = ("-published_at", "-id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        if self.cursor is not None:
+            queryset = queryset.filter(
+                self.after(self.decode_position(self.cursor.position), reverse)
+            )
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [field.lstrip("-") for field in ordering]
+        results = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        self.display_page_controls = self.template is not None and (
+            self.has_next or self.has_previous
+        )
+        return self.page
+
+    def after(self, key, reverse):
+        """Condition selecting the rows past ``key`` in the page direction"""
+        published_at, pk = key
+        if reverse:
+            return Q(published_at__gt=published_at) | Q(
+                published_at=published_at, id__gt=pk
+            )
+        return Q(published_at__lt=published_at) | Q(
+            published_at=published_at, id__lt=pk
+        )
+
+    def encode_position(self, instance):
+        # Pages hold model instances or the fast list path's named tuples
+        return f"{instance.published_at.isoformat()}_{instance.id}"
+
+    def decode_position(self, position):
+        try:
+            published_at, pk = (position or "").split("_")
+            return datetime.date.fromisoformat(published_at), int(pk)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self.encode_position(self.page[-1])
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        position = self.encode_position(self.page[0])
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+
+class ArticlePagination(BasePagination):
+    """
+    Page number pagination by default, keyset pagination when the request
+    asks for it with ``?pagination=cursor``, carries a ``cursor`` or comes
+    from a client sending the ``X-Pagination: cursor`` header.
+
+    Search results are ordered by relevance, they always use page numbers.
+    """
+
+    page_number_class = ApiPagination
+    cursor_class = ArticleCursorPagination
+
+    def __init__(self):
+        self.paginator = self.page_number_class()
+
+    def get_mode(self, request):
+        mode = request.query_params.get(PAGINATION_QUERY_PARAM)
+        if mode is None and CURSOR in request.query_params:
+            mode = CURSOR
+        if mode is None:
+            mode = request.headers.get(PAGINATION_HEADER)
+
+        return CURSOR if (mode or "").lower() == CURSOR else PAGE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        use_cursor = self.get_mode(request) == CURSOR and not queryset.query.order_by
+
+        self.paginator = self.cursor_class() if use_cursor else self.page_number_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_page_info(self):
+        """Everything a page response holds besides the results"""
+        page = getattr(self.paginator, "page", None)
+        count = page.paginator.count if hasattr(page, "paginator") else None
+
+        return count, self.paginator.get_next_link(), self.paginator.get_previous_link()
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = self.page_number_class().get_paginated_response_schema(schema)
+        response_schema["required"] = ["results"]
+        response_schema["properties"]["count"]["description"] = (
+            "Only returned with page number pagination"
+        )
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": PAGINATION_QUERY_PARAM,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Pagination mode, `cursor` pages by opaque cursors without "
+                    f"a count (default `page`, or the `{PAGINATION_HEADER}` header)"
+                ),
+                "schema": {"type": "string", "enum": [PAGE, CURSOR]},
+            },
+            *self.page_number_class().get_schema_operation_parameters(view),
+            *self.cursor_class().get_schema_operation_parameters(view),
+        ]
+
+    @property
+    def display_page_controls(self):
+        return self.paginator.display_page_controls
+
+    def to_html(self):
+        return self.paginator.to_html()
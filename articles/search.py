@@ -0,0 +1,189 @@
+"""
+Full-text search over article ``title``, ``scraped_title`` and ``content``.
+
+PostgreSQL keeps a generated ``search_vector`` tsvector column with a GIN
+index, SQLite keeps the ``articles_article_fts`` FTS5 table in sync with
+triggers; both are created in migration 0010. Other databases fall back to
+``icontains``.
+"""
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+SEARCH_FIELDS = ("title", "scraped_title", "content")
+SEARCH_CONFIG = "english"
+FTS_TABLE = "articles_article_fts"
+
+# Title matches weigh more than content matches
+POSTGRES_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(scraped_title, '')), 'A')"
+    " || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'B')"
+)
+
+REBUILD_FTS = f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')"
+
+SQLITE_TRIGGERS = {
+    "insert": f"""
+        CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON articles_article BEGIN
+            INSERT INTO {FTS_TABLE} (rowid, title, scraped_title, content)
+            VALUES (new.id, new.title, new.scraped_title, new.content);
+        END
+    """,
+    "delete": f"""
+        CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON articles_article BEGIN
+            INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, scraped_title, content)
+            VALUES ('delete', old.id, old.title, old.scraped_title, old.content);
+        END
+    """,
+    "update": f"""
+        CREATE TRIGGER {FTS_TABLE}_update
+        AFTER UPDATE OF title, scraped_title, content ON articles_article BEGIN
+            INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, scraped_title, content)
+            VALUES ('delete', old.id, old.title, old.scraped_title, old.content);
+            INSERT INTO {FTS_TABLE} (rowid, title, scraped_title, content)
+            VALUES (new.id, new.title, new.scraped_title, new.content);
+        END
+    """,
+}
+
+
+def create_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "ALTER TABLE articles_article ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({POSTGRES_VECTOR}) STORED"
+        )
+        schema_editor.execute(
+            "CREATE INDEX articles_article_search_vector_idx "
+            "ON articles_article USING gin (search_vector)"
+        )
+    elif vendor == "sqlite":
+        # External content table, the text itself stays in articles_article
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "title, scraped_title, content, "
+            "content='articles_article', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        for trigger in SQLITE_TRIGGERS.values():
+            schema_editor.execute(trigger)
+        schema_editor.execute(REBUILD_FTS)
+
+
+def ensure_search_triggers(db_connection):
+    """
+    Recreate missing FTS5 triggers, SQLite drops them whenever a migration
+    rebuilds ``articles_article``. The index is rebuilt in that case.
+    """
+    if db_connection.vendor != "sqlite":
+        return
+
+    with db_connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT type, name FROM sqlite_master WHERE name LIKE %s",
+            [f"{FTS_TABLE}%"],
+        )
+        existing = {name for _, name in cursor.fetchall()}
+        if FTS_TABLE not in existing:
+            return
+
+        missing = [
+            trigger
+            for name, trigger in SQLITE_TRIGGERS.items()
+            if f"{FTS_TABLE}_{name}" not in existing
+        ]
+        for trigger in missing:
+            cursor.execute(trigger)
+        if missing:
+            cursor.execute(REBUILD_FTS)
+
+
+def drop_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "ALTER TABLE articles_article DROP COLUMN IF EXISTS search_vector"
+        )
+    elif vendor == "sqlite":
+        for name in SQLITE_TRIGGERS:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{name}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def fts5_query(query):
+    """Quote every word, so user input can't use FTS5 query syntax"""
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"' for word in words)
+
+
+def search_articles(queryset, query):
+    """
+    Filter ``queryset`` to articles matching ``query`` and order them by
+    relevance, best first. The rank is available as ``search_rank``.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    ordering = ["-search_rank", *queryset.model._meta.ordering]
+
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVectorField,
+        )
+
+        search_query = SearchQuery(
+            query, config=SEARCH_CONFIG, search_type="websearch"
+        )
+        search_vector = RawSQL(
+            "articles_article.search_vector", [], output_field=SearchVectorField()
+        )
+        return (
+            queryset.alias(search_vector=search_vector)
+            .filter(search_vector=search_query)
+            .annotate(search_rank=SearchRank(F("search_vector"), search_query))
+            .order_by(*ordering)
+        )
+
+    if connection.vendor == "sqlite":
+        match = fts5_query(query)
+        if not match:
+            return queryset.none()
+
+        # bm25() is lower for better matches
+        return (
+            queryset.filter(
+                id__in=RawSQL(
+                    f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                    [match],
+                )
+            )
+            .annotate(
+                search_rank=RawSQL(
+                    f"SELECT -bm25({FTS_TABLE}, 10.0, 10.0, 1.0) FROM {FTS_TABLE} "
+                    f"WHERE {FTS_TABLE} MATCH %s AND rowid = articles_article.id",
+                    [match],
+                    output_field=FloatField(),
+                )
+            )
+            .order_by(*ordering)
+        )
+
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f"{field}__icontains": query})
+
+    return (
+        queryset.filter(condition)
+        .annotate(search_rank=Value(1.0, output_field=FloatField()))
+        .order_by(*ordering)
+    )
@@ -1,6 +1,12 @@
+from django.db.models import CharField, Case, F, Value, When
+from django.db.models.functions import Concat
 from rest_framework import serializers
 
+from articles.changes import CREATED, DEFAULT_LIMIT, DELETED, MAX_LIMIT, UPDATED
+from articles.fieldsets import SparseFieldsetSerializerMixin
+from articles.images import validate_image_budget
 from articles.models import Article
+from blog_service.serializers import PictureVariantsField
 from users.serializers import UserSerializer
 
 
@@ -12,29 +18,117 @@ class ArticleSerializer(serializers.ModelSerializer):
         fields = ("title", "content", "user")
 
 
-class ArticleListSerializer(serializers.ModelSerializer):
+# User.full_name computed in SQL, for the fast list path
+AUTHOR_FULL_NAME = Case(
+    When(user__isnull=True, then=Value(None)),
+    default=Concat("user__first_name", Value(" "), "user__last_name"),
+    output_field=CharField(),
+)
+
+
+class ArticleListSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     user = serializers.SlugRelatedField(slug_field="full_name", read_only=True)
+    picture_variants = PictureVariantsField()
 
     class Meta:
         model = Article
-        fields = ("id", "title", "content", "picture", "published_at", "user")
+        fields = (
+            "id",
+            "title",
+            "excerpt",
+            "picture",
+            "picture_variants",
+            "published_at",
+            "user",
+        )
+        values_expressions = {"user": AUTHOR_FULL_NAME}
 
 
-class ArticleDetailSerializer(serializers.ModelSerializer):
+class ArticleDetailSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     user = UserSerializer(read_only=True)
+    picture_variants = PictureVariantsField()
 
     class Meta:
         model = Article
-        fields = ("id", "title", "content", "picture", "published_at", "user")
+        fields = (
+            "id",
+            "title",
+            "content",
+            "picture",
+            "picture_variants",
+            "published_at",
+            "user",
+        )
 
 
 class ArticlePictureSerializer(serializers.ModelSerializer):
     class Meta:
         model = Article
-        fields = ("id", "picture")
+        fields = ("id", "picture", "picture_status")
+        read_only_fields = ("picture_status",)
+        extra_kwargs = {"picture": {"validators": [validate_image_budget]}}
 
 
-class ArticleScrapedSerializer(serializers.ModelSerializer):
+class ArticleScrapedSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Article
         fields = ("id", "scraped_title", "scraped_url")
+
+
+class ArticleExportSerializer(serializers.ModelSerializer):
+    user = serializers.IntegerField(source="user_id", read_only=True)
+    author = serializers.CharField(source="user.full_name", read_only=True)
+
+    class Meta:
+        model = Article
+        fields = (
+            "id",
+            "source",
+            "title",
+            "scraped_title",
+            "scraped_url",
+            "content",
+            "picture",
+            "published_at",
+            "created_at",
+            "updated_at",
+            "user",
+            "author",
+        )
+        values_expressions = {"user": F("user_id"), "author": AUTHOR_FULL_NAME}
+
+
+class ArticleExportFilterSerializer(serializers.Serializer):
+    source = serializers.ChoiceField(choices=Article.SOURCE_CHOICES, required=False)
+    user = serializers.IntegerField(required=False)
+    published_from = serializers.DateField(required=False)
+    published_to = serializers.DateField(required=False)
+
+
+class ArticleChangesQuerySerializer(serializers.Serializer):
+    since = serializers.CharField(
+        required=False, help_text="next_token of the previous response"
+    )
+    limit = serializers.IntegerField(
+        required=False, default=DEFAULT_LIMIT, min_value=1, max_value=MAX_LIMIT
+    )
+
+
+class ArticleChangeSerializer(serializers.Serializer):
+    change = serializers.ChoiceField(choices=(CREATED, UPDATED, DELETED))
+    id = serializers.IntegerField()
+    source = serializers.ChoiceField(choices=Article.SOURCE_CHOICES)
+    changed_at = serializers.DateTimeField()
+    article = ArticleExportSerializer(allow_null=True)
+
+
+class ArticleChangesSerializer(serializers.Serializer):
+    results = ArticleChangeSerializer(many=True)
+    next_token = serializers.CharField()
+    has_more = serializers.BooleanField()
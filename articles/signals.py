@@ -1,16 +1,40 @@
 import logging
-import re
 
 from django.conf import settings
-from django.db.models.signals import post_save, pre_save
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from article_telegram_bot.tasks import send_new_article_notification_task
+from users.models import Profile
 
-from .models import Article
+from .bloom import remember_url_hashes
+from .cache import bump_article_generation, touch_user_articles
+from .live import publish_article
+from .models import Article, ArticleTombstone
+from .search import ensure_search_triggers
+from .utils import absolute_scraped_url, canonicalize_url, url_hash
 
 logger = logging.getLogger(__name__)
 
+# User fields rendered with articles, e.g. the author's full name
+ARTICLE_USER_FIELDS = {"email", "username", "first_name", "last_name", "is_staff"}
+
+
+def notify_new_article(article_id, article_title):
+    bot_token = settings.BOT_TOKEN
+    chat_id = settings.TELEGRAM_CHAT_ID
+
+    logger.info(f"Article created: {article_title}. Sending notification.")
+    send_new_article_notification_task.delay(
+        article_id=article_id,
+        article_title=article_title,
+        bot_token=bot_token,
+        chat_id=int(chat_id)
+    )
+
 
 @receiver(post_save, sender=Article)
 def send_new_article_notification(sender, instance, created, **kwargs):
@@ -20,21 +44,86 @@ def send_new_article_notification(sender, instance, created, **kwargs):
         else:
             article_title = instance.scraped_title
 
-        article_id = instance.id
-        bot_token = settings.BOT_TOKEN
-        chat_id = settings.TELEGRAM_CHAT_ID
-
-        logger.info(f"Article created: {article_title}. Sending notification.")
-        send_new_article_notification_task.delay(
-            article_id=article_id,
-            article_title=article_title,
-            bot_token=bot_token,
-            chat_id=int(chat_id)
-        )
+        notify_new_article(instance.id, article_title)
 
 
 @receiver(pre_save, sender=Article)
 def prepend_base_url(sender, instance, **kwargs):
-    if instance.scraped_url and not re.match(r"https?://", instance.scraped_url):
-        base_url = "https://news.ycombinator.com/"
-        instance.scraped_url = base_url + instance.scraped_url
+    instance.scraped_url = absolute_scraped_url(instance.scraped_url)
+
+
+@receiver(pre_save, sender=Article)
+def set_scraped_url_hash(sender, instance, **kwargs):
+    if not instance.has_changed("scraped_url"):
+        return
+
+    canonical_url = (
+        canonicalize_url(instance.scraped_url) if instance.scraped_url else None
+    )
+    # Duplicates the backfill left without a hash keep it that way
+    if canonical_url != instance.scraped_url_canonical:
+        instance.scraped_url_canonical = canonical_url
+        instance.scraped_url_hash = url_hash(canonical_url) if canonical_url else None
+
+
+@receiver(post_save, sender=Article)
+def remember_scraped_url_hash(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "scraped_url_hash" not in update_fields:
+        return
+
+    if instance.scraped_url_hash and instance.has_changed("scraped_url_hash"):
+        remember_url_hashes([instance.scraped_url_hash])
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    if sender.name == "articles":
+        ensure_search_triggers(connections[using])
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article_cache(sender, instance, **kwargs):
+    sources = {instance.source, instance.old_value("source")} - {None}
+    transaction.on_commit(lambda: bump_article_generation(*sources))
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_article_cache_for_user(sender, instance, created, **kwargs):
+    # A plain save, e.g. on login, leaves the articles of the user as they are
+    if not created and any(instance.has_changed(name) for name in ARTICLE_USER_FIELDS):
+        touch_user_articles(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_article_cache_for_profile(sender, instance, created, **kwargs):
+    if created or any(
+        instance.has_changed(name) for name in ("user", "image", "image_variants")
+    ):
+        touch_user_articles(instance.user_id)
+
+
+@receiver(post_delete, sender=Profile)
+def invalidate_article_cache_for_deleted_profile(sender, instance, **kwargs):
+    touch_user_articles(instance.user_id)
+
+
+@receiver(post_save, sender=Article)
+def clear_article_tombstone(sender, instance, created, **kwargs):
+    # An article restored with its old id, e.g. from a fixture, is no longer deleted
+    if created:
+        ArticleTombstone.objects.filter(article_id=instance.pk).delete()
+
+
+@receiver(post_delete, sender=Article)
+def create_article_tombstone(sender, instance, **kwargs):
+    ArticleTombstone.objects.update_or_create(
+        article_id=instance.pk,
+        defaults={"source": instance.source, "deleted_at": timezone.now()},
+    )
+
+
+@receiver(post_save, sender=Article)
+def publish_live_article(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(lambda: publish_article(instance, created))
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+
+# uploads/articles/ab/cd/abcd...ef.jpg
+CONTENT_NAME_RE = re.compile(r"(^|/)[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.\w+)?$")
+HASH_PREFIX_DIRS_RE = re.compile(r"/[0-9a-f]{2}/[0-9a-f]{2}$")
+
+
+def content_hash(content, chunk_size=64 * 1024):
+    digest = hashlib.sha256()
+
+    # chunks() rewinds the file, so it can be read again when it is written
+    for chunk in content.chunks(chunk_size):
+        digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def is_content_name(name):
+    return bool(CONTENT_NAME_RE.search(name))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names files by the sha256 of their content.
+
+    Only the directory and extension of the requested name are kept, the
+    file goes to ``<directory>/<h[:2]>/<h[2:4]>/<h><extension>``. Saving
+    the same content again returns the existing file and increments its
+    reference count in ``MediaBlob``; ``delete`` decrements it and removes
+    the file with the last reference. Files that are not content-addressed
+    (uploaded before this storage was used) are deleted right away.
+    """
+
+    def content_name(self, name, digest):
+        directory, basename = os.path.split(name)
+        _, extension = os.path.splitext(basename)
+        # Names derived from a stored file (e.g. variants) keep its top directory
+        directory = HASH_PREFIX_DIRS_RE.sub("", directory)
+
+        return os.path.join(
+            directory, digest[:2], digest[2:4], f"{digest}{extension.lower()}"
+        )
+
+    def get_available_name(self, name, max_length=None):
+        # The same name always means the same content
+        return name
+
+    def _save(self, name, content):
+        from articles.models import MediaBlob
+
+        name = self.content_name(name, content_hash(content))
+
+        with transaction.atomic():
+            MediaBlob.objects.get_or_create(name=name, defaults={"size": content.size})
+            blob = MediaBlob.objects.select_for_update().get(name=name)
+
+            if super().exists(name):
+                # Reused files count as new for collect_orphan_media
+                os.utime(self.path(name))
+            else:
+                super()._save(name, content)
+
+            blob.references += 1
+            blob.save(update_fields=["references"])
+
+        return name
+
+    def delete(self, name):
+        from articles.models import MediaBlob
+
+        if not name:
+            raise ValueError("The name must be given to delete().")
+
+        if not is_content_name(name):
+            super().delete(name)
+            return
+
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+            if blob is not None and blob.references > 1:
+                blob.references -= 1
+                blob.save(update_fields=["references"])
+                return
+
+            if blob is not None:
+                blob.delete()
+            super().delete(name)
@@ -1,40 +1,115 @@
-import csv
 import os
 import logging
 
 from celery import shared_task
-from scrapy.cmdline import execute
+from django.conf import settings
+from django.utils import timezone
 
+from articles.bloom import build_url_bloom_filter
+from articles.cache import bump_article_generation
+from articles.changes import prune_tombstones
+from articles.images import delete_variants, file_content_hash, process_picture
+from articles.importers import import_articles_from_csv
+from articles.media_gc import collect_orphan_media
 from articles.models import Article
+from articles_scraper.runner import get_scraper_pool
 
 logger = logging.getLogger(__name__)
 
-SHARED_DATA_PATH = "/code/shared-data"
+SHARED_DATA_PATH = settings.SHARED_DATA_PATH
 
 
 @shared_task
-def scrape_articles_task():
-    output_file = os.path.join(SHARED_DATA_PATH, "stories.csv")
-    execute(["scrapy", "crawl", "stories", "-O", output_file])
+def scrape_articles_task(incremental=True):
+    # Stories are stored by ArticlesScraperPipeline while the spider runs
+    result = get_scraper_pool().run(
+        "stories", timeout=settings.SCRAPER_RUN_TIMEOUT, incremental=incremental
+    )
+    logger.info(
+        f"Scraping finished ({result.finish_reason}): {result.item_count} stories, "
+        f"{result.stats.get('articles/inserted', 0)} new"
+    )
+    return {
+        "finish_reason": result.finish_reason,
+        "items": result.item_count,
+        "timed_out": result.timed_out,
+    }
 
 
 def _import_articles(file_path):
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                if not Article.objects.filter(scraped_url=row["url"]).exists():
-                    Article.objects.create(
-                        scraped_title=row["title"],
-                        scraped_url=row["url"],
-                        source="Scraped"
-                    )
-        logger.info("Data imported successfully")
+        result = import_articles_from_csv(file_path)
     except FileNotFoundError:
         logger.error("File 'stories.csv' not found")
+        return None
+
+    logger.info(f"Data imported successfully ({result})")
+    return result.as_dict()
 
 
 @shared_task
 def import_articles_task():
     file_path = os.path.join(SHARED_DATA_PATH, "stories.csv")
-    _import_articles(file_path)
+    return _import_articles(file_path)
+
+
+@shared_task
+def rebuild_url_bloom_filter_task():
+    report = build_url_bloom_filter()
+    logger.info(f"URL Bloom filter rebuilt: {report}")
+    return report
+
+
+@shared_task
+def process_article_picture_task(article_id):
+    article = Article.objects.filter(pk=article_id).first()
+    if article is None or not article.picture:
+        return None
+
+    uploaded_name = article.picture.name
+    storage = article.picture.storage
+    queryset = Article.objects.filter(pk=article_id, picture=uploaded_name)
+
+    if article.picture_status == Article.PICTURE_READY:
+        logger.info(f"Picture of article {article_id} is already processed, skipping")
+        return article.picture_hash
+
+    try:
+        # Set by Article.save for uploads, the hash of the file they sent
+        content_hash = article.picture_hash or file_content_hash(
+            storage.path(uploaded_name)
+        )
+        name, variants = process_picture(uploaded_name, storage)
+    except FileNotFoundError:
+        logger.warning(f"Picture of article {article_id} is missing")
+        return None
+
+    # The picture may have been replaced while this task was running
+    updated = queryset.update(
+        picture=name,
+        picture_status=Article.PICTURE_READY,
+        picture_hash=content_hash,
+        picture_variants=variants,
+        updated_at=timezone.now(),
+    )
+
+    if updated:
+        bump_article_generation(article.source)
+    else:
+        delete_variants(variants, storage)
+    if name != uploaded_name:
+        storage.delete(uploaded_name if updated else name)
+
+    return content_hash
+
+
+@shared_task
+def collect_orphan_media_task(dry_run=False, quarantine=False):
+    return collect_orphan_media(dry_run=dry_run, quarantine=quarantine).as_dict()
+
+
+@shared_task
+def prune_article_tombstones_task():
+    deleted = prune_tombstones()
+    logger.info(f"Article tombstones pruned: {deleted}")
+    return deleted
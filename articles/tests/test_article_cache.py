@@ -0,0 +1,199 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from articles.cache import check_cache_backend, get_cache
+from articles.models import Article
+from articles.tasks import process_article_picture_task
+
+ARTICLE_URL = reverse("articles:article-list")
+SCRAPED_ARTICLE_URL = reverse("articles:scraped-articles-list")
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "articles": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "articles-tests",
+    },
+}
+
+
+def detail_url(article_id):
+    return reverse("articles:article-detail", args=[article_id])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ArticleResponseCacheTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="testpass",
+            username="testuser",
+            first_name="Ada",
+            last_name="Lovelace",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.article = Article.objects.create(title="Django", user=self.user)
+
+    def test_list_is_served_from_cache(self):
+        first = self.client.get(ARTICLE_URL, {"title": "dj", "page": 1})
+
+        with self.assertNumQueries(0):
+            second = self.client.get(ARTICLE_URL, {"page": 1, "title": "dj"})
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+
+    def test_different_params_are_cached_separately(self):
+        self.client.get(ARTICLE_URL, {"title": "dj"})
+
+        response = self.client.get(ARTICLE_URL, {"title": "flask"})
+
+        self.assertEqual(response.data["count"], 0)
+
+    def test_article_change_invalidates_list_and_detail(self):
+        self.client.get(ARTICLE_URL)
+        self.client.get(detail_url(self.article.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(detail_url(self.article.id), {"title": "Flask"})
+
+        response = self.client.get(ARTICLE_URL)
+        self.assertEqual(response.data["results"][0]["title"], "Flask")
+        response = self.client.get(detail_url(self.article.id))
+        self.assertEqual(response.data["title"], "Flask")
+
+    def test_delete_invalidates_list(self):
+        self.client.get(ARTICLE_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.delete()
+
+        self.assertEqual(self.client.get(ARTICLE_URL).data["count"], 0)
+
+    def test_user_name_change_invalidates_articles(self):
+        self.client.get(ARTICLE_URL)
+
+        self.user.first_name = "Grace"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        response = self.client.get(ARTICLE_URL)
+        self.assertEqual(response.data["results"][0]["user"], "Grace Lovelace")
+
+    def test_unrelated_user_update_keeps_cache(self):
+        self.client.get(ARTICLE_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save(update_fields=["last_login"])
+
+        with self.assertNumQueries(0):
+            self.client.get(ARTICLE_URL)
+
+    def test_plain_user_save_keeps_articles(self):
+        updated_at = self.article.updated_at
+        user = get_user_model().objects.get(pk=self.user.pk)
+
+        user.last_login = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.updated_at, updated_at)
+
+    def test_scraped_change_keeps_manual_cache(self):
+        self.client.get(ARTICLE_URL)
+        self.client.get(SCRAPED_ARTICLE_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(scraped_title="Scraped", source=Article.SCRAPED)
+
+        with self.assertNumQueries(0):
+            self.client.get(ARTICLE_URL)
+        self.assertEqual(self.client.get(SCRAPED_ARTICLE_URL).data["count"], 1)
+
+    def test_picture_task_invalidates_cache(self):
+        self.client.get(detail_url(self.article.id))
+        # Written like the picture task does, with update() and no post_save
+        Article.objects.filter(pk=self.article.pk).update(
+            picture="uploads/articles/a.jpg", picture_hash="abc"
+        )
+
+        with mock.patch(
+            "articles.tasks.process_picture",
+            return_value=("uploads/articles/a.jpg", {}),
+        ):
+            process_article_picture_task(self.article.pk)
+
+        response = self.client.get(detail_url(self.article.id))
+        self.assertTrue(response.data["picture"].endswith("uploads/articles/a.jpg"))
+
+
+class FileBasedArticleResponseCacheTests(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        settings = override_settings(
+            CACHES={
+                "default": LOCMEM_CACHES["default"],
+                "articles": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": self.cache_dir,
+                },
+            }
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass", username="testuser"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_is_cached_and_invalidated(self):
+        self.client.get(SCRAPED_ARTICLE_URL)
+
+        with self.assertNumQueries(0):
+            self.client.get(SCRAPED_ARTICLE_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(scraped_title="Scraped", source=Article.SCRAPED)
+
+        self.assertEqual(self.client.get(SCRAPED_ARTICLE_URL).data["count"], 1)
+
+    def test_change_in_another_process_invalidates_list(self):
+        self.client.get(SCRAPED_ARTICLE_URL)
+
+        # A Celery worker bumps the generation through its own cache instance
+        worker_cache = FileBasedCache(self.cache_dir, {})
+        with mock.patch(
+            "articles.cache.get_cache", return_value=worker_cache
+        ), self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(scraped_title="Scraped", source=Article.SCRAPED)
+
+        self.assertEqual(self.client.get(SCRAPED_ARTICLE_URL).data["count"], 1)
+
+
+class CacheBackendCheckTests(TestCase):
+    def test_warns_when_cache_is_off(self):
+        with self.assertLogs("articles.cache", "WARNING") as logs:
+            check_cache_backend()
+
+        self.assertIn("cache is off", logs.output[0])
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_configured_backend_is_used(self):
+        with self.assertNoLogs("articles.cache", "WARNING"):
+            check_cache_backend()
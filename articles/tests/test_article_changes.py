@@ -0,0 +1,176 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from articles.changes import encode_token
+from articles.models import Article, ArticleTombstone
+
+CHANGES_URL = reverse("articles:article-changes")
+
+
+@override_settings(ARTICLE_CHANGES_DELAY=0)
+class ArticleChangesTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="testpass",
+            username="testuser",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.articles = [
+            Article.objects.create(title=f"Article {index}", user=self.user)
+            for index in range(3)
+        ]
+
+    def get_changes(self, since=None, limit=None):
+        params = {
+            name: value
+            for name, value in (("since", since), ("limit", limit))
+            if value is not None
+        }
+        response = self.client.get(CHANGES_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def sync(self, since=None, limit=2):
+        """Every change after ``since``, page by page, and the last token"""
+        changes = []
+        while True:
+            data = self.get_changes(since, limit)
+            changes += [(change["change"], change["id"]) for change in data["results"]]
+            since = data["next_token"]
+            if not data["has_more"]:
+                return changes, since
+
+    def test_auth_required(self):
+        response = APIClient().get(CHANGES_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_first_sync_returns_every_article_once(self):
+        changes, _ = self.sync()
+
+        self.assertEqual(
+            changes, [("created", article.id) for article in self.articles]
+        )
+
+    def test_sync_returns_changes_after_token(self):
+        _, token = self.sync()
+
+        updated, deleted = self.articles[:2]
+        updated.title = "Updated"
+        updated.save(update_fields=["title"])
+        deleted_id = deleted.id
+        deleted.delete()
+        created = Article.objects.create(title="New")
+
+        data = self.get_changes(token)
+        changes = [(change["change"], change["id"]) for change in data["results"]]
+
+        self.assertEqual(
+            changes,
+            [("updated", updated.id), ("deleted", deleted_id), ("created", created.id)],
+        )
+        self.assertEqual(data["results"][0]["article"]["title"], "Updated")
+        self.assertIsNone(data["results"][1]["article"])
+        self.assertEqual(self.get_changes(data["next_token"])["results"], [])
+
+    def test_no_change_returns_nothing(self):
+        _, token = self.sync()
+
+        data = self.get_changes(token)
+
+        self.assertEqual(data["results"], [])
+        self.assertFalse(data["has_more"])
+        self.assertEqual(self.get_changes(data["next_token"])["results"], [])
+
+    def test_quiet_feed_token_does_not_expire(self):
+        Article.objects.update(
+            updated_at=timezone.now() - datetime.timedelta(days=40)
+        )
+
+        changes, token = self.sync()
+        data = self.get_changes(token)
+
+        self.assertEqual(len(changes), 3)
+        self.assertEqual(data["results"], [])
+
+        updated = self.articles[0]
+        updated.save(update_fields=["title"])
+        changes = self.get_changes(data["next_token"])["results"]
+        self.assertEqual(
+            [(change["change"], change["id"]) for change in changes],
+            [("updated", updated.id)],
+        )
+
+    def test_changes_at_the_same_time_are_paged_once(self):
+        changed_at = timezone.now()
+        ArticleTombstone.objects.create(
+            article_id=1000, source=Article.MANUAL, deleted_at=changed_at
+        )
+        ArticleTombstone.objects.create(
+            article_id=1001, source=Article.SCRAPED, deleted_at=changed_at
+        )
+        Article.objects.update(updated_at=changed_at)
+
+        changes, _ = self.sync(limit=1)
+
+        self.assertEqual(
+            changes,
+            [("created", article.id) for article in self.articles]
+            + [("deleted", 1000), ("deleted", 1001)],
+        )
+
+    def test_sync_reads_a_page_in_two_queries(self):
+        _, token = self.sync()
+        Article.objects.update(updated_at=timezone.now())
+
+        with self.assertNumQueries(2):
+            self.get_changes(token)
+
+    @override_settings(ARTICLE_CHANGES_DELAY=60)
+    def test_recent_changes_are_delayed(self):
+        self.assertEqual(self.get_changes()["results"], [])
+
+    def test_invalid_and_expired_tokens(self):
+        response = self.client.get(CHANGES_URL, {"since": "not a token"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        expired_at = timezone.now() - datetime.timedelta(days=90)
+        expired = encode_token((expired_at, 0, 1), expired_at)
+        response = self.client.get(CHANGES_URL, {"since": expired})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_recreated_article_clears_tombstone(self):
+        article_id = self.articles[0].id
+        self.articles[0].delete()
+        tombstones = ArticleTombstone.objects.filter(article_id=article_id)
+        self.assertTrue(tombstones.exists())
+
+        Article.objects.create(id=article_id, title="Restored")
+
+        self.assertFalse(tombstones.exists())
+
+    def test_prune_article_tombstones(self):
+        ArticleTombstone.objects.create(
+            article_id=1000,
+            source=Article.MANUAL,
+            deleted_at=timezone.now() - datetime.timedelta(days=31),
+        )
+        ArticleTombstone.objects.create(article_id=1001, source=Article.MANUAL)
+
+        call_command("prune_article_tombstones", stdout=StringIO())
+
+        self.assertEqual(
+            list(ArticleTombstone.objects.values_list("article_id", flat=True)),
+            [1001],
+        )
@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from articles.models import Article
+from articles.utils import make_excerpt
+
+ARTICLE_URL = reverse("articles:article-list")
+
+
+class MakeExcerptTests(TestCase):
+    def test_short_content_is_kept(self):
+        self.assertEqual(make_excerpt("Short   text\n here", 50), "Short text here")
+
+    def test_cut_at_word_boundary(self):
+        excerpt = make_excerpt("Django makes building web apps easier.", 20)
+
+        self.assertEqual(excerpt, "Django makes…")
+        self.assertLessEqual(len(excerpt), 20)
+
+    def test_long_word_is_cut(self):
+        self.assertEqual(make_excerpt("a" * 30, 10), "a" * 9 + "…")
+
+    def test_markup_is_stripped(self):
+        content = (
+            "<p>Read <b>the</b> [docs](https://example.com) &amp; "
+            "**enjoy** `code`</p>\n# Heading"
+        )
+
+        self.assertEqual(
+            make_excerpt(content, 100), "Read the docs & enjoy code Heading"
+        )
+
+    @override_settings(ARTICLE_EXCERPT_LENGTH=10)
+    def test_length_setting(self):
+        self.assertEqual(make_excerpt("one two three four"), "one two…")
+
+
+class ArticleExcerptTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass", username="testuser"
+        )
+
+    def test_excerpt_follows_content(self):
+        article = Article.objects.create(title="Django", content="<p>First</p>")
+        self.assertEqual(article.excerpt, "First")
+
+        article.content = "Second"
+        article.save(update_fields=["content"])
+
+        article.refresh_from_db()
+        self.assertEqual(article.excerpt, "Second")
+
+    def test_list_returns_excerpt_and_detail_content(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        content = "word " * 200
+        article = Article.objects.create(title="Long", content=content, user=self.user)
+
+        listed = client.get(ARTICLE_URL).data["results"][0]
+        detail = client.get(reverse("articles:article-detail", args=[article.id])).data
+
+        self.assertNotIn("content", listed)
+        self.assertLessEqual(len(listed["excerpt"]), 300)
+        self.assertEqual(detail["content"], content)
+
+    def test_backfill_command(self):
+        filled = Article.objects.create(title="Filled", content="Kept")
+        missing = Article.objects.create(title="Missing", content="<i>Old</i> row")
+        Article.objects.filter(pk=missing.pk).update(excerpt="")
+
+        call_command(
+            "backfill_article_excerpts", "--batch-size", "1", stdout=StringIO()
+        )
+
+        missing.refresh_from_db()
+        filled.refresh_from_db()
+        self.assertEqual(missing.excerpt, "Old row")
+        self.assertEqual(filled.excerpt, "Kept")
@@ -0,0 +1,121 @@
+import csv
+import gzip
+import io
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from articles.models import Article
+
+EXPORT_URL = reverse("articles:article-export")
+
+
+class ArticleExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="testpass",
+            username="testuser",
+            first_name="Zoë",
+            last_name="Doe",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.articles = [
+            Article.objects.create(
+                title=f"Article {index}", content="Line\nwith, comma", user=self.user
+            )
+            for index in range(5)
+        ]
+        self.articles.append(
+            Article.objects.create(
+                scraped_title="Scraped",
+                scraped_url="https://example.com/story?id=1",
+                source=Article.SCRAPED,
+            )
+        )
+
+    def export(self, url=EXPORT_URL, **headers):
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content)
+
+    def test_auth_required(self):
+        response = APIClient().get(EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_export_ndjson(self):
+        response, content = self.export()
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn("articles.ndjson", response["Content-Disposition"])
+        self.assertEqual([row["id"] for row in rows], [a.id for a in self.articles])
+        self.assertEqual(rows[0]["author"], "Zoë Doe")
+        self.assertEqual(rows[0]["user"], self.user.id)
+        self.assertEqual(rows[0]["content"], "Line\nwith, comma")
+        self.assertIsNone(rows[-1]["author"])
+
+    def test_export_csv(self):
+        for headers in ({"HTTP_ACCEPT": "text/csv"}, {}):
+            url = EXPORT_URL if headers else f"{EXPORT_URL}?format=csv"
+            response, content = self.export(url, **headers)
+            rows = list(csv.DictReader(io.StringIO(content.decode())))
+
+            self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+            self.assertEqual(len(rows), len(self.articles))
+            self.assertEqual(rows[0]["author"], "Zoë Doe")
+            self.assertEqual(rows[0]["content"], "Line\nwith, comma")
+            self.assertEqual(rows[-1]["scraped_url"], "https://example.com/story?id=1")
+
+    def test_empty_csv_export_has_header(self):
+        _, content = self.export(f"{EXPORT_URL}?format=csv&user=0")
+
+        self.assertEqual(
+            content.decode().splitlines(),
+            [
+                "id,source,title,scraped_title,scraped_url,content,picture,"
+                "published_at,created_at,updated_at,user,author"
+            ],
+        )
+
+    def test_export_filters(self):
+        _, content = self.export(f"{EXPORT_URL}?source=Scraped")
+        self.assertEqual(len(content.splitlines()), 1)
+
+        published_at = self.articles[0].published_at.isoformat()
+        _, content = self.export(
+            f"{EXPORT_URL}?source=Manual&user={self.user.id}"
+            f"&published_from={published_at}&published_to={published_at}"
+        )
+        self.assertEqual(len(content.splitlines()), 5)
+
+        response = self.client.get(f"{EXPORT_URL}?published_from=yesterday")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_is_read_in_chunks(self):
+        with self.settings(ARTICLE_EXPORT_CHUNK_SIZE=2), mock.patch(
+            "django.db.models.query.QuerySet.iterator",
+            autospec=True,
+            side_effect=lambda queryset, chunk_size: iter(list(queryset)),
+        ) as iterator:
+            _, content = self.export()
+
+        self.assertEqual(iterator.call_args.kwargs, {"chunk_size": 2})
+        self.assertEqual(len(content.splitlines()), len(self.articles))
+
+    def test_export_is_gzipped_on_the_fly(self):
+        _, content = self.export()
+        response, compressed = self.export(HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(compressed), content)
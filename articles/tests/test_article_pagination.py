@@ -0,0 +1,93 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from articles.models import Article
+
+ARTICLE_URL = reverse("articles:article-list")
+SCRAPED_ARTICLE_URL = reverse("articles:scraped-articles-list")
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass", username="testuser"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.articles = [
+            Article.objects.create(title=f"Article {number}", user=self.user)
+            for number in range(12)
+        ]
+        # Two publication days, so pages cross a published_at boundary
+        Article.objects.filter(id__in=[a.id for a in self.articles[:7]]).update(
+            published_at=datetime.date(2024, 1, 1)
+        )
+        self.expected_ids = [article.id for article in reversed(self.articles[7:])]
+        self.expected_ids += [article.id for article in reversed(self.articles[:7])]
+
+    def walk(self, url, params=None, **headers):
+        ids, response = [], self.client.get(url, params, headers=headers)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [article["id"] for article in response.data["results"]]
+            if not response.data["next"]:
+                return ids, response
+            response = self.client.get(response.data["next"])
+
+    def test_cursor_pages_follow_ordering(self):
+        ids, last_page = self.walk(ARTICLE_URL, {"pagination": "cursor"})
+
+        self.assertEqual(ids, self.expected_ids)
+        self.assertNotIn("count", last_page.data)
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get(ARTICLE_URL, {"pagination": "cursor"})
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+
+        self.assertIsNone(first.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertEqual(back.data["next"], first.data["next"])
+
+    def test_client_header_selects_cursor_pagination(self):
+        ids, _ = self.walk(ARTICLE_URL, headers={"X-Pagination": "cursor"})
+
+        self.assertEqual(ids, self.expected_ids)
+
+    def test_cursor_page_runs_without_count_or_offset(self):
+        first = self.client.get(ARTICLE_URL, {"pagination": "cursor"})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first.data["next"])
+
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]["sql"].upper()
+        self.assertNotIn("COUNT(", sql)
+        self.assertNotIn("OFFSET", sql)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(ARTICLE_URL, {"cursor": "garbage"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_pagination_is_default(self):
+        response = self.client.get(ARTICLE_URL)
+
+        self.assertEqual(response.data["count"], 12)
+
+    def test_scraped_articles_cursor_pagination(self):
+        Article.objects.create(scraped_title="Scraped", source=Article.SCRAPED)
+
+        response = self.client.get(SCRAPED_ARTICLE_URL, {"pagination": "cursor"})
+
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertNotIn("count", response.data)
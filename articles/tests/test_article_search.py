@@ -0,0 +1,132 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from articles.models import Article
+from articles.search import fts5_query, search_articles
+
+ARTICLE_URL = reverse("articles:article-list")
+SCRAPED_ARTICLE_URL = reverse("articles:scraped-articles-list")
+
+
+def result_ids(response):
+    return [article["id"] for article in response.data["results"]]
+
+
+class SearchArticlesTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass", username="testuser"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_article(self, **params):
+        defaults = {"title": "Untitled", "user": self.user}
+        defaults.update(params)
+        return Article.objects.create(**defaults)
+
+    def search(self, query):
+        return list(search_articles(Article.objects.all(), query))
+
+    def test_title_match_ranks_above_content_match(self):
+        in_content = self.create_article(
+            title="Weekly notes", content="Some thoughts about python packaging"
+        )
+        in_title = self.create_article(title="Python packaging", content="Notes")
+        self.create_article(title="Rust", content="Cargo")
+
+        self.assertEqual(self.search("python"), [in_title, in_content])
+
+    def test_stemmed_words_match(self):
+        article = self.create_article(title="Running benchmarks")
+
+        self.assertEqual(self.search("run benchmark"), [article])
+
+    def test_scraped_title_matches(self):
+        article = self.create_article(
+            title="", scraped_title="Postgres full text search", source="Scraped"
+        )
+
+        self.assertEqual(self.search("postgres"), [article])
+
+    def test_index_follows_updates_and_deletes(self):
+        article = self.create_article(title="Django")
+
+        article.title = "Flask"
+        article.save()
+        self.assertEqual(self.search("django"), [])
+        self.assertEqual(self.search("flask"), [article])
+
+        article.delete()
+        self.assertEqual(self.search("flask"), [])
+
+    def test_query_syntax_is_escaped(self):
+        article = self.create_article(title="C plus plus")
+
+        self.assertEqual(self.search('"plus* (c'), [article])
+        self.assertEqual(self.search("!!!"), [])
+
+    def test_blank_query_returns_queryset(self):
+        self.create_article()
+
+        self.assertEqual(len(self.search("  ")), 1)
+
+    def test_search_parameter(self):
+        article = self.create_article(title="Celery tasks")
+        self.create_article(title="Telegram bot")
+
+        response = self.client.get(ARTICLE_URL, {"search": "celery"})
+
+        self.assertEqual(result_ids(response), [article.id])
+
+    def test_scraped_search_parameter(self):
+        scraped = self.create_article(
+            title="", scraped_title="Celery in production", source="Scraped"
+        )
+        self.create_article(title="Celery tasks")
+
+        response = self.client.get(SCRAPED_ARTICLE_URL, {"search": "celery"})
+
+        self.assertEqual(result_ids(response), [scraped.id])
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite FTS5 index")
+class SqliteSearchIndexTests(TestCase):
+    def test_fts5_query_quotes_words(self):
+        self.assertEqual(fts5_query('python AND "django*'), '"python" "AND" "django"')
+
+    def test_match_uses_fts_table(self):
+        sql = str(search_articles(Article.objects.all(), "python").query)
+
+        self.assertIn("articles_article_fts MATCH", sql)
+        self.assertNotIn("LIKE", sql)
+
+
+@skipUnless(connection.vendor == "postgresql", "PostgreSQL tsvector index")
+class PostgresSearchIndexTests(TestCase):
+    def test_search_uses_gin_index(self):
+        Article.objects.bulk_create(
+            Article(title=f"Article {number}", content="filler")
+            for number in range(500)
+        )
+        Article.objects.create(title="PostgreSQL search")
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE articles_article")
+
+        plan = search_articles(Article.objects.all(), "postgresql").explain()
+
+        self.assertIn("articles_article_search_vector_idx", plan)
+
+    def test_websearch_syntax(self):
+        article = Article.objects.create(title="PostgreSQL search")
+        Article.objects.create(title="PostgreSQL replication")
+
+        results = search_articles(Article.objects.all(), "postgresql -replication")
+
+        self.assertEqual(list(results), [article])
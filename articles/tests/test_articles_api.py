@@ -1,9 +1,14 @@
+import io
 import os
+import shutil
 import tempfile
+from unittest import mock
 
 from PIL import Image
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from rest_framework import status
@@ -157,6 +162,17 @@ class AuthenticatedArticleApiTests(TestCase):
         for key in payload:
             self.assertEqual(payload[key], getattr(article, key))
 
+    def test_title_only_patch_runs_a_single_update(self):
+        article = sample_article(user=self.user)
+
+        # One SELECT to fetch the article and one UPDATE to store it
+        with self.assertNumQueries(2) as queries:
+            response = self.client.patch(detail_url(article.id), {"title": "Flask"})
+
+        statements = [query["sql"].split()[0] for query in queries.captured_queries]
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(statements, ["SELECT", "UPDATE"])
+
     def test_delete_article(self):
         article = sample_article(user=self.user)
 
@@ -166,6 +182,7 @@ class AuthenticatedArticleApiTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
 
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
 class ArticlePictureUploadTests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -179,6 +196,7 @@ class ArticlePictureUploadTests(TestCase):
 
     def tearDown(self):
         self.article.picture.delete()
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
 
     def test_upload_picture_to_article(self):
         """Test uploading a picture to article"""
@@ -194,8 +212,34 @@ class ArticlePictureUploadTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertIn("picture", res.data)
+        self.assertEqual(res.data["picture_status"], Article.PICTURE_PROCESSING)
         self.assertTrue(os.path.exists(self.article.picture.path))
 
+    def test_same_picture_uploaded_again_is_not_processed(self):
+        url = picture_upload_url(self.article.id)
+        buffer = io.BytesIO()
+        Image.new("RGB", (10, 10)).save(buffer, format="JPEG")
+
+        def upload():
+            picture = SimpleUploadedFile("picture.jpg", buffer.getvalue())
+            return self.client.post(url, {"picture": picture}, format="multipart")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            upload()
+        self.article.refresh_from_db()
+        picture, variants = self.article.picture.name, self.article.picture_variants
+
+        with mock.patch(
+            "articles.tasks.process_article_picture_task.delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            res = upload()
+
+        delay.assert_not_called()
+        self.assertEqual(res.data["picture_status"], Article.PICTURE_READY)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.picture.name, picture)
+        self.assertEqual(self.article.picture_variants, variants)
+
     def test_upload_picture_bad_request(self):
         """Test uploading an invalid picture"""
         url = picture_upload_url(self.article.id)
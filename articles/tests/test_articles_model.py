@@ -1,7 +1,17 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from PIL import Image
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 
 from articles.models import Article
+from articles.tasks import process_article_picture_task
 
 
 class ModelsTest(TestCase):
@@ -16,3 +26,148 @@ class ModelsTest(TestCase):
         article = Article.objects.create(title="Django", user=self.user)
 
         self.assertEqual(str(article), article.title)
+
+
+@override_settings(
+    MEDIA_ROOT=tempfile.mkdtemp(),
+    IMAGE_VARIANT_WIDTHS=[100, 300],
+    IMAGE_VARIANT_FORMATS=["webp"],
+)
+class ArticlePictureProcessingTests(TestCase):
+    def setUp(self):
+        self.article = Article.objects.create(title="Django")
+
+    def tearDown(self):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def set_picture(self, size=(600, 400)):
+        buffer = io.BytesIO()
+        Image.new("RGB", size).save(buffer, format="JPEG")
+        self.article.picture = SimpleUploadedFile("picture.jpg", buffer.getvalue())
+
+    def test_new_picture_is_processed_after_commit(self):
+        self.set_picture()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.article.save()
+
+        self.assertEqual(self.article.picture_status, Article.PICTURE_PROCESSING)
+        with Image.open(self.article.picture.path) as img:
+            self.assertEqual(img.size, (600, 400))
+
+        for callback in callbacks:
+            callback()
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.picture_status, Article.PICTURE_READY)
+        self.assertEqual(len(self.article.picture_hash), 64)
+        with Image.open(self.article.picture.path) as img:
+            self.assertEqual(img.size, (300, 200))
+
+        variants = self.article.picture_variants["webp"]
+        self.assertEqual(list(variants), ["100", "300"])
+        with Image.open(os.path.join(settings.MEDIA_ROOT, variants["100"])) as img:
+            self.assertEqual((img.format, img.size), ("WEBP", (100, 67)))
+
+    def test_text_update_does_not_schedule_processing(self):
+        self.set_picture()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.save()
+
+        self.article.title = "Flask"
+        with mock.patch(
+            "articles.tasks.process_article_picture_task.delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            self.article.save()
+
+        delay.assert_not_called()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.picture_status, Article.PICTURE_READY)
+        self.assertEqual(self.article.title, "Flask")
+
+    def test_old_picture_is_deleted_after_commit(self):
+        self.set_picture()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.save()
+        self.article.refresh_from_db()
+        old_path = self.article.picture.path
+        old_variants = self.article.picture_variants
+
+        self.set_picture(size=(20, 20))
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.article.save()
+
+        self.assertTrue(os.path.exists(old_path))
+
+        for callback in callbacks:
+            callback()
+
+        self.assertFalse(os.path.exists(old_path))
+        old_variant = old_variants["webp"]["100"]
+        self.assertFalse(os.path.exists(os.path.join(settings.MEDIA_ROOT, old_variant)))
+        self.assertTrue(os.path.exists(self.article.picture.path))
+
+    def test_fields_left_out_of_update_fields_stay_changed(self):
+        article = Article.objects.get(pk=self.article.pk)
+        article.title = "Flask"
+        article.content = "Flask **content**"
+
+        article.save(update_fields=["title"])
+
+        self.assertFalse(article.has_changed("title"))
+        self.assertTrue(article.has_changed("content"))
+
+        article.save()
+        article.refresh_from_db()
+        self.assertEqual(article.excerpt, "Flask content")
+
+    def test_loaded_article_tracks_changes(self):
+        article = Article.objects.get(pk=self.article.pk)
+
+        self.assertFalse(article.has_changed("title"))
+        self.assertFalse(article.has_changed("picture"))
+
+        article.title = "Flask"
+
+        self.assertTrue(article.has_changed("title"))
+        self.assertEqual(article.old_value("title"), "Django")
+
+    def test_stale_save_keeps_what_the_picture_task_stored(self):
+        self.set_picture()
+        with self.captureOnCommitCallbacks():
+            self.article.save()
+        article = Article.objects.get(pk=self.article.pk)
+        Article.objects.filter(pk=article.pk).update(
+            picture_status=Article.PICTURE_READY, picture_hash="a" * 64
+        )
+
+        article.title = "Flask"
+        article.save()
+
+        article.refresh_from_db()
+        self.assertEqual(article.title, "Flask")
+        self.assertEqual(article.picture_hash, "a" * 64)
+
+    def test_save_after_delete_inserts_the_article_again(self):
+        self.set_picture()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.save()
+        article = Article.objects.get(pk=self.article.pk)
+        Article.objects.filter(pk=article.pk).delete()
+
+        article.title = "Flask"
+        article.save()
+
+        article.refresh_from_db()
+        self.assertEqual(article.title, "Flask")
+        self.assertEqual(article.picture_status, Article.PICTURE_READY)
+
+    def test_unchanged_content_is_not_processed_again(self):
+        self.set_picture()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.save()
+
+        with mock.patch("articles.tasks.process_picture") as process_picture:
+            process_article_picture_task(self.article.pk)
+
+        process_picture.assert_not_called()
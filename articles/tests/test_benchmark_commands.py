@@ -0,0 +1,43 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from articles.models import Article
+
+
+class BenchmarkCommandTests(TestCase):
+    def benchmark(self, **options):
+        out = StringIO()
+        call_command(
+            "benchmark_renderers", repeat=1, page_size=5, stdout=out, **options
+        )
+        return out.getvalue()
+
+    def test_seeded_articles_are_rolled_back(self):
+        output = self.benchmark(rows=8, allow_seed=True)
+
+        self.assertIn("Seeding 8 articles", output)
+        self.assertIn("ArticleListSerializer, 5 rows per page", output)
+        self.assertFalse(Article.objects.exists())
+
+    def test_no_seeding_by_default(self):
+        output = self.benchmark()
+
+        self.assertNotIn("Seeding", output)
+        self.assertIn("ArticleListSerializer, 0 rows per page", output)
+
+    def test_refuses_to_seed_without_allow_seed(self):
+        with self.assertRaisesMessage(CommandError, "--allow-seed"):
+            self.benchmark(rows=8)
+
+        self.assertFalse(Article.objects.exists())
+
+    def test_existing_articles_are_kept(self):
+        Article.objects.create(title="Django")
+
+        output = self.benchmark()
+
+        self.assertIn("ArticleListSerializer, 1 rows per page", output)
+        self.assertEqual(Article.objects.count(), 1)
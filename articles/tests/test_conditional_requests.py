@@ -0,0 +1,127 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from articles.cache import get_cache
+from articles.models import Article
+from articles.serializers import ArticleDetailSerializer, ArticleListSerializer
+from articles.tests.test_article_cache import LOCMEM_CACHES
+
+ARTICLE_URL = reverse("articles:article-list")
+SCRAPED_ARTICLE_URL = reverse("articles:scraped-articles-list")
+
+
+def detail_url(article_id):
+    return reverse("articles:article-detail", args=[article_id])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass", username="testuser"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.article = Article.objects.create(title="Django", user=self.user)
+
+    def test_detail_not_modified_skips_serializer(self):
+        response = self.client.get(detail_url(self.article.id))
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+        with mock.patch.object(
+            ArticleDetailSerializer, "to_representation"
+        ) as to_representation:
+            not_modified = self.client.get(
+                detail_url(self.article.id), HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+            by_date = self.client.get(
+                detail_url(self.article.id),
+                HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+            )
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+        self.assertEqual(by_date.status_code, status.HTTP_304_NOT_MODIFIED)
+        to_representation.assert_not_called()
+
+    def test_detail_changes_after_update(self):
+        etag = self.client.get(detail_url(self.article.id))["ETag"]
+
+        self.article.title = "Flask"
+        self.article.save()
+
+        response = self.client.get(detail_url(self.article.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_detail_changes_after_author_rename(self):
+        etag = self.client.get(detail_url(self.article.id))["ETag"]
+
+        self.user.last_name = "Lovelace"
+        self.user.save()
+
+        response = self.client.get(detail_url(self.article.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_not_modified_skips_serializer(self):
+        etag = self.client.get(ARTICLE_URL)["ETag"]
+
+        with mock.patch.object(
+            ArticleListSerializer, "to_representation"
+        ) as to_representation:
+            response = self.client.get(ARTICLE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        to_representation.assert_not_called()
+
+    def test_list_changes_after_delete(self):
+        Article.objects.create(title="Flask", user=self.user)
+        etag = self.client.get(ARTICLE_URL)["ETag"]
+
+        self.article.delete()
+
+        response = self.client.get(ARTICLE_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_ignores_if_modified_since(self):
+        last_modified = self.client.get(ARTICLE_URL)["Last-Modified"]
+
+        response = self.client.get(ARTICLE_URL, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_query(self):
+        first = self.client.get(ARTICLE_URL, {"pagination": "cursor"})
+
+        response = self.client.get(ARTICLE_URL, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_scraped_list_not_modified(self):
+        Article.objects.create(scraped_title="Scraped", source=Article.SCRAPED)
+        etag = self.client.get(SCRAPED_ARTICLE_URL)["ETag"]
+
+        response = self.client.get(SCRAPED_ARTICLE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_missing_article(self):
+        response = self.client.get(detail_url(0), HTTP_IF_NONE_MATCH='"x"')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_cached_response_not_modified_without_queries(self):
+        get_cache().clear()
+        etag = self.client.get(ARTICLE_URL)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(ARTICLE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
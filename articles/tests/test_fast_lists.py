@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from articles.fast_lists import FastListSerializer
+from articles.models import Article
+from articles.serializers import ArticleListSerializer, ArticleScrapedSerializer
+
+ARTICLE_URL = reverse("articles:article-list")
+
+
+class FastListSerializerTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="testpass",
+            username="testuser",
+            first_name="Zoë",
+            last_name="",
+        )
+        self.request = Request(APIRequestFactory().get(ARTICLE_URL))
+
+        Article.objects.create(title="Without author", content="<b>Text</b>")
+        article = Article.objects.create(
+            title="With picture", content="x " * 500, user=self.user
+        )
+        Article.objects.filter(pk=article.pk).update(
+            picture="uploads/articles/ab/cd/picture.jpg",
+            picture_variants={"webp": {"320": "uploads/articles/ab/cd/p_320w.webp"}},
+        )
+        Article.objects.create(title='Ünïcode   "quotes"', user=self.user)
+        Article.objects.create(
+            scraped_title="Scraped",
+            scraped_url="https://example.com/story?id=1",
+            source=Article.SCRAPED,
+        )
+
+    def assert_same_json(self, serializer_class, queryset):
+        context = {"request": self.request}
+        expected = serializer_class(queryset, many=True, context=context).data
+
+        fast = FastListSerializer.compile(serializer_class(context=context))
+        self.assertIsNotNone(fast)
+        data = fast.to_representation(fast.get_queryset(queryset))
+
+        self.assertEqual(JSONRenderer().render(data), JSONRenderer().render(expected))
+
+    def test_list_serializer_output_is_identical(self):
+        self.assert_same_json(
+            ArticleListSerializer,
+            Article.objects.filter(source=Article.MANUAL).select_related("user"),
+        )
+
+    def test_scraped_serializer_output_is_identical(self):
+        self.assert_same_json(
+            ArticleScrapedSerializer, Article.objects.filter(source=Article.SCRAPED)
+        )
+
+    def test_single_query(self):
+        context = {"request": self.request}
+        fast = FastListSerializer.compile(ArticleListSerializer(context=context))
+
+        with self.assertNumQueries(1):
+            fast.to_representation(fast.get_queryset(Article.objects.all()))
+
+    def test_unsupported_fields_fall_back(self):
+        class TitleSerializer(serializers.ModelSerializer):
+            label = serializers.CharField(source="__str__")
+
+            class Meta:
+                model = Article
+                fields = ("id", "label")
+
+        self.assertIsNone(FastListSerializer.compile(TitleSerializer()))
+
+    def test_list_endpoint_matches_serializer(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(ARTICLE_URL)
+
+        queryset = Article.objects.filter(source=Article.MANUAL)
+        request = response.wsgi_request
+        expected = ArticleListSerializer(
+            queryset, many=True, context={"request": Request(request)}
+        ).data
+        self.assertEqual(
+            JSONRenderer().render(response.data["results"]),
+            JSONRenderer().render(expected),
+        )
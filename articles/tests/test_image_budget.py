@@ -0,0 +1,172 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from PIL import Image
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from articles.images import open_for_size, validate_image_budget
+from articles.models import Article
+
+
+def encoded_image(size, image_format="JPEG", mode="RGB"):
+    buffer = io.BytesIO()
+    Image.new(mode, size).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+# Pillow allocates pixel buffers in C, out of sight of tracemalloc, so the
+# peak RSS is measured in a fresh interpreter after a warm-up call on a
+# small image has loaded the codecs.
+PEAK_MEMORY_SCRIPT = """
+import json
+import resource
+import sys
+
+from django.conf import settings
+
+settings.configure(
+    IMAGE_MAX_UPLOAD_SIZE=100 * 1024 * 1024,
+    IMAGE_MAX_PIXELS=100_000_000,
+    IMAGE_VARIANT_WIDTHS=[320],
+    IMAGE_VARIANT_FORMATS=["webp"],
+    IMAGE_VARIANT_QUALITY=80,
+)
+
+from django.core.files.storage import FileSystemStorage
+
+from articles.images import render_variants, validate_image_budget
+
+
+def peak_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run(name):
+    if function == "validate_image_budget":
+        with storage.open(name, "rb") as file:
+            validate_image_budget(file)
+        return []
+    rendered = render_variants(name, storage)
+    return [[extension, width] for extension, width, _ in rendered]
+
+
+function, directory, warm_up_name, name = sys.argv[1:]
+storage = FileSystemStorage(location=directory)
+run(warm_up_name)
+before = peak_kb()
+result = run(name)
+print(json.dumps({"result": result, "peak_kb": peak_kb() - before}))
+"""
+
+
+def peak_memory_kb(function_name, small_content, large_content):
+    """
+    Run ``function_name`` from ``articles.images`` on ``large_content`` in a
+    subprocess, return its result and the peak RSS growth in KB.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        for name, content in (("small", small_content), ("large", large_content)):
+            with open(os.path.join(directory, name), "wb") as file:
+                file.write(content)
+
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                PEAK_MEMORY_SCRIPT,
+                function_name,
+                directory,
+                "small",
+                "large",
+            ],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+
+    measured = json.loads(output.splitlines()[-1])
+    return measured["result"], measured["peak_kb"]
+
+
+@override_settings(IMAGE_MAX_PIXELS=10_000)
+class PictureUploadBudgetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass", username="testuser"
+        )
+        self.client.force_authenticate(user)
+        self.url = reverse(
+            "articles:article-upload-picture",
+            args=[Article.objects.create(title="Django", user=user).id],
+        )
+
+    def upload(self, content):
+        picture = SimpleUploadedFile("picture.png", content)
+        return self.client.post(self.url, {"picture": picture}, format="multipart")
+
+    def test_image_with_too_many_pixels_is_rejected(self):
+        response = self.upload(encoded_image((200, 200), "PNG"))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("pixels", str(response.data["picture"]))
+
+    @override_settings(IMAGE_MAX_UPLOAD_SIZE=1000)
+    def test_too_large_file_is_rejected(self):
+        response = self.upload(encoded_image((100, 100), "BMP"))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("bytes", str(response.data["picture"]))
+
+
+class ImageDecodingMemoryTests(SimpleTestCase):
+    def test_budget_check_reads_only_the_header(self):
+        # 8000x8000 grayscale decodes to 64 MB but compresses to a few KB
+        upload = SimpleUploadedFile("bomb.png", encoded_image((8000, 8000), "PNG", "L"))
+
+        with override_settings(IMAGE_MAX_PIXELS=20_000_000):
+            self.assertRaises(ValidationError, validate_image_budget, upload)
+
+        self.assertEqual(upload.tell(), 0)
+
+    def test_budget_check_does_not_decode_the_pixels(self):
+        _, peak_kb = peak_memory_kb(
+            "validate_image_budget",
+            encoded_image((10, 10), "PNG", "L"),
+            encoded_image((8000, 8000), "PNG", "L"),
+        )
+
+        # A full decode would take 64 MB
+        self.assertLess(peak_kb, 8 * 1024)
+
+    def test_jpeg_is_decoded_at_reduced_scale(self):
+        with Image.open(io.BytesIO(encoded_image((4000, 3000)))) as img:
+            open_for_size(img, (320, 240))
+
+            self.assertEqual(img.size, (500, 375))
+
+
+class VariantRenderingMemoryTests(SimpleTestCase):
+    def test_peak_memory_follows_output_size(self):
+        rendered, peak_kb = peak_memory_kb(
+            "render_variants",
+            encoded_image((640, 480)),
+            encoded_image((4000, 3000)),
+        )
+
+        self.assertEqual(rendered, [["webp", 320]])
+        # The fully decoded upload would take 48 MB as RGBX
+        self.assertLess(peak_kb, 12 * 1024)
@@ -0,0 +1,201 @@
+import csv
+import os
+import tempfile
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+
+from articles.importers import import_articles_from_csv, import_scraped_rows
+from articles.models import Article
+from articles.utils import url_hash
+
+
+def write_stories_csv(rows):
+    file = tempfile.NamedTemporaryFile(
+        "w", suffix=".csv", delete=False, encoding="utf-8", newline=""
+    )
+    with file:
+        writer = csv.DictWriter(file, fieldnames=("title", "url"))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return file.name
+
+
+class ImportArticlesTests(TestCase):
+    def setUp(self):
+        Article.objects.create(
+            scraped_title="Existing",
+            scraped_url="https://example.com/existing",
+            source=Article.SCRAPED,
+        )
+
+    def test_import_counts_inserted_skipped_and_failed(self):
+        rows = [
+            {"title": "First", "url": "https://example.com/first"},
+            {"title": "Duplicate", "url": "https://example.com/first"},
+            {"title": "Existing", "url": "https://example.com/existing"},
+            {"title": "Ask HN", "url": "item?id=1"},
+            {"title": "", "url": "https://example.com/no-title"},
+        ]
+
+        result = import_scraped_rows(rows, chunk_size=2)
+
+        self.assertEqual(result.inserted, 2)
+        self.assertEqual(result.skipped, 2)
+        self.assertEqual(result.failed, 1)
+        self.assertTrue(
+            Article.objects.filter(
+                scraped_url="https://news.ycombinator.com/item?id=1",
+                source=Article.SCRAPED,
+            ).exists()
+        )
+
+    def test_import_uses_constant_queries_per_chunk(self):
+        rows = [
+            {"title": f"Story {i}", "url": f"https://example.com/{i}"}
+            for i in range(50)
+        ]
+
+        # SAVEPOINT, IN lookup, bulk INSERT, read back of inserted rows, RELEASE
+        with self.assertNumQueries(5):
+            result = import_scraped_rows(rows, chunk_size=50)
+
+        self.assertEqual(result.inserted, 50)
+
+    def test_import_notifies_about_inserted_articles(self):
+        rows = [{"title": "New story", "url": "https://example.com/new"}]
+
+        with mock.patch("articles.importers.notify_new_article") as notify:
+            with self.captureOnCommitCallbacks(execute=True):
+                import_scraped_rows(rows)
+
+        article = Article.objects.get(scraped_url="https://example.com/new")
+        notify.assert_called_once_with(article.id, "New story")
+
+    def test_import_from_csv_file(self):
+        file_path = write_stories_csv(
+            [{"title": "From CSV", "url": "https://example.com/csv"}]
+        )
+        self.addCleanup(os.remove, file_path)
+
+        result = import_articles_from_csv(file_path)
+
+        self.assertEqual(result.inserted, 1)
+
+    def test_import_command_reports_counts(self):
+        file_path = write_stories_csv(
+            [{"title": "Existing", "url": "https://example.com/existing"}]
+        )
+        self.addCleanup(os.remove, file_path)
+
+        with mock.patch("sys.stdout") as stdout:
+            call_command("import_articles", file=file_path, stdout=stdout)
+
+        stdout.write.assert_called()
+        self.assertIn("skipped: 1", stdout.write.call_args[0][0])
+
+
+class ScrapedUrlHashTests(TestCase):
+    def test_canonical_url_and_hash_are_set_on_save(self):
+        article = Article.objects.create(
+            scraped_title="Story",
+            scraped_url="HTTPS://Example.COM:443/post?id=7&utm_source=hn#top",
+            source=Article.SCRAPED,
+        )
+
+        self.assertEqual(
+            article.scraped_url_canonical, "https://example.com/post?id=7#top"
+        )
+        self.assertEqual(len(article.scraped_url_hash), 64)
+
+    def test_relative_hn_links_share_hash_with_absolute_links(self):
+        Article.objects.create(
+            scraped_title="Ask HN",
+            scraped_url="https://news.ycombinator.com/item?id=42",
+            source=Article.SCRAPED,
+        )
+
+        result = import_scraped_rows([{"title": "Ask HN", "url": "item?id=42"}])
+
+        self.assertEqual(result.inserted, 0)
+        self.assertEqual(result.skipped, 1)
+
+    def test_tracking_params_do_not_create_duplicates(self):
+        rows = [
+            {"title": "Story", "url": "https://example.com/post"},
+            {"title": "Story", "url": "https://example.com/post?utm_medium=feed"},
+        ]
+
+        result = import_scraped_rows(rows)
+
+        self.assertEqual(result.inserted, 1)
+        self.assertEqual(result.skipped, 1)
+
+    def test_backfill_command_fills_missing_hashes(self):
+        article = Article.objects.create(
+            scraped_title="Story",
+            scraped_url="https://example.com/old",
+            source=Article.SCRAPED,
+        )
+        duplicate = Article.objects.create(
+            scraped_title="Story", source=Article.SCRAPED
+        )
+        Article.objects.filter(pk=article.pk).update(
+            scraped_url_canonical=None, scraped_url_hash=None
+        )
+        Article.objects.filter(pk=duplicate.pk).update(
+            scraped_url="https://EXAMPLE.com/old"
+        )
+
+        call_command("backfill_scraped_url_hashes", batch_size=1, stdout=mock.Mock())
+
+        article.refresh_from_db()
+        duplicate.refresh_from_db()
+        self.assertIsNotNone(article.scraped_url_hash)
+        self.assertIsNone(duplicate.scraped_url_hash)
+        self.assertEqual(duplicate.scraped_url_canonical, "https://example.com/old")
+
+        # Saving the duplicate later doesn't collide on the unique index
+        duplicate.scraped_title = "Edited"
+        duplicate.save()
+        duplicate.refresh_from_db()
+        self.assertIsNone(duplicate.scraped_url_hash)
+
+    def test_hash_is_only_recomputed_when_url_changes(self):
+        article = Article.objects.create(
+            scraped_title="Story",
+            scraped_url="https://example.com/story",
+            source=Article.SCRAPED,
+        )
+        Article.objects.filter(pk=article.pk).update(scraped_url_hash="a" * 64)
+
+        article = Article.objects.get(pk=article.pk)
+        article.scraped_title = "Edited"
+        article.save()
+        self.assertEqual(article.scraped_url_hash, "a" * 64)
+
+        article.scraped_url = "https://example.com/moved"
+        article.save()
+        self.assertEqual(
+            article.scraped_url_hash, url_hash("https://example.com/moved")
+        )
+
+    def test_duplicate_url_fails_validation(self):
+        Article.objects.create(
+            scraped_title="Story",
+            scraped_url="https://example.com/story",
+            source=Article.SCRAPED,
+        )
+        duplicate = Article(
+            scraped_title="Story",
+            scraped_url="https://EXAMPLE.com/story?utm_source=hn",
+            source=Article.SCRAPED,
+        )
+
+        with self.assertRaises(ValidationError) as error:
+            duplicate.full_clean()
+
+        self.assertIn("scraped_url", error.exception.message_dict)
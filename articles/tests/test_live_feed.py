@@ -0,0 +1,175 @@
+import asyncio
+from unittest import mock
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from articles import live
+from articles.importers import import_scraped_rows
+from articles.live import HEARTBEAT, OVERFLOW, InMemoryBroker, LiveHub
+from articles.models import Article
+
+LIVE_URL = reverse("articles:article-live")
+
+
+def message(article_id, source=Article.MANUAL, event="created"):
+    return orjson.dumps(
+        {"event": event, "article": {"id": article_id, "source": source}}
+    )
+
+
+class LiveHubTests(SimpleTestCase):
+    def setUp(self):
+        self.broker = InMemoryBroker()
+        self.hub = LiveHub(self.broker)
+
+    async def start(self, sources=(), heartbeat=None):
+        events = self.hub.events(sources, heartbeat)
+        self.assertIn(b": connected", await anext(events))
+        # Let the hub subscribe to the broker
+        await asyncio.sleep(0)
+        return events
+
+    async def test_events_are_fanned_out_by_source(self):
+        every = await self.start()
+        scraped = await self.start([Article.SCRAPED])
+
+        self.broker.publish(message(1))
+        self.broker.publish(message(2, Article.SCRAPED, "updated"))
+
+        self.assertEqual(
+            await anext(every), b'event: created\ndata: {"id":1,"source":"Manual"}\n\n'
+        )
+        self.assertIn(b'"id":2', await anext(every))
+        self.assertEqual(
+            await anext(scraped),
+            b'event: updated\ndata: {"id":2,"source":"Scraped"}\n\n',
+        )
+
+        await every.aclose()
+        await scraped.aclose()
+        self.assertEqual(self.hub.subscriptions, set())
+        self.assertIsNone(self.hub.reader)
+
+    async def test_invalid_messages_are_skipped(self):
+        events = await self.start()
+
+        self.broker.publish(b"not json")
+        self.broker.publish(message(1))
+
+        self.assertIn(b'"id":1', await anext(events))
+        await events.aclose()
+
+    async def test_heartbeat_on_idle_connection(self):
+        events = await self.start(heartbeat=0.01)
+
+        self.assertEqual(await anext(events), HEARTBEAT)
+        await events.aclose()
+
+    async def test_slow_subscriber_overflows(self):
+        subscription = self.hub.subscribe(size=2)
+
+        for article_id in range(4):
+            self.hub.dispatch(message(article_id))
+
+        self.assertIn(b'"id":1', subscription.queue.get_nowait())
+        self.assertIs(subscription.queue.get_nowait(), OVERFLOW)
+        self.assertTrue(subscription.queue.empty())
+        self.hub.unsubscribe(subscription)
+
+
+class LiveFeedViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="testpass",
+            username="testuser",
+        )
+        self.token = Token.objects.create(user=self.user)
+
+    def auth(self):
+        return {"Authorization": f"Token {self.token.key}"}
+
+    async def test_auth_required(self):
+        response = await self.async_client.get(LIVE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+
+        response = await self.async_client.get(
+            LIVE_URL, headers={"Authorization": "Token invalid"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_wsgi_request_is_rejected(self):
+        response = self.client.get(LIVE_URL, headers=self.auth())
+
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    async def test_unknown_source(self):
+        response = await self.async_client.get(
+            LIVE_URL, {"source": "Unknown"}, headers=self.auth()
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_saved_article_is_streamed(self):
+        hub = LiveHub(InMemoryBroker())
+        with mock.patch.object(live, "_broker", hub.broker), mock.patch.object(
+            live, "_hub", hub
+        ):
+            response = await self.async_client.get(
+                LIVE_URL, {"source": Article.MANUAL}, headers=self.auth()
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            self.assertEqual(response["X-Accel-Buffering"], "no")
+
+            events = aiter(response.streaming_content)
+            self.assertIn(b": connected", await anext(events))
+            await asyncio.sleep(0)
+
+            article = await sync_to_async(self.create_article)("Live")
+            event = await anext(events)
+            await events.aclose()
+
+        self.assertTrue(event.startswith(b"event: created\n"))
+        data = orjson.loads(event.split(b"data: ")[1])
+        self.assertEqual(data["id"], article.id)
+        self.assertEqual(data["title"], "Live")
+
+    def create_article(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Article.objects.create(title=title, user=self.user)
+
+
+class ImportLiveFeedTests(TestCase):
+    async def test_imported_articles_are_pushed(self):
+        hub = LiveHub(InMemoryBroker())
+        events = hub.events([Article.SCRAPED])
+        self.assertIn(b": connected", await anext(events))
+        await asyncio.sleep(0)
+
+        with mock.patch.object(live, "_broker", hub.broker), mock.patch(
+            "articles.importers.notify_new_article"
+        ):
+            await sync_to_async(self.import_rows)(
+                [{"title": "Scraped story", "url": "https://example.com/story"}]
+            )
+        event = await anext(events)
+        await events.aclose()
+
+        self.assertTrue(event.startswith(b"event: created\n"))
+        data = orjson.loads(event.split(b"data: ")[1])
+        self.assertEqual(data["title"], "Scraped story")
+        self.assertEqual(data["scraped_url"], "https://example.com/story")
+
+    def import_rows(self, rows):
+        with self.captureOnCommitCallbacks(execute=True):
+            return import_scraped_rows(rows)
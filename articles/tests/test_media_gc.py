@@ -0,0 +1,76 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from articles.media_gc import collect_orphan_media
+from articles.models import Article, MediaBlob
+
+
+def make_old(name, age=2 * 60 * 60):
+    timestamp = time.time() - age
+    os.utime(default_storage.path(name), (timestamp, timestamp))
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), ORPHAN_MEDIA_GRACE_PERIOD=60 * 60)
+class CollectOrphanMediaTests(TestCase):
+    def setUp(self):
+        self.picture = default_storage.save("uploads/articles/a.jpg", ContentFile(b"a"))
+        self.variant = default_storage.save(
+            "uploads/articles/a_320w.webp", ContentFile(b"variant")
+        )
+        article = Article.objects.create(title="Django")
+        Article.objects.filter(pk=article.pk).update(
+            picture=self.picture, picture_variants={"webp": {"320": self.variant}}
+        )
+
+        self.orphan = default_storage.save(
+            "uploads/articles/b.jpg", ContentFile(b"orphan")
+        )
+        for name in (self.picture, self.variant, self.orphan):
+            make_old(name)
+
+    def tearDown(self):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def test_old_orphans_are_deleted(self):
+        report = collect_orphan_media()
+
+        self.assertEqual(report.scanned, 3)
+        self.assertEqual(report.orphans, 1)
+        self.assertEqual(report.bytes_reclaimed, len(b"orphan"))
+        self.assertFalse(default_storage.exists(self.orphan))
+        self.assertFalse(MediaBlob.objects.filter(name=self.orphan).exists())
+        self.assertTrue(default_storage.exists(self.picture))
+        self.assertTrue(default_storage.exists(self.variant))
+
+    def test_files_within_grace_period_are_kept(self):
+        young = default_storage.save("uploads/articles/c.jpg", ContentFile(b"young"))
+
+        report = collect_orphan_media()
+
+        self.assertEqual(report.orphans, 1)
+        self.assertTrue(default_storage.exists(young))
+
+    def test_dry_run_only_reports(self):
+        report = collect_orphan_media(dry_run=True)
+
+        self.assertEqual(report.orphans, 1)
+        self.assertTrue(default_storage.exists(self.orphan))
+
+    def test_command_quarantines_orphans(self):
+        out = io.StringIO()
+
+        call_command("collect_orphan_media", quarantine=True, chunk_size=1, stdout=out)
+
+        quarantined = os.path.join(settings.MEDIA_ROOT, "quarantine", self.orphan)
+        self.assertTrue(os.path.exists(quarantined))
+        self.assertFalse(default_storage.exists(self.orphan))
+        self.assertIn("orphans: 1", out.getvalue())
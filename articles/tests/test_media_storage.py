@@ -0,0 +1,93 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from articles.management.commands.migrate_media_storage import Command
+from articles.models import Article, MediaBlob
+from articles.storage import is_content_name
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ContentAddressedStorageTests(TestCase):
+    def tearDown(self):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def test_file_is_named_by_content_under_prefix_directories(self):
+        name = default_storage.save("uploads/articles/python-1.JPG", ContentFile(b"1"))
+
+        directory, file_name = os.path.split(name)
+        digest = file_name.split(".")[0]
+        self.assertEqual(directory, f"uploads/articles/{digest[:2]}/{digest[2:4]}")
+        self.assertTrue(file_name.endswith(".jpg"))
+        self.assertTrue(is_content_name(name))
+
+    def test_same_content_is_stored_once_and_reference_counted(self):
+        first = default_storage.save("uploads/articles/a.jpg", ContentFile(b"same"))
+        second = default_storage.save("uploads/profiles/b.jpg", ContentFile(b"same"))
+        third = default_storage.save("uploads/articles/c.jpg", ContentFile(b"same"))
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(first, third)
+        self.assertEqual(MediaBlob.objects.get(name=first).references, 2)
+
+        default_storage.delete(first)
+        self.assertTrue(default_storage.exists(first))
+
+        default_storage.delete(third)
+        self.assertFalse(default_storage.exists(first))
+        self.assertFalse(MediaBlob.objects.filter(name=first).exists())
+
+    def test_derived_names_keep_the_top_directory(self):
+        name = default_storage.save("uploads/articles/a.jpg", ContentFile(b"original"))
+        root, _ = os.path.splitext(name)
+
+        variant = default_storage.save(f"{root}_320w.webp", ContentFile(b"variant"))
+
+        self.assertEqual(variant.split("/")[:2], ["uploads", "articles"])
+        self.assertEqual(len(variant.split("/")), 5)
+
+    def test_migrate_command_moves_legacy_files(self):
+        legacy_storage = FileSystemStorage()
+        legacy_name = legacy_storage.save("uploads/articles/a.jpg", ContentFile(b"a"))
+        article = Article.objects.create(title="Django")
+        Article.objects.filter(pk=article.pk).update(picture=legacy_name)
+
+        call_command("migrate_media_storage", stdout=io.StringIO())
+
+        article.refresh_from_db()
+        self.assertTrue(is_content_name(article.picture.name))
+        self.assertTrue(default_storage.exists(article.picture.name))
+        self.assertFalse(legacy_storage.exists(legacy_name))
+        self.assertEqual(MediaBlob.objects.get(name=article.picture.name).references, 1)
+
+    def test_migrate_command_keeps_picture_uploaded_during_the_move(self):
+        legacy_storage = FileSystemStorage()
+        legacy_name = legacy_storage.save("uploads/articles/a.jpg", ContentFile(b"a"))
+        article = Article.objects.create(title="Django")
+        Article.objects.filter(pk=article.pk).update(picture=legacy_name)
+        uploaded = default_storage.save("uploads/articles/b.jpg", ContentFile(b"b"))
+        copy = Command.copy
+
+        def copy_and_upload(command, name):
+            new_name = copy(command, name)
+            Article.objects.filter(pk=article.pk).update(picture=uploaded)
+            return new_name
+
+        stderr = io.StringIO()
+        with mock.patch.object(Command, "copy", copy_and_upload):
+            call_command("migrate_media_storage", stdout=io.StringIO(), stderr=stderr)
+
+        article.refresh_from_db()
+        self.assertEqual(article.picture.name, uploaded)
+        self.assertEqual(MediaBlob.objects.get(name=uploaded).references, 1)
+        self.assertEqual(MediaBlob.objects.count(), 1)
+        self.assertTrue(legacy_storage.exists(legacy_name))
+        self.assertIn("changed during the move", stderr.getvalue())
@@ -0,0 +1,86 @@
+import io
+import os
+import shutil
+import tempfile
+
+from PIL import Image
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from articles.models import Article
+from users.models import Profile
+
+
+def sample_picture(name="picture.jpg", size=(800, 600)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size).save(buffer, format="JPEG")
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(
+    MEDIA_ROOT=tempfile.mkdtemp(),
+    IMAGE_VARIANT_WIDTHS=[200, 400],
+    IMAGE_VARIANT_FORMATS=["webp"],
+)
+class PictureVariantsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass", username="testuser"
+        )
+        self.client.force_authenticate(self.user)
+
+    def tearDown(self):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def create_article(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            article = Article.objects.create(
+                title="Django", user=self.user, picture=sample_picture()
+            )
+
+        article.refresh_from_db()
+        return article
+
+    def test_article_list_and_detail_show_variant_urls(self):
+        article = self.create_article()
+
+        list_response = self.client.get(reverse("articles:article-list"))
+        detail_response = self.client.get(
+            reverse("articles:article-detail", args=[article.id])
+        )
+
+        variants = detail_response.data["picture_variants"]
+        self.assertEqual(list(variants), ["webp"])
+        self.assertEqual(list(variants["webp"]), ["200", "400"])
+        self.assertTrue(variants["webp"]["200"].startswith("http://testserver/media/"))
+        self.assertEqual(list_response.data["results"][0]["picture_variants"], variants)
+
+    def test_profile_shows_variant_urls(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Profile.objects.create(user=self.user, image=sample_picture("me.jpg"))
+
+        response = self.client.get(reverse("users:manage"))
+
+        self.assertEqual(
+            list(response.data["profile"]["picture_variants"]["webp"]), ["200", "400"]
+        )
+
+    def test_command_regenerates_variants_in_worker_processes(self):
+        article = self.create_article()
+        old_name = article.picture_variants["webp"]["200"]
+
+        with override_settings(IMAGE_VARIANT_WIDTHS=[100]):
+            call_command("regenerate_picture_variants", workers=2, stdout=io.StringIO())
+
+        article.refresh_from_db()
+        variants = article.picture_variants["webp"]
+        self.assertEqual(list(variants), ["100"])
+        new_path = os.path.join(settings.MEDIA_ROOT, variants["100"])
+        self.assertTrue(os.path.exists(new_path))
+        self.assertFalse(os.path.exists(os.path.join(settings.MEDIA_ROOT, old_name)))
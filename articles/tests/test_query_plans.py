@@ -0,0 +1,112 @@
+import re
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from article_telegram_bot.routers.command_routers.user_commands import (
+    get_latest_article,
+)
+from articles.benchmarks import seed_benchmark_articles
+
+ARTICLE_URL = reverse("articles:article-list")
+SCRAPED_ARTICLE_URL = reverse("articles:scraped-articles-list")
+CHANGES_URL = reverse("articles:article-changes")
+
+# Plan steps that read the whole article table or sort it
+FULL_SCAN_PATTERNS = {
+    "sqlite": [
+        re.compile(r"\bSCAN articles_article\w*\b(?! USING (COVERING )?INDEX)"),
+        re.compile(r"USE TEMP B-TREE FOR (ORDER BY|RIGHT PART OF ORDER BY)"),
+    ],
+    "postgresql": [
+        re.compile(r"Seq Scan on articles_article\w*\b"),
+        re.compile(r"^\s*(->\s*)?(Incremental )?Sort\b", re.MULTILINE),
+    ],
+}
+
+
+def explain(sql):
+    prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql)
+        return "\n".join(" ".join(map(str, row)) for row in cursor.fetchall())
+
+
+class ArticleQueryPlanTests(TestCase):
+    """
+    Run the queries of the article endpoints and the bot against the
+    benchmark dataset and check the plan of every one uses an index.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass", username="testuser"
+        )
+        seed_benchmark_articles(4000, user=cls.user)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assert_indexed_plans(self, queries):
+        article_queries = [
+            query["sql"] for query in queries if "articles_article" in query["sql"]
+        ]
+        self.assertTrue(article_queries)
+
+        for sql in article_queries:
+            plan = explain(sql)
+            for pattern in FULL_SCAN_PATTERNS.get(connection.vendor, []):
+                self.assertIsNone(
+                    pattern.search(plan), f"{sql}\n\nis not indexed:\n{plan}"
+                )
+
+    def get_plans(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return queries, response
+
+    def test_article_list(self):
+        queries, _ = self.get_plans(ARTICLE_URL, {"page": 50})
+
+        self.assert_indexed_plans(queries)
+
+    def test_article_list_cursor_page(self):
+        first = self.client.get(ARTICLE_URL, {"pagination": "cursor"})
+        queries, _ = self.get_plans(first.data["next"])
+
+        self.assert_indexed_plans(queries)
+
+    def test_scraped_article_list(self):
+        queries, _ = self.get_plans(SCRAPED_ARTICLE_URL, {"page": 50})
+
+        self.assert_indexed_plans(queries)
+
+    def test_scraped_article_list_cursor_page(self):
+        first = self.client.get(SCRAPED_ARTICLE_URL, {"pagination": "cursor"})
+        queries, _ = self.get_plans(first.data["next"])
+
+        self.assert_indexed_plans(queries)
+
+    @override_settings(ARTICLE_CHANGES_DELAY=0)
+    def test_article_changes_page(self):
+        first = self.client.get(CHANGES_URL, {"limit": 100})
+        queries, _ = self.get_plans(CHANGES_URL, {"since": first.data["next_token"]})
+
+        self.assert_indexed_plans(queries)
+
+    def test_latest_article(self):
+        with CaptureQueriesContext(connection) as queries:
+            async_to_sync(get_latest_article)()
+
+        self.assert_indexed_plans(queries)
@@ -0,0 +1,156 @@
+import datetime
+import decimal
+import io
+import json
+import uuid
+
+import msgpack
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from articles.models import Article
+from blog_service.parsers import ORJSONParser
+from blog_service.renderers import MessagePackRenderer, ORJSONRenderer
+
+ARTICLE_URL = reverse("articles:article-list")
+SCRAPED_ARTICLE_URL = reverse("articles:scraped-articles-list")
+
+EDGE_CASES = {
+    "datetime": datetime.datetime(
+        2024, 5, 1, 12, 30, 5, 123456, tzinfo=datetime.timezone.utc
+    ),
+    "naive_datetime": datetime.datetime(2024, 5, 1, 12, 30),
+    "date": datetime.date(2024, 5, 1),
+    "time": datetime.time(8, 15),
+    "timedelta": datetime.timedelta(hours=1),
+    "decimal": decimal.Decimal("10.50"),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "lazy": gettext_lazy("Not found."),
+    "separators": "line\u2028paragraph\u2029",
+    "unicode": 'Zoë <b>&amp;</b> "quoted" \\ \t',
+    "nested": ({"a": [1, 2.5, None, True]}, ()),
+    1: "integer key",
+}
+
+
+class ORJSONRendererTests(TestCase):
+    def assert_same_json(self, data, accepted_media_type=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_edge_cases_render_like_json_renderer(self):
+        self.assert_same_json(EDGE_CASES)
+
+    def test_indented_output_is_unchanged(self):
+        self.assert_same_json(EDGE_CASES, "application/json; indent=4")
+
+    def test_integers_over_64_bits_fall_back(self):
+        self.assert_same_json({"big": 2**70})
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_non_finite_floats_render_as_null(self):
+        data = {"nan": float("nan"), "inf": float("inf"), "-inf": float("-inf")}
+
+        self.assertEqual(
+            ORJSONRenderer().render(data), b'{"nan":null,"inf":null,"-inf":null}'
+        )
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(data)
+
+    def test_exponent_floats_render_the_same_values(self):
+        data = [1e16, 1e-7, 1.5e300, -2.5e-300, 0.1, 123456789.123]
+
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(data)),
+            json.loads(JSONRenderer().render(data)),
+        )
+
+
+class ORJSONParserTests(TestCase):
+    def parse(self, body):
+        return ORJSONParser().parse(io.BytesIO(body))
+
+    def test_integers_over_64_bits_fall_back(self):
+        self.assertEqual(self.parse(b'{"big": 1180591620717411303424}'), {"big": 2**70})
+
+    def test_non_finite_numbers_are_rejected(self):
+        with self.assertRaisesMessage(ParseError, "JSON parse error"):
+            self.parse(b'{"nan": NaN}')
+
+
+class RendererNegotiationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="testpass",
+            username="testuser",
+            first_name="Zoë",
+        )
+        self.client.force_authenticate(self.user)
+
+        for index in range(3):
+            Article.objects.create(
+                title=f"Article {index}", content="x " * 200, user=self.user
+            )
+        Article.objects.create(
+            scraped_title="Scraped",
+            scraped_url="https://example.com/story?id=1",
+            source=Article.SCRAPED,
+        )
+
+    def test_article_pages_render_like_json_renderer(self):
+        for url in (ARTICLE_URL, SCRAPED_ARTICLE_URL, f"{ARTICLE_URL}?fields=id"):
+            response = self.client.get(url)
+
+            self.assertEqual(response["Content-Type"], "application/json")
+            self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_messagepack_is_chosen_by_accept_header(self):
+        json_response = self.client.get(ARTICLE_URL)
+        response = self.client.get(ARTICLE_URL, HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content), json_response.json())
+        self.assertNotEqual(response["ETag"], json_response["ETag"])
+
+    def test_messagepack_renders_values_like_json(self):
+        expected = json.loads(JSONRenderer().render(EDGE_CASES))
+        expected[1] = expected.pop("1")
+
+        data = msgpack.unpackb(
+            MessagePackRenderer().render(EDGE_CASES), strict_map_key=False
+        )
+
+        self.assertEqual(data, expected)
+
+    def test_create_article_from_messagepack(self):
+        response = self.client.post(
+            ARTICLE_URL,
+            msgpack.packb({"title": "Packed", "content": "Zoë"}),
+            content_type="application/msgpack",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Article.objects.filter(title="Packed", content="Zoë").exists())
+
+    def test_invalid_bodies_are_bad_requests(self):
+        for body, content_type in (
+            (b'{"title": ', "application/json"),
+            (b'{"title": NaN}', "application/json"),
+            (b"\xc1", "application/msgpack"),
+        ):
+            response = self.client.post(ARTICLE_URL, body, content_type=content_type)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,75 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from scrapy.exceptions import DropItem
+
+from articles.bloom import build_url_bloom_filter
+from articles.models import Article
+from articles_scraper.pipelines import ArticlesScraperPipeline
+
+
+@mock.patch("articles_scraper.pipelines.close_old_connections", mock.Mock())
+class ArticlesScraperPipelineTests(TestCase):
+    def setUp(self):
+        Article.objects.create(
+            scraped_title="Known",
+            scraped_url="https://example.com/known",
+            source=Article.SCRAPED,
+        )
+        self.pipeline = ArticlesScraperPipeline(batch_size=2, flush_interval=60)
+        self.pipeline.load_known_hashes()
+
+    def test_known_stories_are_dropped(self):
+        item = {"title": "Known", "url": "https://example.com/known?utm_source=hn"}
+
+        with self.assertRaises(DropItem):
+            self.pipeline.process_item(item, spider=None)
+
+    def test_nothing_is_loaded_with_bloom_filter(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = os.path.join(temp_dir.name, "urls.bloom")
+        pipeline = ArticlesScraperPipeline(batch_size=2, flush_interval=60)
+
+        with override_settings(URL_BLOOM_FILTER_PATH=path):
+            build_url_bloom_filter()
+            pipeline.load_known_hashes()
+
+        self.assertEqual(pipeline.known_hashes, set())
+
+    def test_duplicates_within_crawl_are_dropped(self):
+        item = {"title": "New", "url": "https://example.com/new"}
+        self.pipeline.process_item(item, spider=None)
+
+        with self.assertRaises(DropItem):
+            self.pipeline.process_item(dict(item), spider=None)
+
+        self.assertEqual(len(self.pipeline.buffer), 1)
+
+    def test_full_buffer_is_flushed(self):
+        with mock.patch.object(self.pipeline, "flush") as flush:
+            self.pipeline.process_item(
+                {"title": "One", "url": "https://example.com/1"}, spider=None
+            )
+            flush.assert_not_called()
+
+            self.pipeline.process_item(
+                {"title": "Two", "url": "https://example.com/2"}, spider=None
+            )
+            flush.assert_called_once()
+
+    def test_write_rows_stores_articles_in_bulk(self):
+        stats = mock.Mock()
+        self.pipeline.stats = stats
+        rows = [
+            {"title": "One", "url": "https://example.com/1"},
+            {"title": "Two", "url": "item?id=2"},
+        ]
+
+        result = self.pipeline.write_rows(rows)
+
+        self.assertEqual(result.inserted, 2)
+        self.assertEqual(Article.objects.filter(source=Article.SCRAPED).count(), 3)
+        stats.inc_value.assert_any_call("articles/inserted", 2)
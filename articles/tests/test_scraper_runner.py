@@ -0,0 +1,70 @@
+import os
+import threading
+
+from django.test import SimpleTestCase
+
+from articles_scraper.runner import ScraperPool
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+OFFLINE_SETTINGS = {
+    "ITEM_PIPELINES": {},
+    "ROBOTSTXT_OBEY": False,
+    "AUTOTHROTTLE_ENABLED": False,
+    "TELNETCONSOLE_ENABLED": False,
+    "LOG_LEVEL": "WARNING",
+}
+
+
+class ScraperPoolTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pool = ScraperPool(size=1, cancel_grace_period=10)
+        cls.pool.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+        super().tearDownClass()
+
+    def run_fixture_crawl(self, **kwargs):
+        page_url = "file://" + os.path.join(FIXTURES_DIR, "hn_news_page_1.html")
+        return self.pool.run(
+            "stories",
+            timeout=60,
+            crawl_settings=OFFLINE_SETTINGS,
+            start_urls=[page_url],
+            allowed_domains=[],
+            max_pages=1,
+            **kwargs,
+        )
+
+    def test_items_and_stats_are_streamed_back(self):
+        items = []
+
+        result = self.run_fixture_crawl(on_item=items.append)
+
+        self.assertEqual(result.finish_reason, "finished")
+        self.assertEqual(result.item_count, 3)
+        self.assertEqual(items[0]["title"], "Show HN: A tiny database")
+        self.assertEqual(result.stats["item_scraped_count"], 3)
+
+    def test_worker_process_is_reused_between_crawls(self):
+        worker = self.pool.idle.queue[0]
+
+        self.run_fixture_crawl()
+        self.run_fixture_crawl()
+
+        self.assertIs(self.pool.idle.queue[0], worker)
+        self.assertTrue(worker.is_alive())
+
+    def test_cancelled_crawl_stops(self):
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        result = self.run_fixture_crawl(cancel_event=cancel_event)
+
+        self.assertTrue(result.cancelled)
+        self.assertIsNotNone(result.finish_reason)
@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from articles.models import Article
+
+ARTICLE_URL = reverse("articles:article-list")
+SCRAPED_ARTICLE_URL = reverse("articles:scraped-articles-list")
+
+
+def detail_url(article_id):
+    return reverse("articles:article-detail", args=[article_id])
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass", username="testuser"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.article = Article.objects.create(
+            title="Django", content="Long text", user=self.user
+        )
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, queries[-1]["sql"]
+
+    def test_fields_limits_output_and_columns(self):
+        response, sql = self.get(ARTICLE_URL, {"fields": "id,title"})
+
+        self.assertEqual(
+            response.data["results"], [{"id": self.article.id, "title": "Django"}]
+        )
+        self.assertNotIn('"content"', sql)
+        self.assertNotIn("users_user", sql)
+
+    def test_omit_drops_fields(self):
+        response, sql = self.get(ARTICLE_URL, {"omit": "excerpt,picture_variants"})
+
+        article = response.data["results"][0]
+        self.assertNotIn("excerpt", article)
+        self.assertNotIn("picture_variants", article)
+        self.assertEqual(article["title"], "Django")
+        self.assertNotIn('"excerpt"', sql)
+        self.assertIn("users_user", sql)
+
+    def test_unserialized_columns_are_not_loaded(self):
+        _, sql = self.get(ARTICLE_URL, {})
+
+        self.assertIn('"excerpt"', sql)
+        self.assertNotIn('"content"', sql)
+        self.assertNotIn("picture_hash", sql)
+        self.assertNotIn("scraped_url", sql)
+
+    def test_detail_fields(self):
+        response, sql = self.get(detail_url(self.article.id), {"fields": "title"})
+
+        self.assertEqual(response.data, {"title": "Django"})
+        self.assertNotIn('"content"', sql)
+
+    def test_scraped_fields(self):
+        Article.objects.create(
+            scraped_title="Scraped",
+            scraped_url="https://example.com/a",
+            source=Article.SCRAPED,
+        )
+
+        response, sql = self.get(SCRAPED_ARTICLE_URL, {"fields": "scraped_title"})
+
+        self.assertEqual(response.data["results"], [{"scraped_title": "Scraped"}])
+        self.assertNotIn('"scraped_url"', sql)
+
+    def test_unknown_field(self):
+        response = self.client.get(ARTICLE_URL, {"fields": "id,secret"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("secret", str(response.data["fields"]))
+
+    def test_unknown_omitted_field(self):
+        response = self.client.get(ARTICLE_URL, {"omit": "secret"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("secret", str(response.data["omit"]))
+        self.assertNotIn("fields", response.data)
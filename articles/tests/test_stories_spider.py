@@ -0,0 +1,118 @@
+import os
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from scrapy import Request
+from scrapy.http import HtmlResponse
+
+from articles.models import Article
+from articles_scraper.spiders.stories import StoriesSpider
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def fixture_response(file_name, url="https://news.ycombinator.com/"):
+    with open(os.path.join(FIXTURES_DIR, file_name), "rb") as file:
+        body = file.read()
+
+    return HtmlResponse(url=url, body=body, encoding="utf-8", request=Request(url))
+
+
+class StoriesSpiderHttpModeTests(SimpleTestCase):
+    def test_parse_yields_stories_and_follows_more_link(self):
+        spider = StoriesSpider()
+
+        results = list(spider.parse(fixture_response("hn_news_page_1.html")))
+
+        items = [result for result in results if isinstance(result, dict)]
+        requests = [result for result in results if isinstance(result, Request)]
+
+        self.assertEqual(len(items), 3)
+        self.assertEqual(
+            items[0],
+            {
+                "title": "Show HN: A tiny database",
+                "url": "https://example.com/tiny-database",
+            },
+        )
+        self.assertEqual(items[1]["url"], "item?id=102")
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0].url, "https://news.ycombinator.com/?p=2")
+        self.assertIsNone(spider.driver)
+
+    def test_last_page_stops_pagination(self):
+        spider = StoriesSpider()
+
+        results = list(
+            spider.parse(
+                fixture_response(
+                    "hn_news_page_2.html", "https://news.ycombinator.com/?p=2"
+                )
+            )
+        )
+
+        self.assertEqual(len(results), 2)
+        self.assertFalse(any(isinstance(result, Request) for result in results))
+
+    def test_max_pages_limits_pagination(self):
+        spider = StoriesSpider(max_pages=1)
+
+        results = list(spider.parse(fixture_response("hn_news_page_1.html")))
+
+        self.assertFalse(any(isinstance(result, Request) for result in results))
+        self.assertEqual(spider.pages_fetched, 1)
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            StoriesSpider(mode="browser")
+
+
+class StoriesSpiderIncrementalTests(TestCase):
+    def setUp(self):
+        for url in (
+            "https://example.com/tiny-database",
+            "https://news.ycombinator.com/item?id=102",
+            "https://example.com/postgres-indexing",
+        ):
+            Article.objects.create(
+                scraped_title="Known", scraped_url=url, source=Article.SCRAPED
+            )
+
+    def create_spider(self, **kwargs):
+        spider = StoriesSpider(incremental="1", **kwargs)
+        with mock.patch("articles_scraper.spiders.stories.close_old_connections"):
+            spider.load_seen()
+        return spider
+
+    def test_stops_after_configured_known_pages(self):
+        spider = self.create_spider(stop_after_known_pages=1)
+
+        results = list(spider.parse(fixture_response("hn_news_page_1.html")))
+
+        self.assertFalse(any(isinstance(result, Request) for result in results))
+        self.assertTrue(spider.stopped_early)
+        self.assertEqual(spider.known_pages, 1)
+
+    def test_keeps_paging_until_threshold(self):
+        spider = self.create_spider(stop_after_known_pages=2)
+
+        results = list(spider.parse(fixture_response("hn_news_page_1.html")))
+
+        self.assertTrue(any(isinstance(result, Request) for result in results))
+        self.assertFalse(spider.stopped_early)
+
+    def test_page_with_new_story_resets_counter(self):
+        spider = self.create_spider(stop_after_known_pages=2)
+        list(spider.parse(fixture_response("hn_news_page_1.html")))
+
+        list(
+            spider.parse(
+                fixture_response(
+                    "hn_news_page_2.html", "https://news.ycombinator.com/?p=2"
+                )
+            )
+        )
+
+        self.assertEqual(spider.known_pages_in_row, 0)
+        self.assertFalse(spider.stopped_early)
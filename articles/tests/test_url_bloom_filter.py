@@ -0,0 +1,158 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from articles import bloom as bloom_module
+from articles.bloom import (
+    BloomFilter,
+    add_url_hashes,
+    build_url_bloom_filter,
+    get_url_bloom_filter,
+)
+from articles.importers import find_known_url_hashes, import_scraped_rows
+from articles.models import Article
+from articles.utils import fill_scraped_url_hashes, url_hash
+
+
+def sample_scraped_article(url):
+    return Article.objects.create(
+        scraped_title="Story", scraped_url=url, source=Article.SCRAPED
+    )
+
+
+class BloomFilterTests(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, "urls.bloom")
+
+    def test_added_keys_are_always_found(self):
+        bloom = BloomFilter.create(self.path, capacity=1000, fpr=0.01)
+        keys = [url_hash(f"https://example.com/{i}") for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        bloom.flush()
+        bloom.close()
+
+        bloom = BloomFilter.open(self.path)
+
+        self.assertTrue(all(key in bloom for key in keys))
+        self.assertEqual(bloom.count, 1000)
+
+    def test_false_positive_rate_stays_near_target(self):
+        bloom = BloomFilter.create(self.path, capacity=2000, fpr=0.01)
+        for i in range(2000):
+            bloom.add(url_hash(f"https://example.com/{i}"))
+
+        false_positives = sum(
+            url_hash(f"https://other.com/{i}") in bloom for i in range(5000)
+        )
+
+        self.assertLess(false_positives / 5000, 0.03)
+        self.assertAlmostEqual(bloom.estimated_fpr(), 0.01, delta=0.005)
+
+    def test_build_and_lookup_with_watermark(self):
+        known = sample_scraped_article("https://example.com/known")
+
+        with override_settings(URL_BLOOM_FILTER_PATH=self.path):
+            report = build_url_bloom_filter()
+            with self.captureOnCommitCallbacks(execute=True):
+                newer = sample_scraped_article("https://example.com/newer")
+            new_key = url_hash("https://example.com/new")
+
+            found = find_known_url_hashes(
+                [known.scraped_url_hash, newer.scraped_url_hash, new_key]
+            )
+
+            self.assertEqual(report["watermark"], known.pk)
+            self.assertIsNotNone(get_url_bloom_filter())
+
+        self.assertEqual(found, {known.scraped_url_hash, newer.scraped_url_hash})
+
+    def test_rows_hashed_after_build_are_known(self):
+        older = sample_scraped_article("https://example.com/old")
+
+        with override_settings(URL_BLOOM_FILTER_PATH=self.path):
+            build_url_bloom_filter()
+            # Edited below the watermark, its new hash is added on commit
+            older.scraped_url = "https://example.com/moved"
+            with self.captureOnCommitCallbacks(execute=True):
+                older.save()
+
+            self.assertIn(older.scraped_url_hash, get_url_bloom_filter())
+
+            with mock.patch("articles.importers.notify_new_article") as notify:
+                with self.captureOnCommitCallbacks(execute=True):
+                    result = import_scraped_rows(
+                        [{"title": "Story", "url": "https://example.com/moved"}]
+                    )
+
+        self.assertEqual(result.inserted, 0)
+        self.assertEqual(result.skipped, 1)
+        notify.assert_not_called()
+
+    def test_definitely_new_keys_skip_the_database(self):
+        with override_settings(URL_BLOOM_FILTER_PATH=self.path):
+            build_url_bloom_filter()
+
+            with self.assertNumQueries(0):
+                found = find_known_url_hashes([url_hash("https://example.com/new")])
+
+        self.assertEqual(found, set())
+
+    def test_imported_and_backfilled_hashes_are_added(self):
+        backfilled = sample_scraped_article("https://example.com/backfilled")
+        Article.objects.filter(pk=backfilled.pk).update(
+            scraped_url_canonical=None, scraped_url_hash=None
+        )
+
+        with override_settings(URL_BLOOM_FILTER_PATH=self.path):
+            build_url_bloom_filter()
+
+            with self.captureOnCommitCallbacks(execute=True):
+                list(fill_scraped_url_hashes(Article))
+            with mock.patch("articles.importers.notify_new_article"):
+                with self.captureOnCommitCallbacks(execute=True):
+                    import_scraped_rows(
+                        [{"title": "Story", "url": "https://example.com/imported"}]
+                    )
+
+            bloom = get_url_bloom_filter()
+
+        self.assertIn(url_hash("https://example.com/backfilled"), bloom)
+        self.assertIn(url_hash("https://example.com/imported"), bloom)
+
+    def test_hashes_added_during_a_build_are_kept(self):
+        added_key = url_hash("https://example.com/added")
+        create = BloomFilter.create
+
+        def create_and_add(*args, **kwargs):
+            # Committed after the build read the stored hashes
+            bloom = create(*args, **kwargs)
+            add_url_hashes([added_key], path=self.path)
+            return bloom
+
+        with mock.patch.object(
+            bloom_module.BloomFilter, "create", side_effect=create_and_add
+        ):
+            build_url_bloom_filter(path=self.path, fpr=0.01)
+
+        bloom = BloomFilter.open(self.path)
+        self.addCleanup(bloom.close)
+
+        self.assertIn(added_key, bloom)
+        self.assertFalse(os.path.exists(f"{self.path}.pending"))
+
+    def test_rebuild_command_reports_size_and_fpr(self):
+        sample_scraped_article("https://example.com/known")
+        stdout = mock.Mock()
+
+        with override_settings(URL_BLOOM_FILTER_PATH=self.path):
+            call_command("rebuild_url_bloom_filter", fpr=0.01, stdout=stdout)
+            call_command("rebuild_url_bloom_filter", report=True, stdout=stdout)
+
+        self.assertTrue(os.path.exists(self.path))
+        self.assertIn("estimated FPR", stdout.write.call_args[0][0])
@@ -1,13 +1,22 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from articles.views import ArticleViewSet, ArticleScrapedViewSet
+from articles.views import (
+    ArticleViewSet,
+    ArticleScrapedViewSet,
+    ArticleExportView,
+    ArticleChangesView,
+    article_live_feed,
+)
 
 router = routers.DefaultRouter()
 router.register("articles", ArticleViewSet)
 router.register("scraped-articles", ArticleScrapedViewSet, basename="scraped-articles")
 
 urlpatterns = [
+    path("articles/export/", ArticleExportView.as_view(), name="article-export"),
+    path("articles/changes/", ArticleChangesView.as_view(), name="article-changes"),
+    path("articles/live/", article_live_feed, name="article-live"),
     path("", include(router.urls)),
 ]
 
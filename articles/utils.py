@@ -1,11 +1,208 @@
+import hashlib
+import html
 import os
+import re
 import uuid
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.html import strip_tags
 from django.utils.text import slugify
 
+HACKER_NEWS_BASE_URL = "https://news.ycombinator.com/"
+
+TRACKING_QUERY_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "ref", "ref_src", "_hsenc", "_hsmi",
+}
+TRACKING_QUERY_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Markdown links keep their text, emphasis and heading markers are dropped
+MARKDOWN_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+MARKDOWN_MARKERS_RE = re.compile(r"(^|\s)(#{1,6}|>)(?=\s)|\*\*?|`+|~~")
+EXCERPT_ELLIPSIS = "\u2026"
+
 
 def articles_picture_file_path(instance, filename):
     _, extension = os.path.splitext(filename)
     filename = f"{slugify(instance.title)}-{uuid.uuid4()}{extension}"
 
     return os.path.join("uploads/articles/", filename)
+
+
+def absolute_scraped_url(url):
+    """Resolve a Hacker News relative link (e.g. ``item?id=1``) to an absolute URL"""
+    if url and not re.match(r"https?://", url, re.IGNORECASE):
+        return HACKER_NEWS_BASE_URL + url
+
+    return url
+
+
+def _is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_QUERY_PARAMS or name.startswith(TRACKING_QUERY_PREFIXES)
+
+
+def canonicalize_url(url):
+    """
+    Return the canonical form of a scraped URL used for deduplication:
+    HN relative links are resolved, scheme and host are lowercased,
+    default ports and tracking query params are dropped.
+    """
+    parts = urlsplit(absolute_scraped_url(url.strip()))
+    scheme = parts.scheme.lower()
+
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+
+    userinfo, _, host = parts.netloc.rpartition("@")
+    host = host.lower()
+    if port and port == DEFAULT_PORTS.get(scheme):
+        host = host.rsplit(":", 1)[0]
+    netloc = f"{userinfo}@{host}" if userinfo else host
+
+    query = urlencode(
+        [
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking_param(name)
+        ]
+    )
+
+    return urlunsplit((scheme, netloc, parts.path or "/", query, parts.fragment))
+
+
+def url_hash(canonical_url):
+    """Fixed-width (64 hex chars) hash of a canonical URL"""
+    return hashlib.sha256(canonical_url.encode("utf-8")).hexdigest()
+
+
+def fill_scraped_url_hashes(article_model, batch_size=1000):
+    """
+    Fill ``scraped_url_canonical`` and ``scraped_url_hash`` for scraped rows
+    that don't have them yet, one short transaction per batch of primary keys.
+
+    Rows whose canonical URL is already taken by another row only get the
+    canonical URL, which marks them as duplicates: they are left without a
+    hash, so they can't break the unique index, and saving them later keeps
+    it that way. Filled hashes are added to the URL Bloom filter. Used by the
+    backfill command, migration 0005 keeps a frozen copy.
+
+    Yields ``(updated, duplicates)`` per processed batch.
+    """
+    from articles.bloom import remember_url_hashes
+
+    last_pk = 0
+
+    while True:
+        batch = list(
+            article_model.objects.filter(
+                pk__gt=last_pk,
+                scraped_url__isnull=False,
+                scraped_url_canonical__isnull=True,
+            )
+            .exclude(scraped_url="")
+            .order_by("pk")
+            .only("pk", "scraped_url")[:batch_size]
+        )
+        if not batch:
+            return
+
+        last_pk = batch[-1].pk
+        by_hash = {}
+
+        for article in batch:
+            article.scraped_url_canonical = canonicalize_url(article.scraped_url)
+            article.scraped_url_hash = url_hash(article.scraped_url_canonical)
+            by_hash.setdefault(article.scraped_url_hash, article)
+
+        with transaction.atomic():
+            taken = set(
+                article_model.objects.filter(scraped_url_hash__in=by_hash.keys())
+                .values_list("scraped_url_hash", flat=True)
+            )
+            updated = [
+                article for url_key, article in by_hash.items() if url_key not in taken
+            ]
+            duplicates = [
+                article
+                for article in batch
+                if article.scraped_url_hash in taken
+                or by_hash[article.scraped_url_hash] is not article
+            ]
+            for article in duplicates:
+                article.scraped_url_hash = None
+
+            article_model.objects.bulk_update(
+                updated, ["scraped_url_canonical", "scraped_url_hash"]
+            )
+            article_model.objects.bulk_update(duplicates, ["scraped_url_canonical"])
+            remember_url_hashes(article.scraped_url_hash for article in updated)
+
+        yield len(updated), len(duplicates)
+
+
+def make_excerpt(content, length=None):
+    """
+    Plain text preview of ``content``: markup stripped, whitespace collapsed
+    and cut at a word boundary to at most ``length`` characters.
+    """
+    length = length or settings.ARTICLE_EXCERPT_LENGTH
+    text = html.unescape(strip_tags(content or ""))
+    text = MARKDOWN_MARKERS_RE.sub(r"\1", MARKDOWN_LINK_RE.sub(r"\1", text))
+    text = " ".join(text.split())
+
+    if len(text) <= length:
+        return text
+
+    # One character is left for the ellipsis
+    cut = text[:length]
+    if " " in cut:
+        cut = cut[: cut.rindex(" ")]
+    else:
+        cut = cut[: length - 1]
+
+    return cut.rstrip(" .,;:!?-") + EXCERPT_ELLIPSIS
+
+
+def fill_article_excerpts(article_model, batch_size=1000, recompute=False):
+    """
+    Compute ``excerpt`` of articles with content, one short transaction per
+    batch of primary keys. Only rows without an excerpt are updated unless
+    ``recompute`` is set, e.g. after ``ARTICLE_EXCERPT_LENGTH`` changed.
+
+    Yields the number of updated rows per processed batch.
+    """
+    last_pk = 0
+
+    while True:
+        queryset = article_model.objects.filter(pk__gt=last_pk).exclude(content="")
+        if not recompute:
+            queryset = queryset.filter(excerpt="")
+
+        batch = list(
+            queryset.order_by("pk").only("pk", "content", "excerpt")[:batch_size]
+        )
+        if not batch:
+            return
+
+        last_pk = batch[-1].pk
+        now = timezone.now()
+        updated = []
+
+        for article in batch:
+            excerpt = make_excerpt(article.content)
+            if excerpt != article.excerpt:
+                article.excerpt = excerpt
+                article.updated_at = now
+                updated.append(article)
+
+        with transaction.atomic():
+            article_model.objects.bulk_update(updated, ["excerpt", "updated_at"])
+
+        yield len(updated)
@@ -1,40 +1,69 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_GET
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from rest_framework import viewsets, status, generics, mixins
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from articles.cache import CachedResponseMixin
+from articles.changes import get_changes
+from articles.exports import export_rows, stream_export
+from articles.fast_lists import FastListMixin, FastListSerializer
+from articles.live import get_hub
+from articles.fieldsets import SparseFieldsetViewMixin, fieldset_parameters
 from articles.models import Article
-from articles.pagination import ApiPagination
+from articles.pagination import ArticlePagination
 from articles.permissions import IsAuthorOrReadOnly
+from articles.search import search_articles
 from articles.serializers import (
     ArticleSerializer,
     ArticleListSerializer,
     ArticlePictureSerializer,
     ArticleDetailSerializer,
     ArticleScrapedSerializer,
+    ArticleExportSerializer,
+    ArticleExportFilterSerializer,
+    ArticleChangesQuerySerializer,
+    ArticleChangesSerializer,
 )
+from blog_service.renderers import CSVRenderer, NDJSONRenderer
 
 
-class ArticleViewSet(viewsets.ModelViewSet):
+class ArticleViewSet(
+    CachedResponseMixin,
+    FastListMixin,
+    SparseFieldsetViewMixin,
+    viewsets.ModelViewSet,
+):
+    cache_source = Article.MANUAL
     queryset = Article.objects.select_related("user").filter(source="Manual")
     serializer_class = ArticleSerializer
     authentication_classes = (TokenAuthentication,)
     permission_classes = (IsAuthenticated, IsAuthorOrReadOnly)
-    pagination_class = ApiPagination
+    pagination_class = ArticlePagination
 
     def get_queryset(self):
         """Retrieve the article with filter"""
         title = self.request.query_params.get("title")
+        search = self.request.query_params.get("search")
 
         queryset = super().get_queryset()
 
         if title:
             queryset = queryset.filter(title__icontains=title)
 
+        if search:
+            queryset = search_articles(queryset, search)
+
         return queryset
 
     def get_serializer_class(self):
@@ -88,11 +117,21 @@ class ArticleViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         parameters=[
+            OpenApiParameter(
+                "search",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Full-text search in title, scraped title and content, "
+                    "best matches first (ex. ?search=python)"
+                ),
+            ),
             OpenApiParameter(
                 "title",
                 type=OpenApiTypes.STR,
-                description="Filter by title (ex. ?title=python)",
+                description="Filter by title (ex. ?title=python), use search instead",
+                deprecated=True,
             ),
+            *fieldset_parameters(ArticleListSerializer),
         ]
     )
     def list(self, request, *args, **kwargs):
@@ -101,6 +140,7 @@ class ArticleViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         description="Retrieve a specific article",
+        parameters=fieldset_parameters(ArticleDetailSerializer),
         responses={200: ArticleDetailSerializer},
     )
     def retrieve(self, request, *args, **kwargs):
@@ -144,34 +184,55 @@ class ArticleViewSet(viewsets.ModelViewSet):
 
 
 class ArticleScrapedViewSet(
+    CachedResponseMixin,
+    FastListMixin,
+    SparseFieldsetViewMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     viewsets.GenericViewSet
 ):
+    cache_source = Article.SCRAPED
     queryset = Article.objects.filter(source="Scraped")
     serializer_class = ArticleScrapedSerializer
     authentication_classes = (TokenAuthentication,)
     permission_classes = (IsAuthenticated,)
-    pagination_class = ApiPagination
+    pagination_class = ArticlePagination
 
     def get_queryset(self):
         """Retrieve the article with filter"""
         scraped_title = self.request.query_params.get("scraped_title")
+        search = self.request.query_params.get("search")
 
         queryset = super().get_queryset()
 
         if scraped_title:
             queryset = queryset.filter(scraped_title__icontains=scraped_title)
 
+        if search:
+            queryset = search_articles(queryset, search)
+
         return queryset
 
     @extend_schema(
         parameters=[
+            OpenApiParameter(
+                "search",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Full-text search in title, scraped title and content, "
+                    "best matches first (ex. ?search=python)"
+                ),
+            ),
             OpenApiParameter(
                 "scraped_title",
                 type=OpenApiTypes.STR,
-                description="Filter by scraped_title (ex. ?scraped_title=python)",
+                description=(
+                    "Filter by scraped_title (ex. ?scraped_title=python), "
+                    "use search instead"
+                ),
+                deprecated=True,
             ),
+            *fieldset_parameters(ArticleScrapedSerializer),
         ]
     )
     def list(self, request, *args, **kwargs):
@@ -180,8 +241,157 @@ class ArticleScrapedViewSet(
 
     @extend_schema(
         description="Retrieve a specific article",
+        parameters=fieldset_parameters(ArticleScrapedSerializer),
         responses={200: ArticleScrapedSerializer},
     )
     def retrieve(self, request, *args, **kwargs):
         """Retrieve a specific article"""
         return super().retrieve(request, *args, **kwargs)
+
+
+class ArticleExportView(generics.GenericAPIView):
+    """
+    Stream every article, manual and scraped, as NDJSON (default) or CSV,
+    chosen with the ``Accept`` header or ``?format=ndjson|csv``. Responses
+    are gzipped on the fly for clients accepting it.
+    """
+
+    queryset = Article.objects.all()
+    serializer_class = ArticleExportSerializer
+    authentication_classes = (TokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    renderer_classes = (NDJSONRenderer, CSVRenderer)
+    pagination_class = None
+
+    def get_queryset(self):
+        """Articles matching the filters, in id order"""
+        filters = ArticleExportFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+        lookups = {
+            "source": "source",
+            "user": "user_id",
+            "published_from": "published_at__gte",
+            "published_to": "published_at__lte",
+        }
+
+        return super().get_queryset().filter(
+            **{
+                lookups[name]: value
+                for name, value in filters.validated_data.items()
+            }
+        ).order_by("id")
+
+    @extend_schema(
+        description="Export all articles as NDJSON or CSV",
+        parameters=[
+            OpenApiParameter(
+                "source",
+                type=OpenApiTypes.STR,
+                enum=[source for source, _ in Article.SOURCE_CHOICES],
+            ),
+            OpenApiParameter("user", type=OpenApiTypes.INT, description="Author id"),
+            OpenApiParameter(
+                "published_from",
+                type=OpenApiTypes.DATE,
+                description="Published on or after (ex. ?published_from=2024-05-01)",
+            ),
+            OpenApiParameter(
+                "published_to",
+                type=OpenApiTypes.DATE,
+                description="Published on or before (ex. ?published_to=2024-05-31)",
+            ),
+        ],
+        responses={200: ArticleExportSerializer(many=True)},
+    )
+    @method_decorator(gzip_page)
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        fast = FastListSerializer.compile(serializer)
+        renderer = request.accepted_renderer
+
+        response = StreamingHttpResponse(
+            stream_export(
+                renderer,
+                export_rows(fast, self.get_queryset()),
+                list(serializer.fields),
+            ),
+            content_type=(
+                f"{renderer.media_type}; charset={renderer.charset}"
+                if renderer.charset
+                else renderer.media_type
+            ),
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="articles.{renderer.format}"'
+        )
+        return response
+
+
+class ArticleChangesView(generics.GenericAPIView):
+    """
+    Articles created, updated or deleted after a sync token, oldest first.
+    Start without ``since`` and pass ``next_token`` back until ``has_more``
+    is false, then keep it for the next sync.
+    """
+
+    serializer_class = ArticleExportSerializer
+    authentication_classes = (TokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    pagination_class = None
+
+    @extend_schema(
+        description="Change feed of all articles for incremental sync",
+        parameters=[ArticleChangesQuerySerializer],
+        responses={200: ArticleChangesSerializer},
+    )
+    def get(self, request, *args, **kwargs):
+        query = ArticleChangesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        fast = FastListSerializer.compile(self.get_serializer())
+
+        return Response(get_changes(fast, **query.validated_data))
+
+
+def _unauthorized(request, detail):
+    response = JsonResponse({"detail": detail}, status=status.HTTP_401_UNAUTHORIZED)
+    response["WWW-Authenticate"] = TokenAuthentication().authenticate_header(request)
+    return response
+
+
+@require_GET
+async def article_live_feed(request):
+    """
+    Server-Sent Events of created and updated articles, ``?source=Manual``
+    limits them to a source. Served by the ASGI application only.
+    """
+    if not isinstance(request, ASGIRequest):
+        # WSGI would collect the endless stream into a list and never finish
+        return JsonResponse(
+            {"detail": "The live feed is only served by the ASGI application."},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+
+    try:
+        authenticated = await sync_to_async(TokenAuthentication().authenticate)(
+            request
+        )
+    except AuthenticationFailed as exc:
+        return _unauthorized(request, exc.detail)
+    if authenticated is None:
+        return _unauthorized(request, NotAuthenticated.default_detail)
+
+    sources = request.GET.getlist("source")
+    unknown = set(sources) - {source for source, _ in Article.SOURCE_CHOICES}
+    if unknown:
+        return JsonResponse(
+            {"source": f"Unknown sources: {', '.join(sorted(unknown))}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    response = StreamingHttpResponse(
+        get_hub().events(sources), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Let nginx pass events on as they come
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -3,11 +3,121 @@
 # Don't forget to add your pipeline to the ITEM_PIPELINES setting
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
+import logging
+import time
 
-# useful for handling different item types with a single interface
+from django.db import close_old_connections
 from itemadapter import ItemAdapter
+from scrapy.exceptions import DropItem
+from twisted.internet import defer, task, threads
+
+from articles.bloom import get_url_bloom_filter
+from articles.importers import import_scraped_rows, iter_known_url_hashes
+from articles.utils import canonicalize_url, url_hash
+
+logger = logging.getLogger(__name__)
 
 
 class ArticlesScraperPipeline:
+    """
+    Write scraped stories straight to ``Article`` in batches.
+
+    Items already seen during this crawl are dropped in memory. With the URL
+    Bloom filter built, the import engine asks it on flush and only looks up
+    the stories it may have seen in the database. Without it the URL hashes
+    of all stored articles are loaded when the spider opens, so stored
+    stories are dropped in memory too.
+    The buffer is flushed every ``ARTICLES_PIPELINE_BATCH_SIZE`` items, every
+    ``ARTICLES_PIPELINE_FLUSH_INTERVAL`` seconds and when the spider closes.
+    Database work runs in the reactor thread pool, as the Django ORM must not
+    be called from the asyncio reactor thread.
+    """
+
+    def __init__(self, batch_size=100, flush_interval=10, stats=None):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = stats
+        self.known_hashes = set()
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.flush_loop = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            batch_size=crawler.settings.getint("ARTICLES_PIPELINE_BATCH_SIZE", 100),
+            flush_interval=crawler.settings.getfloat(
+                "ARTICLES_PIPELINE_FLUSH_INTERVAL", 10
+            ),
+            stats=crawler.stats,
+        )
+
+    def open_spider(self, spider):
+        self.flush_loop = task.LoopingCall(self.flush_if_stale)
+        self.flush_loop.start(self.flush_interval, now=False)
+
+        return threads.deferToThread(self.load_known_hashes)
+
+    def close_spider(self, spider):
+        if self.flush_loop and self.flush_loop.running:
+            self.flush_loop.stop()
+
+        return self.flush()
+
     def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+
+        if not adapter.get("url") or not adapter.get("title"):
+            raise DropItem("Story without title or url")
+
+        url_key = url_hash(canonicalize_url(adapter["url"]))
+        if url_key in self.known_hashes:
+            raise DropItem(f"Story is already stored: {adapter['url']}")
+
+        self.known_hashes.add(url_key)
+        self.buffer.append({"title": adapter["title"], "url": adapter["url"]})
+
+        if len(self.buffer) >= self.batch_size:
+            return self.flush().addCallback(lambda _: item)
+
         return item
+
+    def load_known_hashes(self):
+        if get_url_bloom_filter() is not None:
+            logger.info("URL Bloom filter used, no story URLs loaded")
+            return
+
+        try:
+            self.known_hashes.update(iter_known_url_hashes())
+        finally:
+            close_old_connections()
+
+        logger.info(f"Loaded {len(self.known_hashes)} known story URLs")
+
+    def flush_if_stale(self):
+        if self.buffer and time.monotonic() - self.last_flush >= self.flush_interval:
+            return self.flush()
+
+    def flush(self):
+        rows, self.buffer = self.buffer, []
+        self.last_flush = time.monotonic()
+
+        if not rows:
+            return defer.succeed(None)
+
+        return threads.deferToThread(self.write_rows, rows)
+
+    def write_rows(self, rows):
+        try:
+            result = import_scraped_rows(rows, chunk_size=len(rows))
+        finally:
+            close_old_connections()
+
+        logger.info(f"Stored a batch of scraped stories ({result})")
+
+        if self.stats:
+            self.stats.inc_value("articles/inserted", result.inserted)
+            self.stats.inc_value("articles/skipped", result.skipped)
+            self.stats.inc_value("articles/failed", result.failed)
+
+        return result
@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.5
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class ScraperError(Exception):
+    pass
+
+
+class ScraperTimeout(ScraperError):
+    pass
+
+
+@dataclass
+class CrawlResult:
+    finish_reason: str = None
+    item_count: int = 0
+    stats: dict = field(default_factory=dict)
+    cancelled: bool = False
+    timed_out: bool = False
+
+
+class ScraperWorker:
+    """Handle of one ``articles_scraper.worker`` subprocess"""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "articles_scraper.worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "SCRAPY_SETTINGS_MODULE": "articles_scraper.settings"},
+            text=True,
+            bufsize=1,
+        )
+        self.messages = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            self.messages.put(json.loads(line))
+
+        # The worker exited
+        self.messages.put(None)
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def send(self, message):
+        try:
+            self.process.stdin.write(json.dumps(message) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            raise ScraperError("Scraper worker is not running")
+
+    def kill(self):
+        if self.is_alive():
+            self.process.kill()
+            self.process.wait()
+
+    def close(self):
+        if self.is_alive():
+            # EOF on stdin makes the worker stop its reactor
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.kill()
+
+
+class ScraperPool:
+    """
+    Pool of pre-started scraper worker processes.
+
+    Every worker imports Scrapy and starts its reactor once and is reused for
+    later crawls, so there is no ``sys.exit`` and no reactor restart like with
+    ``scrapy.cmdline.execute``. Workers that die, or don't stop in time after
+    a cancellation, are killed and replaced.
+    """
+
+    def __init__(self, size=1, cancel_grace_period=30):
+        self.size = size
+        self.cancel_grace_period = cancel_grace_period
+        self.idle = queue.Queue()
+
+    def start(self):
+        for _ in range(self.size):
+            self.idle.put(ScraperWorker())
+
+    def shutdown(self):
+        while not self.idle.empty():
+            self.idle.get_nowait().close()
+
+    def _acquire(self):
+        worker = self.idle.get()
+        if not worker.is_alive():
+            logger.warning("Replacing a dead scraper worker")
+            worker = ScraperWorker()
+
+        return worker
+
+    def _release(self, worker):
+        if not worker.is_alive():
+            worker = ScraperWorker()
+
+        self.idle.put(worker)
+
+    def run(
+        self,
+        spider_name,
+        timeout=None,
+        cancel_event=None,
+        on_item=None,
+        crawl_settings=None,
+        **spider_kwargs,
+    ):
+        """
+        Run a crawl in a pooled worker and block until it finishes.
+
+        Every scraped item is passed to ``on_item`` as soon as the worker
+        reports it. Setting ``cancel_event`` or reaching ``timeout`` seconds
+        closes the spider gracefully; a worker that does not finish within
+        ``cancel_grace_period`` after that is killed.
+        """
+        worker = self._acquire()
+        job_id = uuid.uuid4().hex
+        result = CrawlResult()
+        deadline = time.monotonic() + timeout if timeout else None
+        cancel_sent_at = None
+
+        try:
+            worker.send(
+                {
+                    "type": "crawl",
+                    "id": job_id,
+                    "spider": spider_name,
+                    "kwargs": spider_kwargs,
+                    "settings": crawl_settings or {},
+                }
+            )
+
+            while True:
+                if cancel_sent_at is None:
+                    if cancel_event is not None and cancel_event.is_set():
+                        result.cancelled = True
+                    elif deadline is not None and time.monotonic() >= deadline:
+                        result.timed_out = True
+
+                    if result.cancelled or result.timed_out:
+                        worker.send({"type": "cancel", "id": job_id})
+                        cancel_sent_at = time.monotonic()
+                elif time.monotonic() - cancel_sent_at > self.cancel_grace_period:
+                    worker.kill()
+                    raise ScraperTimeout(f"Crawl {spider_name} did not stop in time")
+
+                try:
+                    message = worker.messages.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+
+                if message is None:
+                    raise ScraperError(
+                        f"Scraper worker died during {spider_name} crawl"
+                    )
+                if message.get("id") != job_id:
+                    continue
+
+                if message["type"] == "item":
+                    result.item_count += 1
+                    if on_item is not None:
+                        on_item(message["item"])
+                elif message["type"] == "error":
+                    raise ScraperError(message["message"])
+                elif message["type"] == "finished":
+                    result.finish_reason = message["reason"]
+                    result.stats = message["stats"]
+                    if message.get("error"):
+                        raise ScraperError(message["error"])
+                    return result
+        finally:
+            self._release(worker)
+
+
+def get_scraper_pool():
+    """Return the process-wide pool, starting its workers on first use"""
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ScraperPool(size=settings.SCRAPER_POOL_SIZE)
+            _pool.start()
+
+    return _pool
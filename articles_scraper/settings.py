@@ -37,7 +37,7 @@ ROBOTSTXT_OBEY = True
 # See also autothrottle settings and docs
 #DOWNLOAD_DELAY = 3
 # The download delay setting will honor only one of:
-#CONCURRENT_REQUESTS_PER_DOMAIN = 16
+CONCURRENT_REQUESTS_PER_DOMAIN = 4
 #CONCURRENT_REQUESTS_PER_IP = 16
 
 # Disable cookies (enabled by default)
@@ -72,17 +72,32 @@ ROBOTSTXT_OBEY = True
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-#ITEM_PIPELINES = {
-#    "articles_scraper.pipelines.ArticlesScraperPipeline": 300,
-#}
+ITEM_PIPELINES = {
+    "articles_scraper.pipelines.ArticlesScraperPipeline": 300,
+}
+
+# Scraped stories are written to the database in batches of this many items,
+# or after this many seconds, whichever comes first
+ARTICLES_PIPELINE_BATCH_SIZE = 100
+ARTICLES_PIPELINE_FLUSH_INTERVAL = 10
+
+# "http" follows the "More" links with plain Scrapy requests,
+# "selenium" drives a headless Chrome (needs chromedriver)
+STORIES_SPIDER_MODE = "http"
+# Maximum number of listing pages per crawl, 0 means no limit
+STORIES_MAX_PAGES = 0
+# In incremental mode the spider stops paging after this many pages in a row
+# that contain only stories which are already stored
+STORIES_INCREMENTAL = False
+STORIES_STOP_AFTER_KNOWN_PAGES = 2
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
-#AUTOTHROTTLE_ENABLED = True
+AUTOTHROTTLE_ENABLED = True
 # The initial download delay
-#AUTOTHROTTLE_START_DELAY = 5
+AUTOTHROTTLE_START_DELAY = 1
 # The maximum download delay to be set in case of high latencies
-#AUTOTHROTTLE_MAX_DELAY = 60
+AUTOTHROTTLE_MAX_DELAY = 30
 # The average number of requests Scrapy should be sending in parallel to
 # each remote server
 #AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
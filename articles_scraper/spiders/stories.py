@@ -1,12 +1,18 @@
 import time
 import scrapy
+from django.db import close_old_connections
+from scrapy import signals
 from scrapy.http import Response, HtmlResponse
+from twisted.internet import threads
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
+from articles.bloom import get_url_bloom_filter
+from articles.importers import iter_known_url_hashes
+from articles.utils import canonicalize_url, url_hash
+
+
+def seen_key(url_key):
+    """Compact 64-bit key of a URL hash used by the incremental seen-set"""
+    return int(url_key[:16], 16)
 
 
 class StoriesSpider(scrapy.Spider):
@@ -14,16 +20,139 @@ class StoriesSpider(scrapy.Spider):
     allowed_domains = ["news.ycombinator.com"]
     start_urls = ["https://news.ycombinator.com/"]
 
-    def __init__(self, **kwargs):
+    HTTP_MODE = "http"
+    SELENIUM_MODE = "selenium"
+
+    def __init__(
+        self,
+        mode=HTTP_MODE,
+        max_pages=0,
+        incremental=False,
+        stop_after_known_pages=2,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
+
+        if mode not in (self.HTTP_MODE, self.SELENIUM_MODE):
+            raise ValueError(f"Unknown stories spider mode: {mode}")
+
+        self.mode = mode
+        self.max_pages = int(max_pages)
+        self.incremental = str(incremental).lower() in ("1", "true", "yes")
+        self.stop_after_known_pages = int(stop_after_known_pages)
+        self.pages_fetched = 0
+        self.known_pages = 0
+        self.known_pages_in_row = 0
+        self.stopped_early = False
+        self.seen = set()
+        self.bloom = None
+        self.driver = None
+
+        if self.mode == self.SELENIUM_MODE:
+            self.driver = self.create_driver()
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        kwargs.setdefault(
+            "mode", crawler.settings.get("STORIES_SPIDER_MODE", cls.HTTP_MODE)
+        )
+        kwargs.setdefault("max_pages", crawler.settings.getint("STORIES_MAX_PAGES", 0))
+        kwargs.setdefault(
+            "incremental", crawler.settings.getbool("STORIES_INCREMENTAL", False)
+        )
+        kwargs.setdefault(
+            "stop_after_known_pages",
+            crawler.settings.getint("STORIES_STOP_AFTER_KNOWN_PAGES", 2),
+        )
+
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        crawler.signals.connect(spider.spider_opened, signal=signals.spider_opened)
+        return spider
+
+    def spider_opened(self, spider):
+        if self.incremental:
+            # The ORM can't be used from the reactor thread
+            return threads.deferToThread(self.load_seen)
+
+    def load_seen(self):
+        # With the URL Bloom filter only stories stored after it was built
+        # have to be loaded into memory
+        self.bloom = get_url_bloom_filter()
+
+        try:
+            self.seen.update(seen_key(url_key) for url_key in iter_known_url_hashes())
+        finally:
+            close_old_connections()
+
+        self.logger.info(
+            f"Incremental crawl: {len(self.seen)} stories loaded in memory, "
+            f"Bloom filter {'used' if self.bloom else 'not built'}"
+        )
+
+    @staticmethod
+    def create_driver():
+        # Selenium is only needed for the fallback mode
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
         chrome_options = Options()
         chrome_options.add_argument("--headless")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--ignore-certificate-errors")
-        self.driver = webdriver.Chrome(options=chrome_options)
+        return webdriver.Chrome(options=chrome_options)
+
+    def closed(self, reason):
+        if self.driver:
+            self.driver.quit()
 
-    def close(self, reason):
-        self.driver.quit()
+        message = (
+            f"Fetched {self.pages_fetched} listing pages, "
+            f"{self.known_pages} of them with only known stories"
+        )
+        if self.stopped_early and self.max_pages:
+            skipped = self.max_pages - self.pages_fetched
+            message += f", skipped the last {skipped} pages"
+            self.crawler.stats.set_value("stories/pages_skipped", skipped)
+        elif self.stopped_early:
+            message += ", skipped the rest of the listing"
+
+        self.crawler.stats.set_value("stories/pages_fetched", self.pages_fetched)
+        self.crawler.stats.set_value("stories/pages_known", self.known_pages)
+        self.logger.info(f"{message} ({reason})")
+
+    def has_page_budget(self):
+        if self.stopped_early:
+            return False
+
+        return not self.max_pages or self.pages_fetched < self.max_pages
+
+    def is_known(self, story):
+        if not story["url"]:
+            return False
+
+        # A rare Bloom filter false positive only affects when paging stops,
+        # the pipeline still confirms every story in the database
+        url_key = url_hash(canonicalize_url(story["url"]))
+        return seen_key(url_key) in self.seen or (
+            self.bloom is not None and url_key in self.bloom
+        )
+
+    def track_known_page(self, stories):
+        """Count pages of already stored stories and stop paging after enough of them"""
+        if not self.incremental:
+            return
+
+        if stories and all(self.is_known(story) for story in stories):
+            self.known_pages += 1
+            self.known_pages_in_row += 1
+        else:
+            self.known_pages_in_row = 0
+
+        if self.known_pages_in_row >= self.stop_after_known_pages:
+            self.stopped_early = True
+            self.logger.info(
+                f"Stopping after {self.known_pages_in_row} pages of known stories"
+            )
 
     @staticmethod
     def parse_page(response: Response):
@@ -34,15 +163,39 @@ class StoriesSpider(scrapy.Spider):
             }
 
     def parse(self, response: Response, **kwargs):
+        if self.mode == self.SELENIUM_MODE:
+            yield from self.parse_with_selenium(response)
+            return
+
+        self.pages_fetched += 1
+        stories = list(self.parse_page(response))
+        self.track_known_page(stories)
+        yield from stories
+
+        next_page = response.css(".morelink::attr(href)").get()
+        if next_page and self.has_page_budget():
+            yield response.follow(next_page, callback=self.parse)
+
+    def parse_with_selenium(self, response: Response):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
         self.driver.get(response.url)
 
         while True:
+            self.pages_fetched += 1
             page_source = self.driver.page_source
             scrapy_response = HtmlResponse(
                 url=self.driver.current_url, body=page_source, encoding="utf-8"
             )
 
-            yield from self.parse_page(scrapy_response)
+            stories = list(self.parse_page(scrapy_response))
+            self.track_known_page(stories)
+            yield from stories
+
+            if not self.has_page_budget():
+                break
 
             try:
                 more_button = WebDriverWait(self.driver, 10).until(
@@ -0,0 +1,127 @@
+"""
+Long-lived scraper worker process, started by ``articles_scraper.runner``.
+
+Scrapy and the Twisted reactor are imported and started once, then crawl
+jobs are read as JSON lines from stdin and run one after another with a
+``CrawlerRunner``. Scraped items, crawl stats and errors are written back
+as JSON lines to the original stdout; everything else printed by the
+process (logs included) goes to stderr.
+"""
+import json
+import os
+import sys
+import threading
+
+
+class Worker:
+    def __init__(self, runner, output):
+        self.runner = runner
+        self.output = output
+        self.crawlers = {}
+        self.pending_cancels = set()
+
+    def send(self, message):
+        self.output.write(json.dumps(message, default=str) + "\n")
+        self.output.flush()
+
+    def read_commands(self, reactor):
+        for line in sys.stdin:
+            reactor.callFromThread(self.handle, json.loads(line))
+
+        # The parent went away, nobody is listening anymore
+        reactor.callFromThread(reactor.stop)
+
+    def handle(self, command):
+        if command["type"] == "crawl":
+            self.crawl(command)
+        elif command["type"] == "cancel":
+            self.cancel(command["id"])
+
+    def cancel(self, job_id):
+        crawler = self.crawlers.get(job_id)
+        if crawler is None:
+            return
+
+        # Closing the spider before the engine runs would leave the crawl
+        # deferred waiting forever, so wait for engine_started in that case
+        if crawler.engine is not None and crawler.engine.running:
+            crawler.engine.close_spider(crawler.spider, "cancelled")
+        else:
+            self.pending_cancels.add(job_id)
+
+    def crawl(self, command):
+        from itemadapter import ItemAdapter
+        from scrapy import signals
+        from scrapy.crawler import Crawler
+
+        job_id = command["id"]
+
+        try:
+            settings = self.runner.settings.copy()
+            settings.setdict(command.get("settings") or {}, priority="cmdline")
+            spidercls = self.runner.spider_loader.load(command["spider"])
+            crawler = Crawler(spidercls, settings)
+        except Exception as error:
+            self.send({"type": "error", "id": job_id, "message": repr(error)})
+            return
+
+        def item_scraped(item):
+            item = ItemAdapter(item).asdict()
+            self.send({"type": "item", "id": job_id, "item": item})
+
+        def engine_started():
+            from twisted.internet import reactor
+
+            if job_id in self.pending_cancels:
+                self.pending_cancels.discard(job_id)
+                reactor.callLater(0, self.cancel, job_id)
+
+        def finished(result):
+            self.crawlers.pop(job_id, None)
+            self.pending_cancels.discard(job_id)
+            stats = crawler.stats.get_stats() if crawler.stats else {}
+            self.send(
+                {
+                    "type": "finished",
+                    "id": job_id,
+                    "reason": stats.get("finish_reason"),
+                    "stats": stats,
+                    "error": getattr(result, "getErrorMessage", lambda: None)(),
+                }
+            )
+
+        # Handlers are local functions, so they must not be weakly referenced
+        crawler.signals.connect(item_scraped, signal=signals.item_scraped, weak=False)
+        crawler.signals.connect(
+            engine_started, signal=signals.engine_started, weak=False
+        )
+        self.crawlers[job_id] = crawler
+        self.runner.crawl(crawler, **command.get("kwargs", {})).addBoth(finished)
+
+
+def main():
+    # Keep the real stdout for the protocol and send any other output to stderr
+    output = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    os.environ.setdefault("SCRAPY_SETTINGS_MODULE", "articles_scraper.settings")
+
+    from scrapy.crawler import CrawlerRunner
+    from scrapy.utils.log import configure_logging
+    from scrapy.utils.project import get_project_settings
+    from scrapy.utils.reactor import install_reactor
+
+    settings = get_project_settings()
+    install_reactor(settings["TWISTED_REACTOR"])
+    configure_logging(settings)
+
+    from twisted.internet import reactor
+
+    worker = Worker(CrawlerRunner(settings), output)
+    threading.Thread(target=worker.read_commands, args=(reactor,), daemon=True).start()
+    reactor.callWhenRunning(worker.send, {"type": "ready"})
+    reactor.run()
+
+
+if __name__ == "__main__":
+    main()
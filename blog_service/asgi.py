@@ -2,6 +2,8 @@
 ASGI config for blog_service project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Besides the Django application it serves the lifespan protocol, so the live
+article feed (``articles.live``) is closed on shutdown.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
@@ -13,4 +15,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog_service.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from articles.live import lifespan  # noqa: E402, needs the apps loaded
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -0,0 +1,92 @@
+from django.db.models import FileField
+
+
+class ChangeTrackingMixin:
+    """
+    Remember the field values a model instance was loaded with, so ``save``
+    can tell what changed without selecting the old row again.
+
+    Values are kept in their database form, e.g. the file name for file
+    fields and the pk for foreign keys.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def _db_value(self, field):
+        value = getattr(self, field.attname)
+        if isinstance(field, FileField):
+            # A file that is not stored yet is always a change
+            return value if value and not value._committed else value.name or None
+
+        return field.get_prep_value(value)
+
+    def _snapshot(self, field_names=None):
+        loaded_values = getattr(self, "_loaded_values", {})
+
+        for field in self._meta.concrete_fields:
+            if field_names is not None and field.attname not in field_names:
+                continue
+            if field.attname in self.__dict__:
+                loaded_values[field.attname] = self._db_value(field)
+
+        self._loaded_values = loaded_values
+
+    def has_changed(self, name):
+        field = self._meta.get_field(name)
+        loaded_values = getattr(self, "_loaded_values", None)
+
+        if self._state.adding or loaded_values is None:
+            return True
+        if field.attname not in loaded_values:
+            # A deferred field only changes when it is assigned
+            return field.attname in self.__dict__
+
+        old_value = loaded_values[field.attname]
+        if isinstance(field, FileField):
+            # Empty file fields are stored either as NULL or as ""
+            old_value = old_value or None
+
+        return self._db_value(field) != old_value
+
+    def old_value(self, name):
+        """Loaded value of the field, ``None`` for new instances"""
+        field = self._meta.get_field(name)
+        return getattr(self, "_loaded_values", {}).get(field.attname)
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+
+        if fields is not None:
+            fields = {self._meta.get_field(name).attname for name in fields}
+        self._snapshot(fields)
+
+    def save(self, *args, keep_fields=(), **kwargs):
+        """
+        ``keep_fields`` are left as stored when the row is updated, e.g.
+        columns a task writes in the meantime. Unlike with ``update_fields``
+        a row deleted since the instance was loaded is inserted again.
+        """
+        # Only a snapshot loaded from the database tells what is stored
+        if hasattr(self, "_loaded_values"):
+            self._keep_fields = set(keep_fields)
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            self._keep_fields = set()
+
+        # Fields left out of update_fields still hold their stored values
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = {
+                self._meta.get_field(name).attname for name in update_fields
+            }
+        self._snapshot(update_fields)
+
+    def _do_update(self, base_qs, using, pk_val, values, *args, **kwargs):
+        keep_fields = getattr(self, "_keep_fields", ())
+        values = [value for value in values if value[0].name not in keep_fields]
+        return super()._do_update(base_qs, using, pk_val, values, *args, **kwargs)
@@ -0,0 +1,131 @@
+"""
+Renderers of the API, registered in ``REST_FRAMEWORK``.
+
+``ORJSONRenderer`` writes the same values as DRF's ``JSONRenderer``,
+``MessagePackRenderer`` the same values as MessagePack. Both leave the
+types ``orjson``/``msgpack`` would write differently (dates, decimals,
+lazy strings, ...) to DRF's JSON encoder. ``ORJSONRenderer`` differs
+from ``JSONRenderer`` for NaN and infinities and in how some floats are
+spelled, see its docstring.
+
+``NDJSONRenderer`` and ``CSVRenderer`` write lists of rows, views streaming
+exports render them batch by batch.
+"""
+import csv
+import io
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+ENCODER = JSONEncoder()
+
+
+def encode_default(obj):
+    """Value of ``obj`` in the JSON output of DRF"""
+    return ENCODER.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` on top of ``orjson``. Indented output (e.g. the
+    browsable API), ``UNICODE_JSON = False``, non compact output and data
+    ``orjson`` can't encode, like integers over 64 bits, go to the stdlib.
+
+    The output is not always byte for byte the same as ``JSONRenderer``'s:
+    NaN and infinities, which ``JSONRenderer`` refuses, are written as
+    ``null``, and floats in exponent notation are spelled without ``+`` and
+    leading zeros (``1e16``, not ``1e+16``), which parses to the same value.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escaped like JSONRenderer does, so the output is valid javascript
+        if LINE_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b"\\u2028")
+        if PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(PARAGRAPH_SEPARATOR, b"\\u2029")
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack for internal consumers, ``Accept: application/msgpack``"""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        return msgpack.packb(
+            data, default=encode_default, use_bin_type=True, datetime=False
+        )
+
+
+class NDJSONRenderer(BaseRenderer):
+    """One JSON object per line, ``Accept: application/x-ndjson``"""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        rows = data if isinstance(data, list) else [data]
+        return b"".join(
+            orjson.dumps(row, default=encode_default, option=ORJSON_OPTIONS) + b"\n"
+            for row in rows
+        )
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Rows as CSV, ``Accept: text/csv``. The columns are the keys of the first
+    row unless ``renderer_context`` lists them in ``fields``, the header is
+    left out with ``header=False``.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        rows = data if isinstance(data, list) else [data]
+        fields = renderer_context.get("fields") or list(rows[0] if rows else [])
+
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=fields, extrasaction="ignore")
+        if renderer_context.get("header", True):
+            writer.writeheader()
+        writer.writerows(rows)
+        return output.getvalue().encode(self.charset)
@@ -0,0 +1,30 @@
+from django.core.files.storage import default_storage
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
+
+@extend_schema_field(
+    {
+        "type": "object",
+        "additionalProperties": {
+            "type": "object",
+            "additionalProperties": {"type": "string", "format": "uri"},
+        },
+    }
+)
+class PictureVariantsField(serializers.ReadOnlyField):
+    """Stored variant names as ``{format: {width: url}}``"""
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        variants = {}
+
+        for extension, names in (value or {}).items():
+            variants[extension] = {}
+            for width, name in names.items():
+                url = default_storage.url(name)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                variants[extension][width] = url
+
+        return variants
@@ -160,6 +160,31 @@ MEDIA_URL = "/media/"
 
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads are stored once per content, see articles/storage.py
+STORAGES = {
+    "default": {
+        "BACKEND": "articles.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# Responsive variants stored next to every uploaded picture, formats that
+# the installed Pillow can't encode are skipped
+IMAGE_VARIANT_WIDTHS = [320, 640, 1280]
+IMAGE_VARIANT_FORMATS = ["webp", "avif"]
+IMAGE_VARIANT_QUALITY = 80
+
+# Uploads above these limits are rejected before anything is decoded
+IMAGE_MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+IMAGE_MAX_PIXELS = 40_000_000
+
+# collect_orphan_media leaves files younger than this alone; quarantined
+# orphans go to MEDIA_ROOT/quarantine unless a directory is set
+ORPHAN_MEDIA_GRACE_PERIOD = 24 * 60 * 60
+ORPHAN_MEDIA_QUARANTINE_DIR = os.getenv("ORPHAN_MEDIA_QUARANTINE_DIR")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -175,8 +200,82 @@ EMAIL_USE_TLS = False
 EMAIL_USE_SSL = True
 EMAIL_TIMEOUT = 10
 
+# Response cache of the article endpoints. Articles change in other
+# processes too (web workers, Celery), so its invalidation counters need a
+# shared backend: ARTICLE_CACHE_BACKEND at ARTICLE_CACHE_LOCATION, or else
+# the Redis of the Celery broker. Without one the cache is off, a
+# per-process LocMemCache only has to be set explicitly for a single
+# process. Tests run without it, see blog_service.test_settings.
+ARTICLE_CACHE_LOCATION = os.getenv("ARTICLE_CACHE_LOCATION") or os.getenv(
+    "CELERY_BROKER_URL", ""
+)
+ARTICLE_CACHE_BACKEND = os.getenv("ARTICLE_CACHE_BACKEND") or (
+    "django.core.cache.backends.redis.RedisCache"
+    if ARTICLE_CACHE_LOCATION.startswith(("redis://", "rediss://"))
+    else "django.core.cache.backends.dummy.DummyCache"
+)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "articles": {
+        "BACKEND": ARTICLE_CACHE_BACKEND,
+        "LOCATION": ARTICLE_CACHE_LOCATION,
+    },
+}
+
+# Characters of the article excerpt shown in lists
+ARTICLE_EXCERPT_LENGTH = 300
+
+# Articles read from the database and rendered at a time by the export
+ARTICLE_EXPORT_CHUNK_SIZE = 2000
+
+# Seconds the change feed lags behind, so slow transactions aren't skipped
+ARTICLE_CHANGES_DELAY = int(os.getenv("ARTICLE_CHANGES_DELAY", 5))
+# Days deleted articles stay in the change feed, older sync tokens expire
+ARTICLE_TOMBSTONE_RETENTION_DAYS = int(
+    os.getenv("ARTICLE_TOMBSTONE_RETENTION_DAYS", 30)
+)
+
+# Broker of the live article feed. Articles are saved in other processes
+# than the ASGI server too (WSGI workers, Celery), so it is Redis at
+# ARTICLE_LIVE_BROKER_LOCATION, or else the Redis of the Celery broker.
+# The InMemoryBroker only reaches its own process: tests and
+# single-process development.
+ARTICLE_LIVE_BROKER_LOCATION = os.getenv("ARTICLE_LIVE_BROKER_LOCATION") or os.getenv(
+    "CELERY_BROKER_URL", ""
+)
+ARTICLE_LIVE_BROKER_BACKEND = os.getenv("ARTICLE_LIVE_BROKER_BACKEND") or (
+    "articles.live.RedisBroker"
+    if ARTICLE_LIVE_BROKER_LOCATION.startswith(("redis://", "rediss://"))
+    else "articles.live.InMemoryBroker"
+)
+ARTICLE_LIVE_BROKER = {
+    "BACKEND": ARTICLE_LIVE_BROKER_BACKEND,
+    "LOCATION": ARTICLE_LIVE_BROKER_LOCATION,
+}
+# Seconds between heartbeats of idle live feed connections
+ARTICLE_LIVE_HEARTBEAT = int(os.getenv("ARTICLE_LIVE_HEARTBEAT", 15))
+# Events a live feed connection may have unread before it is dropped
+ARTICLE_LIVE_QUEUE_SIZE = 100
+
+ARTICLE_CACHE_ALIAS = "articles"
+ARTICLE_CACHE_TIMEOUT = int(os.getenv("ARTICLE_CACHE_TIMEOUT", 10 * 60))
+
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # The first renderer answers requests without a preference in "Accept"
+    "DEFAULT_RENDERER_CLASSES": (
+        "blog_service.renderers.ORJSONRenderer",
+        "blog_service.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "blog_service.parsers.ORJSONParser",
+        "blog_service.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -249,5 +348,15 @@ else:
     CELERY_TASK_ALWAYS_EAGER = True
     CELERY_BROKER_BACKEND = 'memory'
 
+SHARED_DATA_PATH = os.getenv("SHARED_DATA_PATH", "/code/shared-data")
+
+# Bloom filter of scraped article URLs, read by the spider and the importer
+URL_BLOOM_FILTER_PATH = os.path.join(SHARED_DATA_PATH, "scraped_urls.bloom")
+URL_BLOOM_FILTER_FPR = float(os.getenv("URL_BLOOM_FILTER_FPR", 0.001))
+
+# Scrapy runs in pre-started worker processes, see articles_scraper.runner
+SCRAPER_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", 1))
+SCRAPER_RUN_TIMEOUT = 20 * 60
+
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
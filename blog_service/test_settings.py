@@ -0,0 +1,22 @@
+"""
+Settings of the test suite, selected with
+``python manage.py test --settings=blog_service.test_settings``
+"""
+from blog_service.settings import *  # noqa: F401, F403
+from blog_service.settings import CACHES, LOGGING
+
+# Responses cached by one test must not be served to another, the cache
+# tests configure a LocMemCache themselves
+CACHES = {
+    **CACHES,
+    "articles": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+}
+
+# Live feed events stay in the test process, even with a Redis broker set
+ARTICLE_LIVE_BROKER = {"BACKEND": "articles.live.InMemoryBroker", "LOCATION": ""}
+
+# The response cache is off on purpose, don't warn about it
+LOGGING = {
+    **LOGGING,
+    "loggers": {**LOGGING["loggers"], "articles.cache": {"level": "ERROR"}},
+}
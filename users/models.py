@@ -1,14 +1,12 @@
-import os
-
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
 
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils.translation import gettext as _
 
-from PIL import Image
-
+from articles.images import delete_variants
+from blog_service.mixins import ChangeTrackingMixin
 from users.utils import profile_image_file_path
 
 
@@ -46,7 +44,7 @@ class UserManager(BaseUserManager):
         return self._create_user(email, password, **extra_fields)
 
 
-class User(AbstractUser):
+class User(ChangeTrackingMixin, AbstractUser):
     email = models.EmailField(_("email address"), unique=True)
 
     USERNAME_FIELD = "email"
@@ -61,38 +59,37 @@ class User(AbstractUser):
         return f"{self.first_name} {self.last_name}"
 
 
-class Profile(models.Model):
+class Profile(ChangeTrackingMixin, models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     image = models.ImageField(upload_to=profile_image_file_path, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.user}"
 
-    def save(
-        self,
-        force_insert=False,
-        force_update=False,
-        using=None,
-        update_fields=None,
-        *args,
-        **kwargs,
-    ):
-        try:
-            old_instance = Profile.objects.get(pk=self.pk)
-            old_image = old_instance.image
-        except Profile.DoesNotExist:
-            old_image = None
+    def save(self, *args, **kwargs):
+        image_changed = self.has_changed("image")
+        old_image = self.old_value("image") if image_changed else None
+        old_variants = self.old_value("image_variants") if image_changed else None
+
+        if image_changed or not self.image:
+            self.image_variants = {}
+        elif kwargs.get("update_fields") is None and not self._state.adding:
+            # Don't overwrite what the image task stored in the meantime
+            kwargs["keep_fields"] = ("image", "image_variants")
 
         super().save(*args, **kwargs)
 
-        if old_image and self.image != old_image:
-            if os.path.isfile(old_image.path):
-                os.remove(old_image.path)
+        if old_image:
+            storage = self.image.storage
+
+            def delete_old_image():
+                storage.delete(old_image)
+                delete_variants(old_variants, storage=storage)
+
+            transaction.on_commit(delete_old_image)
 
-        if self.image:
-            img = Image.open(self.image.path)
+        if image_changed and self.image:
+            from users.tasks import process_profile_image_task
 
-            if img.height > 300 or img.width > 300:
-                output_size = (300, 300)
-                img.thumbnail(output_size)
-                img.save(self.image.path)
+            transaction.on_commit(lambda: process_profile_image_task.delay(self.pk))
@@ -2,6 +2,8 @@ from django.contrib.auth import get_user_model, authenticate
 from django.utils.translation import gettext as _
 from rest_framework import serializers
 
+from articles.images import validate_image_budget
+from blog_service.serializers import PictureVariantsField
 from users.models import Profile
 
 
@@ -11,12 +13,15 @@ class ProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = Profile
         fields = ("user", "image",)
+        extra_kwargs = {"image": {"validators": [validate_image_budget]}}
 
 
 class ProfileListSerializer(serializers.ModelSerializer):
+    picture_variants = PictureVariantsField(source="image_variants")
+
     class Meta:
         model = Profile
-        fields = ("user", "image")
+        fields = ("user", "image", "picture_variants")
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -0,0 +1,40 @@
+import logging
+
+from celery import shared_task
+
+from articles.cache import touch_user_articles
+from articles.images import delete_variants, process_picture
+from users.models import Profile
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def process_profile_image_task(profile_id):
+    profile = Profile.objects.filter(pk=profile_id).first()
+    if profile is None or not profile.image:
+        return None
+
+    uploaded_name = profile.image.name
+    storage = profile.image.storage
+
+    try:
+        name, variants = process_picture(uploaded_name, storage)
+    except FileNotFoundError:
+        logger.warning(f"Image of profile {profile_id} is missing")
+        return None
+
+    # The image may have been replaced while this task was running
+    updated = Profile.objects.filter(pk=profile_id, image=uploaded_name).update(
+        image=name, image_variants=variants
+    )
+
+    if updated:
+        # Article details render the author's profile
+        touch_user_articles(profile.user_id)
+    else:
+        delete_variants(variants, storage)
+    if name != uploaded_name:
+        storage.delete(uploaded_name if updated else name)
+
+    return variants
@@ -3,7 +3,7 @@ import tempfile
 
 from PIL import Image
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from rest_framework import status
@@ -92,6 +92,20 @@ class ProfileImageUploadTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
+    @override_settings(IMAGE_MAX_PIXELS=50)
+    def test_upload_image_above_pixel_budget(self):
+        """Test uploading an image with more pixels than allowed"""
+        url = image_upload_url()
+
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
+            img = Image.new("RGB", (10, 10))
+            img.save(ntf, format="JPEG")
+            ntf.seek(0)
+            res = self.client.post(url, {"image": ntf}, format="multipart")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Profile.objects.filter(user=self.user).exists())
+
     def test_image_url_is_shown_on_user_page(self):
         url = image_upload_url()
 
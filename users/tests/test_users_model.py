@@ -30,3 +30,21 @@ class ModelsTest(TestCase):
             user=self.user,
         )
         self.assertEqual(str(profile), str(profile.user))
+
+    def test_profile_save_does_not_select_old_image(self) -> None:
+        Profile.objects.create(user=self.user)
+        profile = Profile.objects.get(user=self.user)
+
+        with self.assertNumQueries(1):
+            profile.save()
+
+        self.assertFalse(profile.has_changed("image"))
+
+    def test_profile_save_after_delete_inserts_it_again(self) -> None:
+        Profile.objects.create(user=self.user)
+        profile = Profile.objects.get(user=self.user)
+        Profile.objects.filter(pk=profile.pk).delete()
+
+        profile.save()
+
+        self.assertTrue(Profile.objects.filter(pk=profile.pk).exists())